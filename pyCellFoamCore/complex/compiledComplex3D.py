@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# COMPILED COMPLEX 3D
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 10:02:51 2026
+
+'''
+Array based snapshot of a finished 3D complex. All cells are ordered by
+category (inner, border, additional border) and by their position in the
+category lists. If the number of every cell is its position, as in a
+renumbered primal complex, this is the order of the rows and columns of the
+assembled incidence matrices of the complex, so the arrays can be used
+directly together with :attr:`Complex3D.sparseIncidenceMatrix1` etc.
+
+'''
+
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+from itertools import chain
+import logging
+
+# ------------------------------------------------------------------------
+#    Third-Party Libraries
+# ------------------------------------------------------------------------
+import numpy as np
+import scipy.sparse as sp
+
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    CONSTANTS
+# =============================================================================
+
+categoryCodes = {'inner': 0, 'border': 1, 'additionalBorder': 2}
+'''
+Integer codes used for the categories of the cells.
+
+'''
+
+
+# =============================================================================
+#    CLASS DEFINITION
+# =============================================================================
+class CompiledComplex3D:
+    '''
+    Flat NumPy representation of a 3D complex. It is a snapshot: changing the
+    complex afterwards does not update the arrays, compile the complex again
+    instead.
+
+    '''
+
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__useCategory',
+                 '__nodes',
+                 '__edges',
+                 '__faces',
+                 '__volumes',
+                 '__nodeCategories',
+                 '__edgeCategories',
+                 '__faceCategories',
+                 '__volumeCategories',
+                 '__coordinates',
+                 '__edgeNodes',
+                 '__faceEdgesIndptr',
+                 '__faceEdgesIndices',
+                 '__faceEdgesSigns',
+                 '__volumeFacesIndptr',
+                 '__volumeFacesIndices',
+                 '__volumeFacesSigns',
+                 '__nodeDuals',
+                 '__edgeDuals',
+                 '__faceDuals',
+                 '__volumeDuals')
+
+# =============================================================================
+#    INITIALIZATION
+# =============================================================================
+    def __init__(self, complex3D, dualComplex=None):
+        '''
+
+        :param Complex3D complex3D: The complex that should be compiled
+        :param Complex3D dualComplex: The dual of this complex. If it is
+            given, the 3D duals of all cells are stored as indices into the
+            compiled ordering of the dual complex.
+
+        '''
+        _log.info('Compiling {}'.format(complex3D))
+
+        self.__useCategory = complex3D.useCategory
+
+        nodeGroups = [complex3D.innerNodes,
+                      complex3D.borderNodes,
+                      complex3D.additionalBorderNodes]
+        edgeGroups = [complex3D.innerEdges,
+                      complex3D.borderEdges,
+                      complex3D.additionalBorderEdges]
+        faceGroups = [complex3D.innerFaces,
+                      complex3D.borderFaces,
+                      complex3D.additionalBorderFaces]
+        volumeGroups = [complex3D.innerVolumes,
+                        complex3D.borderVolumes]
+
+        (self.__nodes, self.__nodeCategories) = self.__flatten(nodeGroups)
+        (self.__edges, self.__edgeCategories) = self.__flatten(edgeGroups)
+        (self.__faces, self.__faceCategories) = self.__flatten(faceGroups)
+        (self.__volumes, self.__volumeCategories) = \
+            self.__flatten(volumeGroups)
+
+        nodeIndex = complex3D.cellIndex(self.__nodes)
+        edgeIndex = complex3D.cellIndex(self.__edges)
+        faceIndex = complex3D.cellIndex(self.__faces)
+
+        # Nodes
+        self.__coordinates = np.array([n.coordinates for n in self.__nodes],
+                                      dtype=float).reshape(-1, 3)
+
+        # Edges
+        self.__edgeNodes = np.array(
+            [[nodeIndex.get(e.startNode, -1), nodeIndex.get(e.endNode, -1)]
+             for e in self.__edges],
+            dtype=np.int64).reshape(-1, 2)
+
+        # Faces and volumes
+        (self.__faceEdgesIndptr,
+         self.__faceEdgesIndices,
+         self.__faceEdgesSigns) = self.__orientedCSR(
+             [f.edges for f in self.__faces], edgeIndex)
+        (self.__volumeFacesIndptr,
+         self.__volumeFacesIndices,
+         self.__volumeFacesSigns) = self.__orientedCSR(
+             [v.faces for v in self.__volumes], faceIndex)
+
+        # Duality
+        if dualComplex is not None:
+            dualNodes = self.__flatten([dualComplex.innerNodes,
+                                        dualComplex.borderNodes,
+                                        dualComplex.additionalBorderNodes])[0]
+            dualEdges = self.__flatten([dualComplex.innerEdges,
+                                        dualComplex.borderEdges,
+                                        dualComplex.additionalBorderEdges])[0]
+            dualFaces = self.__flatten([dualComplex.innerFaces,
+                                        dualComplex.borderFaces,
+                                        dualComplex.additionalBorderFaces])[0]
+            dualVolumes = self.__flatten([dualComplex.innerVolumes,
+                                          dualComplex.borderVolumes])[0]
+            self.__nodeDuals = self.__dualIndices(self.__nodes, dualVolumes)
+            self.__edgeDuals = self.__dualIndices(self.__edges, dualFaces)
+            self.__faceDuals = self.__dualIndices(self.__faces, dualEdges)
+            self.__volumeDuals = self.__dualIndices(self.__volumes, dualNodes)
+        else:
+            self.__nodeDuals = None
+            self.__edgeDuals = None
+            self.__faceDuals = None
+            self.__volumeDuals = None
+
+# =============================================================================
+#    SETTER AND GETTER
+# =============================================================================
+
+    def __getUseCategory(self): return self.__useCategory
+    useCategory = property(__getUseCategory)
+    '''
+    Categorization (1 or 2) that was active when the complex was compiled.
+
+    '''
+
+    def __getNodes(self): return self.__nodes
+    nodes = property(__getNodes)
+    '''
+    Tuple of all nodes in the order of the arrays.
+
+    '''
+
+    def __getEdges(self): return self.__edges
+    edges = property(__getEdges)
+    '''
+    Tuple of all edges in the order of the arrays.
+
+    '''
+
+    def __getFaces(self): return self.__faces
+    faces = property(__getFaces)
+    '''
+    Tuple of all faces in the order of the arrays.
+
+    '''
+
+    def __getVolumes(self): return self.__volumes
+    volumes = property(__getVolumes)
+    '''
+    Tuple of all volumes in the order of the arrays.
+
+    '''
+
+    def __getNodeCategories(self): return self.__nodeCategories
+    nodeCategories = property(__getNodeCategories)
+    '''
+    Category code (see :data:`categoryCodes`) of every node.
+
+    '''
+
+    def __getEdgeCategories(self): return self.__edgeCategories
+    edgeCategories = property(__getEdgeCategories)
+    '''
+    Category code of every edge.
+
+    '''
+
+    def __getFaceCategories(self): return self.__faceCategories
+    faceCategories = property(__getFaceCategories)
+    '''
+    Category code of every face.
+
+    '''
+
+    def __getVolumeCategories(self): return self.__volumeCategories
+    volumeCategories = property(__getVolumeCategories)
+    '''
+    Category code of every volume.
+
+    '''
+
+    def __getCoordinates(self): return self.__coordinates
+    coordinates = property(__getCoordinates)
+    '''
+    Node coordinates as N×3 array.
+
+    '''
+
+    def __getEdgeNodes(self): return self.__edgeNodes
+    edgeNodes = property(__getEdgeNodes)
+    '''
+    Indices of start and end node of every edge as E×2 array. Nodes that do
+    not belong to the complex are marked with -1.
+
+    '''
+
+    def __getFaceEdges(self):
+        return (self.__faceEdgesIndptr,
+                self.__faceEdgesIndices,
+                self.__faceEdgesSigns)
+    faceEdges = property(__getFaceEdges)
+    '''
+    Edges of all faces in CSR form (indptr, indices, signs). The edges of
+    face i are ``indices[indptr[i]:indptr[i+1]]``, the sign is -1 if the
+    edge is used in reversed direction.
+
+    '''
+
+    def __getVolumeFaces(self):
+        return (self.__volumeFacesIndptr,
+                self.__volumeFacesIndices,
+                self.__volumeFacesSigns)
+    volumeFaces = property(__getVolumeFaces)
+    '''
+    Faces of all volumes in CSR form (indptr, indices, signs).
+
+    '''
+
+    def __getNodeDuals(self): return self.__nodeDuals
+    nodeDuals = property(__getNodeDuals)
+    '''
+    Index of the dual volume of every node, -1 if there is none. None if no
+    dual complex was given.
+
+    '''
+
+    def __getEdgeDuals(self): return self.__edgeDuals
+    edgeDuals = property(__getEdgeDuals)
+    '''
+    Index of the dual face of every edge.
+
+    '''
+
+    def __getFaceDuals(self): return self.__faceDuals
+    faceDuals = property(__getFaceDuals)
+    '''
+    Index of the dual edge of every face.
+
+    '''
+
+    def __getVolumeDuals(self): return self.__volumeDuals
+    volumeDuals = property(__getVolumeDuals)
+    '''
+    Index of the dual node of every volume.
+
+    '''
+
+    def __getIncidenceMatrix1(self):
+        numNodes = len(self.__nodes)
+        numEdges = len(self.__edgeNodes)
+        cols = np.repeat(np.arange(numEdges), 2)
+        rows = self.__edgeNodes.ravel()
+        vals = np.tile([-1., 1.], numEdges)
+        valid = rows >= 0
+        return sp.csr_matrix((vals[valid], (rows[valid], cols[valid])),
+                             shape=(numNodes, numEdges))
+    incidenceMatrix1 = property(__getIncidenceMatrix1)
+    '''
+    Sparse incidence matrix between nodes and edges, calculated from the
+    arrays.
+
+    '''
+
+    def __getIncidenceMatrix2(self):
+        return sp.csr_matrix((self.__faceEdgesSigns,
+                              self.__faceEdgesIndices,
+                              self.__faceEdgesIndptr),
+                             shape=(len(self.__faces),
+                                    len(self.__edges))).T.tocsr()
+    incidenceMatrix2 = property(__getIncidenceMatrix2)
+    '''
+    Sparse incidence matrix between edges and faces.
+
+    '''
+
+    def __getIncidenceMatrix3(self):
+        return sp.csr_matrix((self.__volumeFacesSigns,
+                              self.__volumeFacesIndices,
+                              self.__volumeFacesIndptr),
+                             shape=(len(self.__volumes),
+                                    len(self.__faces))).T.tocsr()
+    incidenceMatrix3 = property(__getIncidenceMatrix3)
+    '''
+    Sparse incidence matrix between faces and volumes.
+
+    '''
+
+# =============================================================================
+#    MAGIC METHODS
+# =============================================================================
+    def __repr__(self):
+        return 'CompiledComplex3D with {} nodes, {} edges, {} faces and {} volumes'\
+            .format(len(self.__nodes), len(self.__edges),
+                    len(self.__faces), len(self.__volumes))
+
+# =============================================================================
+#    METHODS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Slices of the categories
+# ------------------------------------------------------------------------
+    def categorySlice(self, categories, category):
+        '''
+        Returns the slice of one category in one of the category arrays,
+        e.g. ``c.categorySlice(c.nodeCategories, 'border')``.
+
+        '''
+        code = categoryCodes[category]
+        start = np.searchsorted(categories, code, side='left')
+        stop = np.searchsorted(categories, code, side='right')
+        return slice(int(start), int(stop))
+
+# ------------------------------------------------------------------------
+#    Concatenate the category lists
+# ------------------------------------------------------------------------
+    def __flatten(self, groups):
+        '''
+
+        '''
+        cells = tuple(chain(*groups))
+        categories = np.repeat(np.arange(len(groups), dtype=np.int8),
+                               [len(g) for g in groups])
+        return (cells, categories)
+
+# ------------------------------------------------------------------------
+#    Oriented boundary in CSR form
+# ------------------------------------------------------------------------
+    def __orientedCSR(self, boundaries, index):
+        '''
+        Converts lists of oriented boundary cells to CSR arrays. Boundary
+        cells that are not in the index are skipped.
+
+        '''
+        indptr = [0]
+        indices = []
+        signs = []
+        for boundary in boundaries:
+            for c in boundary:
+                i = index.get(c)
+                if i is not None:
+                    indices.append(i)
+                    signs.append(1.)
+                else:
+                    i = index.get(-c)
+                    if i is not None:
+                        indices.append(i)
+                        signs.append(-1.)
+            indptr.append(len(indices))
+        return (np.array(indptr, dtype=np.int64),
+                np.array(indices, dtype=np.int64),
+                np.array(signs, dtype=float))
+
+# ------------------------------------------------------------------------
+#    Indices of 3D dual cells
+# ------------------------------------------------------------------------
+    def __dualIndices(self, cells, dualCells):
+        '''
+
+        '''
+        dualIndex = {c: i for (i, c) in enumerate(dualCells)}
+        return np.array([dualIndex.get(c.dualCell3D, -1) for c in cells],
+                        dtype=np.int64)
@@ -29,6 +29,7 @@ if __name__ == '__main__':
 # ------------------------------------------------------------------------
 import logging
 import numpy as np
+import scipy.sparse as sp
 
 
 # ------------------------------------------------------------------------
@@ -38,6 +39,7 @@ import numpy as np
 
 #    kCells
 # -------------------------------------------------------------------
+from pyCellFoamCore.k_cells.cell import cell_numbering
 
 
 #    Complex & Grids
@@ -68,7 +70,7 @@ class Complex:
     # =========================================================================
     #    SLOTS
     # =========================================================================
-    __slots__ = ('__logger')
+    __slots__ = ('__logger','__weakref__','__cellIndices')
 
     # =========================================================================
     #    INITIALIZATION
@@ -80,7 +82,7 @@ class Complex:
             child  class
 
         '''
-
+        self.__cellIndices = {}
         self.setUp()
 
     # =========================================================================
@@ -197,19 +199,249 @@ class Complex:
         '''
 
         '''
-        for (i,c) in enumerate(myList):
-            c.num = i
+        self.numberCells([myList])
+
+
+# ------------------------------------------------------------------------
+#    Number several lists of kCells at once
+# ------------------------------------------------------------------------
+    def numberCells(self,groups):
+        '''
+        Numbers the cells of each list in `groups` consecutively, starting
+        from 0 in every list. All numbers are calculated as one array, which
+        the cells read their numbers from when they are read, see
+        :mod:`cell_numbering`.
+
+        :param list groups: Lists of kCells, e.g. the inner, border and
+            additional border nodes
+        :return: Array with the number of each cell, in the order of the
+            concatenated lists. Keep it with the complex, the cells refer to
+            it until they have taken their numbers.
+
+        '''
+        lengths = np.array([len(g) for g in groups],dtype=np.int64)
+        starts = np.repeat(np.cumsum(lengths)-lengths,lengths)
+        numbers = np.arange(lengths.sum(),dtype=np.int64)-starts
+        cell_numbering.set_numbers([c for g in groups for c in g],numbers)
+        return numbers
 
 
+# ------------------------------------------------------------------------
+#    Map each cell of a list to its position
+# ------------------------------------------------------------------------
+    def cellIndex(self,cells):
+        '''
+        Returns a dictionary that maps every cell of the given list to its
+        position in the list. The cells are hashed by identity, so a lookup
+        is O(1) instead of the linear scan of ``cell in cells``.
+
+        :param cells: A list of k-cells
+
+        '''
+        return {c: i for (i,c) in enumerate(cells)}
+
+# ------------------------------------------------------------------------
+#    Order cells as the rows or columns of an incidence matrix
+# ------------------------------------------------------------------------
+    def cellsByNumber(self,cells):
+        '''
+        Returns a list in which entry i is the cell with the number i, i.e.
+        the cell that belongs to row or column i of an incidence matrix of
+        the given cells. Entries without a cell are None.
+
+        :param cells: A list of k-cells
+
+        '''
+        ordered = [None]*len(cells)
+        for c in cells:
+            if c.num is not None and 0 <= c.num < len(cells):
+                ordered[c.num] = c
+        return ordered
+
+# ------------------------------------------------------------------------
+#    Lists of cells of one dimension, sorted by category
+# ------------------------------------------------------------------------
+    def categoryGroups(self,dim):
+        '''
+        This function should be implemented in child classes. It returns the
+        lists of inner, border and additional border cells of dimension
+        `dim`.
+
+        '''
+        _log.error('Category groups are not implemented')
+        return []
+
+# ------------------------------------------------------------------------
+#    Cached index of all cells of one dimension
+# ------------------------------------------------------------------------
+    def __getCellIndices(self,dim):
+        '''
+        Returns the index of the cells of dimension `dim`. It is rebuilt if
+        one of the category lists has been replaced or has changed its
+        length, or if it has been invalidated by
+        :meth:`invalidateCellIndices`. A list that is reordered in place
+        keeps its identity and length, so such edits are only seen after
+        :meth:`renumber` or :meth:`invalidateCellIndices`.
+
+        The dictionary maps every cell as it is stored in the lists to 2*i
+        and its reverse to 2*i+1, where i is the global index of the cell. A cell that is not in the complex
+        is mapped to 2*n. The two arrays have n+1 entries, the last one
+        belongs to cells that are not found.
+
+        '''
+        groups = self.categoryGroups(dim)
+        # The lists themselves are kept, so their ids cannot be reused
+        key = [(g,len(g)) for g in groups]
+        cached = self.__cellIndices.get(dim)
+        if cached is not None and len(cached[0]) == len(key) and \
+                all(g1 is g2 and n1 == n2
+                    for ((g1,n1),(g2,n2)) in zip(cached[0],key)):
+            return cached[1:]
+
+        lengths = np.array([len(g) for g in groups],dtype=np.int64)
+        numCells = int(lengths.sum())
+        index = {}
+        for (i,c) in enumerate(c for g in groups for c in g):
+            index[c] = 2*i
+            # Reversed cells that do not exist yet are not created here
+            if c.existing_reverse:
+                index[c.existing_reverse] = 2*i+1
+        categories = np.append(np.repeat(np.arange(len(groups),dtype=np.int64),
+                                         lengths),-1)
+        positions = np.append(np.arange(numCells,dtype=np.int64)
+                              - np.repeat(np.cumsum(lengths)-lengths,lengths),
+                              -1)
+        self.__cellIndices[dim] = (key,index,categories,positions)
+        return (index,categories,positions)
+
+
+    def __lookUpCells(self,cells,dim):
+        '''
+        Looks up the given cells and returns the global indices (n for
+        missing cells), a boolean array that is True for reversed cells and
+        the cached arrays of categories and positions.
+
+        '''
+        (index,categories,positions) = self.__getCellIndices(dim)
+        missing = 2*(len(categories)-1)
+        codes = np.fromiter((index.get(c,missing) for c in cells),
+                            dtype=np.int64,count=len(cells))
+        # Reversed cells that have been created after the index was built
+        for k in np.flatnonzero(codes == missing):
+            c = cells[k]
+            if c.is_reverse and c.my_reverse in index:
+                codes[k] = index[c.my_reverse] ^ 1
+        return (codes >> 1,(codes & 1).astype(bool),categories,positions)
+
+
+    def invalidateCellIndices(self,dim=None):
+        '''
+        Throws away the cached index of the cells of dimension `dim` (None for
+        all dimensions). Changes of the category lists that do not change
+        their lengths (e.g. sorting or shuffling a list in place) must be
+        reported here, unless the complex is renumbered afterwards, which
+        calls this method itself.
+
+        '''
+        if dim is None:
+            self.__cellIndices = {}
+        else:
+            self.__cellIndices.pop(dim,None)
+
+# ------------------------------------------------------------------------
+#    Batch lookup of cells
+# ------------------------------------------------------------------------
+    def globalIndex(self,cells,dim):
+        '''
+        Position of each cell in the list of all cells of dimension `dim`,
+        ordered by category (inner, border, additional border). These are
+        the rows and columns of the sparse incidence matrices as long as the
+        number of every cell is its position in its category list, e.g.
+        after renumbering a primal complex. A reversed cell has the
+        index of the cell itself.
+
+        :param list cells: k-cells of dimension `dim`
+        :param int dim: Dimension of the cells
+        :return: NumPy array of indices, -1 for cells that are not in the
+            complex
+
+        '''
+        (indices,reverse,categories,positions) = self.__lookUpCells(cells,dim)
+        indices[indices == len(categories)-1] = -1
+        return indices
+
+
+    def blockIndex(self,cells,dim):
+        '''
+        Category and position of each cell within the list of its category,
+        i.e. the row or column in the incidence block of this category. This
+        is the number of the cell after renumbering.
+
+        :param list cells: k-cells of dimension `dim`
+        :param int dim: Dimension of the cells
+        :return: Two NumPy arrays: the category (0 inner, 1 border,
+            2 additional border) and the position in the list of this
+            category. Both are -1 for cells that are not in the complex.
+
+        '''
+        (indices,reverse,categories,positions) = self.__lookUpCells(cells,dim)
+        return (categories[indices],positions[indices])
+
+
+    def cellOrientation(self,cells,dim):
+        '''
+        Orientation of each cell relative to the cell stored in the complex.
+
+        :return: NumPy array with 1 for the stored cell, -1 for its reverse
+            and 0 for cells that are not in the complex
+
+        '''
+        (indices,reverse,categories,positions) = self.__lookUpCells(cells,dim)
+        orientation = np.where(reverse,-1,1)
+        orientation[indices == len(categories)-1] = 0
+        return orientation
+
+# ------------------------------------------------------------------------
+#    Convert collected triplets to a sparse matrix
+# ------------------------------------------------------------------------
+    def triplesToSparse(self,rows,cols,vals,dim1,dim2,sparseFormat='csr'):
+        '''
+        Assembles a sparse matrix of shape (dim1,dim2) from COO triplets.
+
+        :param str sparseFormat: 'csr' or 'csc'
+
+        '''
+        incidenceMatrix = sp.coo_matrix((np.array(vals,dtype=float),
+                                         (np.array(rows,dtype=np.int64),
+                                          np.array(cols,dtype=np.int64))),
+                                        shape=(dim1,dim2))
+        if sparseFormat == 'csc':
+            return incidenceMatrix.tocsc()
+        elif sparseFormat == 'csr':
+            return incidenceMatrix.tocsr()
+        else:
+            _log.error('Unknown sparse format {}, using csr'.format(sparseFormat))
+            return incidenceMatrix.tocsr()
+
 # ------------------------------------------------------------------------
 #    Calculate incidence matrix 1 between nodes and edges
 # ------------------------------------------------------------------------
-    def calcIncidence1(self,nodes,edges):
+    def calcIncidence1(self,nodes,edges,sparse=False,sparseFormat='csr'):
         '''
+        Incidence matrix between the given nodes and edges.
+
+        :param bool sparse: Return a scipy.sparse matrix that is assembled
+            from COO triplets in one pass over the edges, with the same
+            entries as the dense matrix, see :meth:`incidenceTriples`
+        :param str sparseFormat: 'csr' or 'csc', only used if sparse is True
 
         '''
         dim1 = len(nodes)
         dim2 = len(edges)
+        if sparse:
+            return self.triplesToSparse(*self.incidenceTriples(1,nodes,edges),
+                                        dim1,dim2,sparseFormat)
+
         incidenceMatrix = np.zeros((dim1,dim2))
         for e in edges:
             if e.startNode in nodes:
@@ -231,12 +463,22 @@ class Complex:
 # ------------------------------------------------------------------------
 #    Calculate incidence matrix 2 between edges and faces
 # ------------------------------------------------------------------------
-    def calcIncidence2(self,edges,faces):
+    def calcIncidence2(self,edges,faces,sparse=False,sparseFormat='csr'):
         '''
+        Incidence matrix between the given edges and faces.
+
+        :param bool sparse: Return a scipy.sparse matrix that is assembled
+            from COO triplets in one pass over the faces, with the same
+            entries as the dense matrix, see :meth:`incidenceTriples`
+        :param str sparseFormat: 'csr' or 'csc', only used if sparse is True
 
         '''
         dim1 = len(edges)
         dim2 = len(faces)
+        if sparse:
+            return self.triplesToSparse(*self.incidenceTriples(2,edges,faces),
+                                        dim1,dim2,sparseFormat)
+
         incidenceMatrix = np.zeros((dim1,dim2))
         for f in faces:
             for e in f.edges:
@@ -260,12 +502,22 @@ class Complex:
 # ------------------------------------------------------------------------
 #    Calculate incidence matrix 2 between faces and volumes
 # ------------------------------------------------------------------------
-    def calcIncidence3(self,faces,volumes):
+    def calcIncidence3(self,faces,volumes,sparse=False,sparseFormat='csr'):
         '''
+        Incidence matrix between the given faces and volumes.
+
+        :param bool sparse: Return a scipy.sparse matrix that is assembled
+            from COO triplets in one pass over the volumes, with the same
+            entries as the dense matrix, see :meth:`incidenceTriples`
+        :param str sparseFormat: 'csr' or 'csc', only used if sparse is True
 
         '''
         dim1 = len(faces)
         dim2 = len(volumes)
+        if sparse:
+            return self.triplesToSparse(*self.incidenceTriples(3,faces,volumes),
+                                        dim1,dim2,sparseFormat)
+
         incidenceMatrix = np.zeros((dim1,dim2))
         for v in volumes:
             for f in v.faces:
@@ -285,6 +537,54 @@ class Complex:
                         _log.error('Cannot assign value [{},{}] in matrix of dimension ({},{})'.format(entry1,entry2,dim1,dim2))
         return incidenceMatrix
 
+# ------------------------------------------------------------------------
+#    Entries of an incidence matrix as triplets
+# ------------------------------------------------------------------------
+    def incidenceTriples(self,dim,lowerCells,upperCells,shape=None):
+        '''
+        Non-zero entries of the incidence matrix of dimension `dim` between
+        the given cells. As in the dense matrices, the row and column of an
+        entry are the numbers of the cells, not their positions in the lists.
+        A cell in the boundary of an upper cell gets +1 if it is found in
+        the list of lower cells and -1 if its reverse is found there (for
+        dimension 1, the start node gets -1 and the end node +1).
+
+        :param int dim: 1, 2 or 3
+        :param list lowerCells: Cells of dimension `dim`-1
+        :param list upperCells: Cells of dimension `dim`
+        :param tuple shape: Size of the matrix that the entries must fit in,
+            (len(lowerCells),len(upperCells)) if None. Entries outside of it
+            are left out with an error.
+        :return: NumPy arrays of rows, columns and values
+
+        '''
+        if shape is None:
+            shape = (len(lowerCells),len(upperCells))
+        (dim1,dim2) = shape
+        lower = set(lowerCells)
+        triples = []
+        for u in upperCells:
+            if dim == 1:
+                boundary = ((u.startNode,-1),(u.endNode,1))
+            elif dim == 2:
+                boundary = ((e,1) for e in u.edges)
+            else:
+                boundary = ((f,1) for f in u.faces)
+            for (c,val) in boundary:
+                if c in lower:
+                    triples.append((c.num,u.num,val))
+                elif dim > 1:
+                    # Do not create reversed cells just to look them up
+                    mc = c.my_reverse if c.is_reverse else c.existing_reverse
+                    if mc is not None and mc in lower:
+                        triples.append((c.num,u.num,-val))
+        triples = np.array(triples,dtype=np.int64).reshape(-1,3)
+        (rows,cols,vals) = triples.T
+        inside = (rows >= 0) & (rows < dim1) & (cols >= 0) & (cols < dim2)
+        for (entry1,entry2) in zip(rows[~inside],cols[~inside]):
+            _log.error('Cannot assign value [{},{}] in matrix of dimension ({},{})'.format(entry1,entry2,dim1,dim2))
+        return (rows[inside],cols[inside],vals[inside])
+
 
 # ------------------------------------------------------------------------
 #    Check that d1 = ± d2
@@ -298,7 +598,7 @@ class Complex:
                 cc.printBlue('Check {} = {}^T ... '.format(description1,description2),end='')
 
         try:
-            if (matrix1-matrix2.transpose()).any():
+            if self.__anyNonZero(matrix1-matrix2.transpose()):
                 if doPrints:
                     cc.printRed('Not ok')
                 return False
@@ -323,7 +623,7 @@ class Complex:
                 cc.printBlue('Check {} = 0 ... '.format(description),end='')
 
         try:
-            if (matrix).any():
+            if self.__anyNonZero(matrix):
                 if doPrints:
                     cc.printRed('Not ok')
                 return False
@@ -337,6 +637,19 @@ class Complex:
 
 
 
+# ------------------------------------------------------------------------
+#    Check for non-zero entries in dense or sparse matrices
+# ------------------------------------------------------------------------
+    def __anyNonZero(self,matrix):
+        '''
+
+        '''
+        if sp.issparse(matrix):
+            return matrix.count_nonzero() > 0
+        else:
+            return np.asarray(matrix).any()
+
+
     def printHeadline(self,text,myPrint,symbol='#'):
         '''
 
@@ -45,6 +45,8 @@ from complex.complex import Complex
 import tools.colorConsole as cc
 from tools.tikZPicture.tikZPicture2D import TikZPicture2D
 from tools.printTable import Table
+from tools.cellList import CellList
+from tools.cellList import unique_cells
 
 
 #==============================================================================
@@ -102,23 +104,23 @@ class Complex2D(Complex):
         self.__nodes = nodes[:]
         self.__edges = edges[:]
         self.__faces = faces[:]
-        self.__innerNodes1 = []
-        self.__borderNodes1 = []
-        self.__additionalBorderNodes1 = []
-        self.__innerEdges1 = []
-        self.__borderEdges1 = []
-        self.__additionalBorderEdges1 = []
-        self.__innerFaces1 = []
-        self.__borderFaces1 = []
-        self.__innerNodes2 = []
-        self.__borderNodes2 = []
-        self.__additionalBorderNodes2 = []
-        self.__innerEdges2 = []
-        self.__borderEdges2 = []
-        self.__additionalBorderEdges2 = []
-        self.__innerFaces2 = []
-        self.__borderFaces2 = []
-        self.__geometricNodes = []
+        self.__innerNodes1 = CellList()
+        self.__borderNodes1 = CellList()
+        self.__additionalBorderNodes1 = CellList()
+        self.__innerEdges1 = CellList()
+        self.__borderEdges1 = CellList()
+        self.__additionalBorderEdges1 = CellList()
+        self.__innerFaces1 = CellList()
+        self.__borderFaces1 = CellList()
+        self.__innerNodes2 = CellList()
+        self.__borderNodes2 = CellList()
+        self.__additionalBorderNodes2 = CellList()
+        self.__innerEdges2 = CellList()
+        self.__borderEdges2 = CellList()
+        self.__additionalBorderEdges2 = CellList()
+        self.__innerFaces2 = CellList()
+        self.__borderFaces2 = CellList()
+        self.__geometricNodes = CellList()
         self.__xLim = None
         self.__xMin = None
         self.__xMax = None
@@ -763,15 +765,15 @@ class Complex2D(Complex):
 
         '''
 
-        self.__innerNodes1 = []
-        self.__borderNodes1 = []
-        self.__additionalBorderNodes1 = []
-        self.__innerEdges1 = []
-        self.__borderEdges1 = []
-        self.__additionalBorderEdges1 = []
-        self.__innerFaces1 = []
-        self.__borderFaces1 = []
-        self.__geometricNodes = []
+        self.__innerNodes1 = CellList()
+        self.__borderNodes1 = CellList()
+        self.__additionalBorderNodes1 = CellList()
+        self.__innerEdges1 = CellList()
+        self.__borderEdges1 = CellList()
+        self.__additionalBorderEdges1 = CellList()
+        self.__innerFaces1 = CellList()
+        self.__borderFaces1 = CellList()
+        self.__geometricNodes = CellList()
 
         # Sort faces
         for f in self.faces:
@@ -798,10 +800,10 @@ class Complex2D(Complex):
 
 
         # Sort nodes
-        for e in self.edges:
-            for n in e.geometricNodes:
-                if not n in self.nodes:
-                    self.nodes.append(n)
+        nodes = CellList(self.nodes)
+        self.nodes.extend(n for n in unique_cells(n for e in self.edges
+                                                  for n in e.geometricNodes)
+                          if not n in nodes)
 
         for n in self.nodes:
             if n.is_geometrical:
@@ -833,14 +835,14 @@ class Complex2D(Complex):
 
         '''
 
-        self.__innerNodes2 = []
-        self.__borderNodes2 = []
-        self.__additionalBorderNodes2 = []
-        self.__innerEdges2 = []
-        self.__borderEdges2 = []
-        self.__additionalBorderEdges2 = []
-        self.__innerFaces2 = []
-        self.__borderFaces2 = []
+        self.__innerNodes2 = CellList()
+        self.__borderNodes2 = CellList()
+        self.__additionalBorderNodes2 = CellList()
+        self.__innerEdges2 = CellList()
+        self.__borderEdges2 = CellList()
+        self.__additionalBorderEdges2 = CellList()
+        self.__innerFaces2 = CellList()
+        self.__borderFaces2 = CellList()
 
         # Sort faces
         for f in self.faces:
@@ -925,9 +927,30 @@ class Complex2D(Complex):
         self.__changedIncidenceMatrix2Bi = True
         self.__changedIncidenceMatrix2Bb = True
 
+        self.invalidateCellIndices()
         self.__changedLimits = True
 
 
+#-------------------------------------------------------------------------
+#    Lists of cells of one dimension, sorted by category
+#-------------------------------------------------------------------------
+    def categoryGroups(self,dim):
+        '''
+        Returns the lists of inner, border and additional border cells of the
+        given dimension (0 to 2). Faces have no additional border category.
+
+        '''
+        if dim == 0:
+            return [self.innerNodes,self.borderNodes,self.additionalBorderNodes]
+        elif dim == 1:
+            return [self.innerEdges,self.borderEdges,self.additionalBorderEdges]
+        elif dim == 2:
+            return [self.innerFaces,self.borderFaces]
+        else:
+            self.logger.error('There are no cells of dimension {}'.format(dim))
+            return []
+
+
 #-------------------------------------------------------------------------
 #    Plot using pyplot
 #-------------------------------------------------------------------------
@@ -50,7 +50,9 @@ if __name__ == '__main__':
 #    Standard Libraries
 #-------------------------------------------------------------------------
 import logging
+import contextlib
 import numpy as np
+import scipy.sparse as sp
 import matplotlib.pyplot as plt
 
 from itertools import chain,islice
@@ -68,10 +70,15 @@ from pyCellFoamCore.k_cells.node.node import Node
 from pyCellFoamCore.k_cells.edge.edge import Edge
 from pyCellFoamCore.k_cells.face.face import Face
 from pyCellFoamCore.k_cells.volume.volume import Volume
+from pyCellFoamCore.k_cells.cell import cell_events
+from pyCellFoamCore.k_cells.face.simple_face_geometry import update_simple_faces
+from pyCellFoamCore.k_cells.volume.volume_geometry import update_volumes
 
 #    Complex & Grids
 #--------------------------------------------------------------------
 from pyCellFoamCore.complex.complex import Complex
+from pyCellFoamCore.complex.compiledComplex3D import CompiledComplex3D
+from pyCellFoamCore.complex.topologyReport import TopologyReport
 
 #    Tools
 #--------------------------------------------------------------------
@@ -82,6 +89,8 @@ import pyCellFoamCore.tools.tumcolor as tc
 
 from pyCellFoamCore.tools.tikZPicture.tikZPicture3D import TikZPicture3D
 from pyCellFoamCore.tools.printTable import Table
+from pyCellFoamCore.tools.cellList import CellList
+from pyCellFoamCore.tools.cellList import unique_cells
 
 
 # =============================================================================
@@ -126,30 +135,38 @@ class Complex3D(Complex):
                  '__yLim','__yMin','__yMax',
                  '__zLim','__zMin','__zMax',
                  '__changedLimits',
-                 '__incidenceMatrix1ii','__changedIncidenceMatrix1ii',
-                 '__incidenceMatrix1ib','__changedIncidenceMatrix1ib',
-                 '__incidenceMatrix1iB','__changedIncidenceMatrix1iB',
-                 '__incidenceMatrix1bi','__changedIncidenceMatrix1bi',
-                 '__incidenceMatrix1bb','__changedIncidenceMatrix1bb',
-                 '__incidenceMatrix1bB','__changedIncidenceMatrix1bB',
-                 '__incidenceMatrix1Bi','__changedIncidenceMatrix1Bi',
-                 '__incidenceMatrix1Bb','__changedIncidenceMatrix1Bb',
-                 '__incidenceMatrix1BB','__changedIncidenceMatrix1BB',
-                 '__incidenceMatrix2ii','__changedIncidenceMatrix2ii',
-                 '__incidenceMatrix2ib','__changedIncidenceMatrix2ib',
-                 '__incidenceMatrix2iB','__changedIncidenceMatrix2iB',
-                 '__incidenceMatrix2bi','__changedIncidenceMatrix2bi',
-                 '__incidenceMatrix2bb','__changedIncidenceMatrix2bb',
-                 '__incidenceMatrix2bB','__changedIncidenceMatrix2bB',
-                 '__incidenceMatrix2Bi','__changedIncidenceMatrix2Bi',
-                 '__incidenceMatrix2Bb','__changedIncidenceMatrix2Bb',
-                 '__incidenceMatrix2BB','__changedIncidenceMatrix2BB',
-                 '__incidenceMatrix3ii','__changedIncidenceMatrix3ii',
-                 '__incidenceMatrix3ib','__changedIncidenceMatrix3ib',
-                 '__incidenceMatrix3bi','__changedIncidenceMatrix3bi',
-                 '__incidenceMatrix3bb','__changedIncidenceMatrix3bb',
-                 '__incidenceMatrix3Bi','__changedIncidenceMatrix3Bi',
-                 '__incidenceMatrix3Bb','__changedIncidenceMatrix3Bb',
+                 '__coordinates',
+                 '__nodeRows',
+                 '__incidenceMatrix1ii',
+                 '__incidenceMatrix1ib',
+                 '__incidenceMatrix1iB',
+                 '__incidenceMatrix1bi',
+                 '__incidenceMatrix1bb',
+                 '__incidenceMatrix1bB',
+                 '__incidenceMatrix1Bi',
+                 '__incidenceMatrix1Bb',
+                 '__incidenceMatrix1BB',
+                 '__incidenceMatrix2ii',
+                 '__incidenceMatrix2ib',
+                 '__incidenceMatrix2iB',
+                 '__incidenceMatrix2bi',
+                 '__incidenceMatrix2bb',
+                 '__incidenceMatrix2bB',
+                 '__incidenceMatrix2Bi',
+                 '__incidenceMatrix2Bb',
+                 '__incidenceMatrix2BB',
+                 '__incidenceMatrix3ii',
+                 '__incidenceMatrix3ib',
+                 '__incidenceMatrix3bi',
+                 '__incidenceMatrix3bb',
+                 '__incidenceMatrix3Bi',
+                 '__incidenceMatrix3Bb',
+                 '__changedIncidenceBlocks',
+                 '__sparseIncidenceBlocks',
+                 '__incidenceMatrices',
+                 '__sparseIncidenceMatrices',
+                 '__incidenceSlices',
+                 '__changedIncidenceColumns',
                  '__errorCells')
 
 #==============================================================================
@@ -171,46 +188,46 @@ class Complex3D(Complex):
 
 #        self.__myDual = myDual
 
-        self.__nodes = nodes
-        self.__edges = edges
-        self.__faces = faces
-        self.__volumes = volumes
+        self.__nodes = CellList(nodes)
+        self.__edges = CellList(edges)
+        self.__faces = CellList(faces)
+        self.__volumes = CellList(volumes)
 
 
 
         # Initialize lists for nodes
-        self.__innerNodes1 = []
-        self.__borderNodes1 = []
-        self.__additionalBorderNodes1 = []
-        self.__innerNodes2 = []
-        self.__borderNodes2 = []
-        self.__additionalBorderNodes2 = []
-        self.__geometricNodes = []
+        self.__innerNodes1 = CellList()
+        self.__borderNodes1 = CellList()
+        self.__additionalBorderNodes1 = CellList()
+        self.__innerNodes2 = CellList()
+        self.__borderNodes2 = CellList()
+        self.__additionalBorderNodes2 = CellList()
+        self.__geometricNodes = CellList()
 
 
         # Initialize lists for edges
-        self.__innerEdges1 = []
-        self.__borderEdges1 = []
-        self.__additionalBorderEdges1 = []
-        self.__innerEdges2 = []
-        self.__borderEdges2 = []
-        self.__additionalBorderEdges2 = []
-        self.__geometricEdges = []
+        self.__innerEdges1 = CellList()
+        self.__borderEdges1 = CellList()
+        self.__additionalBorderEdges1 = CellList()
+        self.__innerEdges2 = CellList()
+        self.__borderEdges2 = CellList()
+        self.__additionalBorderEdges2 = CellList()
+        self.__geometricEdges = CellList()
 
 
         # Initialize lists for faces
-        self.__borderFaces1 = []
-        self.__innerFaces1 = []
-        self.__additionalBorderFaces1 = []
-        self.__borderFaces2 = []
-        self.__innerFaces2 = []
-        self.__additionalBorderFaces2 = []
+        self.__borderFaces1 = CellList()
+        self.__innerFaces1 = CellList()
+        self.__additionalBorderFaces1 = CellList()
+        self.__borderFaces2 = CellList()
+        self.__innerFaces2 = CellList()
+        self.__additionalBorderFaces2 = CellList()
 
         # Initialize lists for volumes
-        self.__innerVolumes1 = []
-        self.__borderVolumes1 = []
-        self.__innerVolumes2 = []
-        self.__borderVolumes2 = []
+        self.__innerVolumes1 = CellList()
+        self.__borderVolumes1 = CellList()
+        self.__innerVolumes2 = CellList()
+        self.__borderVolumes2 = CellList()
 
 
 
@@ -226,8 +243,23 @@ class Complex3D(Complex):
         self.__zMin = None
         self.__zMax = None
         self.__changedLimits = True
-
-
+        self.__coordinates = None
+        self.__nodeRows = {}
+
+        # Cached incidence data. The sparse blocks and matrices are only
+        # stored while they are valid
+        self.__changedIncidenceBlocks = {
+            1: {r+c: True for r in 'ibB' for c in 'ibB'},
+            2: {r+c: True for r in 'ibB' for c in 'ibB'},
+            3: {r+c: True for r in 'ibB' for c in 'ib'}}
+        self.__sparseIncidenceBlocks = {1: {}, 2: {}, 3: {}}
+        self.__incidenceMatrices = {}
+        self.__sparseIncidenceMatrices = {}
+        self.__incidenceSlices = {}
+        # Cells whose column in a cached sparse block must be recalculated
+        self.__changedIncidenceColumns = {1: {}, 2: {}, 3: {}}
+
+        cell_events.register_listener(self)
 
         super().__init__()
 
@@ -352,6 +384,25 @@ class Complex3D(Complex):
 
     '''
 
+#-------------------------------------------------------------------------
+#    Coordinates
+#-------------------------------------------------------------------------
+
+    def __getCoordinates(self):
+        self.materialize(0)
+        if self.__coordinates is None or len(self.__coordinates) != len(self.__nodes):
+            self.__calcCoordinates()
+        coordinates = self.__coordinates.view()
+        coordinates.flags.writeable = False
+        return coordinates
+    coordinates = property(__getCoordinates)
+    '''
+    Read-only N x 3 array with the coordinates of all nodes, in the order of
+    :attr:`nodes`. It is updated when the coordinates of a node are set and
+    rebuilt when the nodes of the complex change.
+
+    '''
+
 
 
 
@@ -362,10 +413,13 @@ class Complex3D(Complex):
 
 
     def __getNodes(self):
+        self.materialize(0)
         if self.changedNumbering:
             self.renumber()
         return self.__nodes
-    def __setNodes(self,n): self.__nodes = n[:]
+    def __setNodes(self,n):
+        self.__nodes = CellList(n)
+        self.changedCells(0)
     nodes = property(__getNodes,__setNodes)
     r'''
     All nodes :math:`\Np = \Npi \cup \Npb \cup \NpB` of the complex.
@@ -373,21 +427,27 @@ class Complex3D(Complex):
     '''
 
 
-    def __getInnerNodes1(self): return self.__innerNodes1
+    def __getInnerNodes1(self):
+        self.materialize(0)
+        return self.__innerNodes1
     innerNodes1 = property(__getInnerNodes1)
     r'''
     Inner nodes :math:`\Npi` according to categorization method 1.
 
     '''
 
-    def __getInnerNodes2(self): return self.__innerNodes2
+    def __getInnerNodes2(self):
+        self.materialize(0)
+        return self.__innerNodes2
     innerNodes2 = property(__getInnerNodes2)
     r'''
     Inner nodes :math:`\Npi` according to categorization method 2.
 
     '''
 
-    def __getInnerNodes(self): return self.pickCategory(self.__innerNodes1,self.__innerNodes2)
+    def __getInnerNodes(self):
+        self.materialize(0)
+        return self.pickCategory(self.__innerNodes1,self.__innerNodes2)
     innerNodes = property(__getInnerNodes)
     r'''
     Inner nodes :math:`\Npi` according to the currently selected categorization
@@ -396,21 +456,27 @@ class Complex3D(Complex):
     '''
 
 
-    def __getBorderNodes1(self): return self.__borderNodes1
+    def __getBorderNodes1(self):
+        self.materialize(0)
+        return self.__borderNodes1
     borderNodes1 = property(__getBorderNodes1)
     r'''
     Border nodes :math:`\Npb` according to categorization method 1.
 
     '''
 
-    def __getBorderNodes2(self): return self.__borderNodes2
+    def __getBorderNodes2(self):
+        self.materialize(0)
+        return self.__borderNodes2
     borderNodes2 = property(__getBorderNodes2)
     r'''
     Border nodes :math:`\Npb` according to categorization method 2.
 
     '''
 
-    def __getBorderNodes(self): return self.pickCategory(self.__borderNodes1,self.__borderNodes2)
+    def __getBorderNodes(self):
+        self.materialize(0)
+        return self.pickCategory(self.__borderNodes1,self.__borderNodes2)
     borderNodes = property(__getBorderNodes)
     r'''
     Border nodes :math:`\Npb` according to the currently selected categorization
@@ -419,14 +485,18 @@ class Complex3D(Complex):
     '''
 
 
-    def __getAdditionalBorderNodes1(self): return self.__additionalBorderNodes1
+    def __getAdditionalBorderNodes1(self):
+        self.materialize(0)
+        return self.__additionalBorderNodes1
     additionalBorderNodes1 = property(__getAdditionalBorderNodes1)
     r'''
     Additional border nodes :math:`\NpB` according to categorization method 1.
 
     '''
 
-    def __getAdditionalBorderNodes2(self): return self.__additionalBorderNodes2
+    def __getAdditionalBorderNodes2(self):
+        self.materialize(0)
+        return self.__additionalBorderNodes2
     def __setAdditionalBorderNodes2(self,a): self.__additionalBorderNodes2 = a
     additionalBorderNodes2 = property(__getAdditionalBorderNodes2,__setAdditionalBorderNodes2)
     r'''
@@ -434,7 +504,9 @@ class Complex3D(Complex):
 
     '''
 
-    def __getAdditionalBorderNodes(self): return self.pickCategory(self.__additionalBorderNodes1,self.__additionalBorderNodes2)
+    def __getAdditionalBorderNodes(self):
+        self.materialize(0)
+        return self.pickCategory(self.__additionalBorderNodes1,self.__additionalBorderNodes2)
     additionalBorderNodes = property(__getAdditionalBorderNodes)
     r'''
     Additional border nodes :math:`\NpB` according to the currently selected
@@ -444,10 +516,11 @@ class Complex3D(Complex):
 
 
     def __getGeometricNodes(self):
+        self.materialize(2)
 #        if self.changedNumbering:
 #            self.renumber()
         return self.__geometricNodes
-    def __setGeometricNodes(self,n): self.__geometricNodes = n[:]
+    def __setGeometricNodes(self,n): self.__geometricNodes = CellList(n)
     geometricNodes = property(__getGeometricNodes,__setGeometricNodes)
     '''
     Geometric nodes which are not part of the cell complex but are necessary to
@@ -460,10 +533,13 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
 
     def __getEdges(self):
+        self.materialize(1)
         if self.changedNumbering:
             self.renumber()
         return self.__edges
-    def __setEdges(self,e): self.__edges = e[:]
+    def __setEdges(self,e):
+        self.__edges = CellList(e)
+        self.changedCells(1)
     edges = property(__getEdges,__setEdges)
     r'''
     All edges :math:`\Ep = \Epi \cup \Epb \cup \EpB` of the complex.
@@ -471,21 +547,27 @@ class Complex3D(Complex):
     '''
 
 
-    def __getInnerEdges1(self): return self.__innerEdges1
+    def __getInnerEdges1(self):
+        self.materialize(1)
+        return self.__innerEdges1
     innerEdges1 = property(__getInnerEdges1)
     r'''
     Inner edges :math:`\Epi` according to categorization method 1.
 
     '''
 
-    def __getInnerEdges2(self): return self.__innerEdges2
+    def __getInnerEdges2(self):
+        self.materialize(1)
+        return self.__innerEdges2
     innerEdges2 = property(__getInnerEdges2)
     r'''
     Inner edges :math:`\Epi` according to categorization method 2.
 
     '''
 
-    def __getInnerEdges(self): return self.pickCategory(self.__innerEdges1,self.__innerEdges2)
+    def __getInnerEdges(self):
+        self.materialize(1)
+        return self.pickCategory(self.__innerEdges1,self.__innerEdges2)
     innerEdges = property(__getInnerEdges)
     r'''
     Inner edges :math:`\Epi` according to the currently selected categorization
@@ -493,21 +575,27 @@ class Complex3D(Complex):
 
     '''
 
-    def __getBorderEdges1(self): return self.__borderEdges1
+    def __getBorderEdges1(self):
+        self.materialize(1)
+        return self.__borderEdges1
     borderEdges1 = property(__getBorderEdges1)
     r'''
     Border edges :math:`\Epb` according to categorization method 1.
 
     '''
 
-    def __getBorderEdges2(self): return self.__borderEdges2
+    def __getBorderEdges2(self):
+        self.materialize(1)
+        return self.__borderEdges2
     borderEdges2 = property(__getBorderEdges2)
     r'''
     Border edges :math:`\Epb` according to categorization method 2.
 
     '''
 
-    def __getBorderEdges(self): return self.pickCategory(self.__borderEdges1,self.__borderEdges2)
+    def __getBorderEdges(self):
+        self.materialize(1)
+        return self.pickCategory(self.__borderEdges1,self.__borderEdges2)
     borderEdges = property(__getBorderEdges)
     r'''
     Border edges :math:`\Epb` according to the currently selected categorization
@@ -515,21 +603,27 @@ class Complex3D(Complex):
 
     '''
 
-    def __getAdditionalBorderEdges1(self): return self.__additionalBorderEdges1
+    def __getAdditionalBorderEdges1(self):
+        self.materialize(1)
+        return self.__additionalBorderEdges1
     additionalBorderEdges1 = property(__getAdditionalBorderEdges1)
     r'''
     Additional border edges :math:`\Epb` according to categorization method 1.
 
     '''
 
-    def __getAdditionalBorderEdges2(self): return self.__additionalBorderEdges2
+    def __getAdditionalBorderEdges2(self):
+        self.materialize(1)
+        return self.__additionalBorderEdges2
     additionalBorderEdges2 = property(__getAdditionalBorderEdges2)
     r'''
     Additional border edges :math:`\Epb` according to categorization method 2.
 
     '''
 
-    def __getAdditionalBorderEdges(self): return self.pickCategory(self.__additionalBorderEdges1,self.__additionalBorderEdges2)
+    def __getAdditionalBorderEdges(self):
+        self.materialize(1)
+        return self.pickCategory(self.__additionalBorderEdges1,self.__additionalBorderEdges2)
     additionalBorderEdges = property(__getAdditionalBorderEdges)
     r'''
     Additional border edges :math:`\EpB` according to the currently selected
@@ -539,10 +633,11 @@ class Complex3D(Complex):
 
 
     def __getGeometricEdges(self):
+        self.materialize(2)
 #        if self.changedNumbering:
 #            self.renumber()
         return self.__geometricEdges
-    def __setGeometricEdges(self,e): self.__geometricEdges = e[:]
+    def __setGeometricEdges(self,e): self.__geometricEdges = CellList(e)
     geometricEdges = property(__getGeometricEdges,__setGeometricEdges)
 
 #-------------------------------------------------------------------------
@@ -550,10 +645,13 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
 
     def __getFaces(self):
+        self.materialize(2)
         if self.changedNumbering:
             self.renumber()
         return self.__faces
-    def __setFaces(self,e): self.__faces = e[:]
+    def __setFaces(self,e):
+        self.__faces = CellList(e)
+        self.changedCells(2)
     faces = property(__getFaces,__setFaces)
     r'''
     All faces :math:`\Fp = \Fpi \cup \Fpb \cup \FpB` of the complex.
@@ -561,21 +659,27 @@ class Complex3D(Complex):
     '''
 
 
-    def __getInnerFaces1(self): return self.__innerFaces1
+    def __getInnerFaces1(self):
+        self.materialize(2)
+        return self.__innerFaces1
     innerFaces1 = property(__getInnerFaces1)
     r'''
     Inner faces :math:`\Fpi` according to categorization method 1.
 
     '''
 
-    def __getInnerFaces2(self): return self.__innerFaces2
+    def __getInnerFaces2(self):
+        self.materialize(2)
+        return self.__innerFaces2
     innerFaces2 = property(__getInnerFaces2)
     r'''
     Inner faces :math:`\Fpi` according to categorization method 2.
 
     '''
 
-    def __getInnerFaces(self): return self.pickCategory(self.__innerFaces1,self.__innerFaces2)
+    def __getInnerFaces(self):
+        self.materialize(2)
+        return self.pickCategory(self.__innerFaces1,self.__innerFaces2)
     innerFaces = property(__getInnerFaces)
     r'''
     Inner faces :math:`\Fpi` according to the currently selected categorization
@@ -583,21 +687,27 @@ class Complex3D(Complex):
 
     '''
 
-    def __getBorderFaces1(self): return self.__borderFaces1
+    def __getBorderFaces1(self):
+        self.materialize(2)
+        return self.__borderFaces1
     borderFaces1 = property(__getBorderFaces1)
     r'''
     Border faces :math:`\Fpb` according to categorization method 1.
 
     '''
 
-    def __getBorderFaces2(self): return self.__borderFaces2
+    def __getBorderFaces2(self):
+        self.materialize(2)
+        return self.__borderFaces2
     borderFaces2 = property(__getBorderFaces2)
     r'''
     Border faces :math:`\Fpb` according to categorization method 2.
 
     '''
 
-    def __getBorderFaces(self): return self.pickCategory(self.__borderFaces1,self.__borderFaces2)
+    def __getBorderFaces(self):
+        self.materialize(2)
+        return self.pickCategory(self.__borderFaces1,self.__borderFaces2)
     borderFaces = property(__getBorderFaces)
     r'''
     Border faces :math:`\Fpb` according to the currently selected categorization
@@ -605,21 +715,27 @@ class Complex3D(Complex):
 
     '''
 
-    def __getAdditionalBorderFaces1(self): return self.__additionalBorderFaces1
+    def __getAdditionalBorderFaces1(self):
+        self.materialize(2)
+        return self.__additionalBorderFaces1
     additionalBorderFaces1 = property(__getAdditionalBorderFaces1)
     r'''
     Additional border faces :math:`\Fpb` according to categorization method 1.
 
     '''
 
-    def __getAdditionalBorderFaces2(self): return self.__additionalBorderFaces2
+    def __getAdditionalBorderFaces2(self):
+        self.materialize(2)
+        return self.__additionalBorderFaces2
     additionalBorderFaces2 = property(__getAdditionalBorderFaces2)
     r'''
     Additional border faces :math:`\Fpb` according to categorization method 2.
 
     '''
 
-    def __getAdditionalBorderFaces(self): return self.pickCategory(self.__additionalBorderFaces1,self.__additionalBorderFaces2)
+    def __getAdditionalBorderFaces(self):
+        self.materialize(2)
+        return self.pickCategory(self.__additionalBorderFaces1,self.__additionalBorderFaces2)
     additionalBorderFaces = property(__getAdditionalBorderFaces)
     r'''
     Additional border faces :math:`\FpB` according to the currently selected
@@ -634,28 +750,36 @@ class Complex3D(Complex):
 
 
 
-    def __getInnerVolumes1(self): return self.__innerVolumes1
+    def __getInnerVolumes1(self):
+        self.materialize(3)
+        return self.__innerVolumes1
     def __setInnerVolumes1(self,i): self.__innerVolumes1 = i
     innerVolumes1 = property(__getInnerVolumes1,__setInnerVolumes1)
     '''
 
     '''
 
-    def __getInnerVolumes2(self): return self.__innerVolumes2
+    def __getInnerVolumes2(self):
+        self.materialize(3)
+        return self.__innerVolumes2
     def __setInnerVolumes2(self,i): self.__innerVolumes2 = i
     innerVolumes2 = property(__getInnerVolumes2,__setInnerVolumes2)
     '''
 
     '''
 
-    def __getBorderVolumes1(self): return self.__borderVolumes1
+    def __getBorderVolumes1(self):
+        self.materialize(3)
+        return self.__borderVolumes1
     def __setBorderVolumes1(self,b): self.__borderVolumes1 = b
     borderVolumes1 = property(__getBorderVolumes1,__setBorderVolumes1)
     '''
 
     '''
 
-    def __getBorderVolumes2(self): return self.__borderVolumes2
+    def __getBorderVolumes2(self):
+        self.materialize(3)
+        return self.__borderVolumes2
     def __setBorderVolumes2(self,b): self.__borderVolumes2 = b
     borderVolumes2 = property(__getBorderVolumes2,__setBorderVolumes2)
     '''
@@ -666,8 +790,12 @@ class Complex3D(Complex):
 
 
 
-    def __getVolumes(self): return self.__volumes
-    def __setVolumes(self,v): self.__volumes = v[:]
+    def __getVolumes(self):
+        self.materialize(3)
+        return self.__volumes
+    def __setVolumes(self,v):
+        self.__volumes = CellList(v)
+        self.changedCells(3)
     volumes = property(__getVolumes,__setVolumes)
     '''
 
@@ -678,13 +806,17 @@ class Complex3D(Complex):
 
 
 
-    def __getInnerVolumes(self): return self.pickCategory(self.__innerVolumes1,self.__innerVolumes2)
+    def __getInnerVolumes(self):
+        self.materialize(3)
+        return self.pickCategory(self.__innerVolumes1,self.__innerVolumes2)
     innerVolumes = property(__getInnerVolumes)
     '''
 
     '''
 
-    def __getBorderVolumes(self): return self.pickCategory(self.__borderVolumes1,self.__borderVolumes2)
+    def __getBorderVolumes(self):
+        self.materialize(3)
+        return self.pickCategory(self.__borderVolumes1,self.__borderVolumes2)
     borderVolumes = property(__getBorderVolumes)
     '''
 
@@ -699,9 +831,9 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
 
     def __getIncidenceMatrix1ii(self):
-        if self.__changedIncidenceMatrix1ii:
-            self.__incidenceMatrix1ii = self.calcIncidence1(self.innerNodes,self.innerEdges)
-            self.__changedIncidenceMatrix1ii = False
+        if self.__changedIncidenceBlocks[1]['ii']:
+            self.__incidenceMatrix1ii = self.incidenceBlock(1,'ii')
+            self.__changedIncidenceBlocks[1]['ii'] = False
         return self.__incidenceMatrix1ii
     incidenceMatrix1ii = property(__getIncidenceMatrix1ii)
     r'''
@@ -711,9 +843,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1ib(self):
-        if self.__changedIncidenceMatrix1ib:
-            self.__incidenceMatrix1ib = self.calcIncidence1(self.innerNodes,self.borderEdges)
-            self.__changedIncidenceMatrix1ib = False
+        if self.__changedIncidenceBlocks[1]['ib']:
+            self.__incidenceMatrix1ib = self.incidenceBlock(1,'ib')
+            self.__changedIncidenceBlocks[1]['ib'] = False
         return self.__incidenceMatrix1ib
     incidenceMatrix1ib = property(__getIncidenceMatrix1ib)
     r'''
@@ -722,9 +854,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix1iB(self):
-        if self.__changedIncidenceMatrix1iB:
-            self.__incidenceMatrix1iB = self.calcIncidence1(self.innerNodes,self.additionalBorderEdges)
-            self.__changedIncidenceMatrix1iB = False
+        if self.__changedIncidenceBlocks[1]['iB']:
+            self.__incidenceMatrix1iB = self.incidenceBlock(1,'iB')
+            self.__changedIncidenceBlocks[1]['iB'] = False
         return self.__incidenceMatrix1iB
     incidenceMatrix1iB = property(__getIncidenceMatrix1iB)
     r'''
@@ -733,9 +865,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix1bi(self):
-        if self.__changedIncidenceMatrix1bi:
-            self.__incidenceMatrix1bi = self.calcIncidence1(self.borderNodes,self.innerEdges)
-            self.__changedIncidenceMatrix1bi = False
+        if self.__changedIncidenceBlocks[1]['bi']:
+            self.__incidenceMatrix1bi = self.incidenceBlock(1,'bi')
+            self.__changedIncidenceBlocks[1]['bi'] = False
         return self.__incidenceMatrix1bi
     incidenceMatrix1bi = property(__getIncidenceMatrix1bi)
     r'''
@@ -745,9 +877,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1bb(self):
-        if self.__changedIncidenceMatrix1bb:
-            self.__incidenceMatrix1bb = self.calcIncidence1(self.borderNodes,self.borderEdges)
-            self.__changedIncidenceMatrix1bb = False
+        if self.__changedIncidenceBlocks[1]['bb']:
+            self.__incidenceMatrix1bb = self.incidenceBlock(1,'bb')
+            self.__changedIncidenceBlocks[1]['bb'] = False
         return self.__incidenceMatrix1bb
     incidenceMatrix1bb = property(__getIncidenceMatrix1bb)
     r'''
@@ -757,9 +889,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1bB(self):
-        if self.__changedIncidenceMatrix1bB:
-            self.__incidenceMatrix1bB = self.calcIncidence1(self.borderNodes,self.additionalBorderEdges)
-            self.__changedIncidenceMatrix1bB = False
+        if self.__changedIncidenceBlocks[1]['bB']:
+            self.__incidenceMatrix1bB = self.incidenceBlock(1,'bB')
+            self.__changedIncidenceBlocks[1]['bB'] = False
         return self.__incidenceMatrix1bB
     incidenceMatrix1bB = property(__getIncidenceMatrix1bB)
     r'''
@@ -769,9 +901,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1Bi(self):
-        if self.__changedIncidenceMatrix1Bi:
-            self.__incidenceMatrix1Bi = self.calcIncidence1(self.additionalBorderNodes,self.innerEdges)
-            self.__changedIncidenceMatrix1Bi = False
+        if self.__changedIncidenceBlocks[1]['Bi']:
+            self.__incidenceMatrix1Bi = self.incidenceBlock(1,'Bi')
+            self.__changedIncidenceBlocks[1]['Bi'] = False
         return self.__incidenceMatrix1Bi
     incidenceMatrix1Bi = property(__getIncidenceMatrix1Bi)
     r'''
@@ -781,9 +913,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1Bb(self):
-        if self.__changedIncidenceMatrix1Bb:
-            self.__incidenceMatrix1Bb = self.calcIncidence1(self.additionalBorderNodes,self.borderEdges)
-            self.__changedIncidenceMatrix1Bb = False
+        if self.__changedIncidenceBlocks[1]['Bb']:
+            self.__incidenceMatrix1Bb = self.incidenceBlock(1,'Bb')
+            self.__changedIncidenceBlocks[1]['Bb'] = False
         return self.__incidenceMatrix1Bb
     incidenceMatrix1Bb = property(__getIncidenceMatrix1Bb)
     r'''
@@ -793,9 +925,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1BB(self):
-        if self.__changedIncidenceMatrix1BB:
-            self.__incidenceMatrix1BB = self.calcIncidence1(self.additionalBorderNodes,self.additionalBorderEdges)
-            self.__changedIncidenceMatrix1BB = False
+        if self.__changedIncidenceBlocks[1]['BB']:
+            self.__incidenceMatrix1BB = self.incidenceBlock(1,'BB')
+            self.__changedIncidenceBlocks[1]['BB'] = False
         return self.__incidenceMatrix1BB
     incidenceMatrix1BB = property(__getIncidenceMatrix1BB)
     r'''
@@ -807,11 +939,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix1(self):
-        incidencematrix1i = np.concatenate((self.incidenceMatrix1ii,self.incidenceMatrix1ib,self.incidenceMatrix1iB),axis=1)
-        incidencematrix1b = np.concatenate((self.incidenceMatrix1bi,self.incidenceMatrix1bb,self.incidenceMatrix1bB),axis=1)
-        incidencematrix1B = np.concatenate((self.incidenceMatrix1Bi,self.incidenceMatrix1Bb,self.incidenceMatrix1BB),axis=1)
-        incidencematrix1 = np.concatenate((incidencematrix1i,incidencematrix1b,incidencematrix1B))
-        return incidencematrix1
+        if 1 not in self.__incidenceMatrices:
+            self.__incidenceMatrices[1] = self.sparseIncidenceMatrix1.toarray()
+        return self.__incidenceMatrices[1]
     incidenceMatrix1 = property(__getIncidenceMatrix1)
     r'''
 
@@ -830,31 +960,31 @@ class Complex3D(Complex):
 
 
 
-    def __getChangedIncidenceMatrix1ii(self): return self.__changedIncidenceMatrix1ii
+    def __getChangedIncidenceMatrix1ii(self): return self.__changedIncidenceBlocks[1]['ii']
     changedIncidenceMatrix1ii = property(__getChangedIncidenceMatrix1ii)
 
-    def __getChangedIncidenceMatrix1ib(self): return self.__changedIncidenceMatrix1ib
+    def __getChangedIncidenceMatrix1ib(self): return self.__changedIncidenceBlocks[1]['ib']
     changedIncidenceMatrix1ib = property(__getChangedIncidenceMatrix1ib)
 
-    def __getChangedIncidenceMatrix1iB(self): return self.__changedIncidenceMatrix1iB
+    def __getChangedIncidenceMatrix1iB(self): return self.__changedIncidenceBlocks[1]['iB']
     changedIncidenceMatrix1iB = property(__getChangedIncidenceMatrix1iB)
 
-    def __getChangedIncidenceMatrix1bi(self): return self.__changedIncidenceMatrix1bi
+    def __getChangedIncidenceMatrix1bi(self): return self.__changedIncidenceBlocks[1]['bi']
     changedIncidenceMatrix1bi = property(__getChangedIncidenceMatrix1bi)
 
-    def __getChangedIncidenceMatrix1bb(self): return self.__changedIncidenceMatrix1bb
+    def __getChangedIncidenceMatrix1bb(self): return self.__changedIncidenceBlocks[1]['bb']
     changedIncidenceMatrix1bb = property(__getChangedIncidenceMatrix1bb)
 
-    def __getChangedIncidenceMatrix1bB(self): return self.__changedIncidenceMatrix1bB
+    def __getChangedIncidenceMatrix1bB(self): return self.__changedIncidenceBlocks[1]['bB']
     changedIncidenceMatrix1bB = property(__getChangedIncidenceMatrix1bB)
 
-    def __getChangedIncidenceMatrix1Bi(self): return self.__changedIncidenceMatrix1Bi
+    def __getChangedIncidenceMatrix1Bi(self): return self.__changedIncidenceBlocks[1]['Bi']
     changedIncidenceMatrix1Bi = property(__getChangedIncidenceMatrix1Bi)
 
-    def __getChangedIncidenceMatrix1Bb(self): return self.__changedIncidenceMatrix1Bb
+    def __getChangedIncidenceMatrix1Bb(self): return self.__changedIncidenceBlocks[1]['Bb']
     changedIncidenceMatrix1Bb = property(__getChangedIncidenceMatrix1Bb)
 
-    def __getChangedIncidenceMatrix1BB(self): return self.__changedIncidenceMatrix1BB
+    def __getChangedIncidenceMatrix1BB(self): return self.__changedIncidenceBlocks[1]['BB']
     changedIncidenceMatrix1BB = property(__getChangedIncidenceMatrix1BB)
 
 
@@ -867,9 +997,9 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
 
     def __getIncidenceMatrix2ii(self):
-        if self.__changedIncidenceMatrix2ii:
-            self.__incidenceMatrix2ii = self.calcIncidence2(self.innerEdges,self.innerFaces)
-            self.__changedIncidenceMatrix2ii = False
+        if self.__changedIncidenceBlocks[2]['ii']:
+            self.__incidenceMatrix2ii = self.incidenceBlock(2,'ii')
+            self.__changedIncidenceBlocks[2]['ii'] = False
         return self.__incidenceMatrix2ii
     incidenceMatrix2ii = property(__getIncidenceMatrix2ii)
     r'''
@@ -879,9 +1009,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2ib(self):
-        if self.__changedIncidenceMatrix2ib:
-            self.__incidenceMatrix2ib = self.calcIncidence2(self.innerEdges,self.borderFaces)
-            self.__changedIncidenceMatrix2ib = False
+        if self.__changedIncidenceBlocks[2]['ib']:
+            self.__incidenceMatrix2ib = self.incidenceBlock(2,'ib')
+            self.__changedIncidenceBlocks[2]['ib'] = False
         return self.__incidenceMatrix2ib
     incidenceMatrix2ib = property(__getIncidenceMatrix2ib)
     r'''
@@ -890,9 +1020,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix2iB(self):
-        if self.__changedIncidenceMatrix2iB:
-            self.__incidenceMatrix2iB = self.calcIncidence2(self.innerEdges,self.additionalBorderFaces)
-            self.__changedIncidenceMatrix2iB = False
+        if self.__changedIncidenceBlocks[2]['iB']:
+            self.__incidenceMatrix2iB = self.incidenceBlock(2,'iB')
+            self.__changedIncidenceBlocks[2]['iB'] = False
         return self.__incidenceMatrix2iB
     incidenceMatrix2iB = property(__getIncidenceMatrix2iB)
     r'''
@@ -901,9 +1031,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix2bi(self):
-        if self.__changedIncidenceMatrix2bi:
-            self.__incidenceMatrix2bi = self.calcIncidence2(self.borderEdges,self.innerFaces)
-            self.__changedIncidenceMatrix2bi = False
+        if self.__changedIncidenceBlocks[2]['bi']:
+            self.__incidenceMatrix2bi = self.incidenceBlock(2,'bi')
+            self.__changedIncidenceBlocks[2]['bi'] = False
         return self.__incidenceMatrix2bi
     incidenceMatrix2bi = property(__getIncidenceMatrix2bi)
     r'''
@@ -913,9 +1043,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2bb(self):
-        if self.__changedIncidenceMatrix2bb:
-            self.__incidenceMatrix2bb = self.calcIncidence2(self.borderEdges,self.borderFaces)
-            self.__changedIncidenceMatrix2bb = False
+        if self.__changedIncidenceBlocks[2]['bb']:
+            self.__incidenceMatrix2bb = self.incidenceBlock(2,'bb')
+            self.__changedIncidenceBlocks[2]['bb'] = False
         return self.__incidenceMatrix2bb
     incidenceMatrix2bb = property(__getIncidenceMatrix2bb)
     r'''
@@ -925,9 +1055,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2bB(self):
-        if self.__changedIncidenceMatrix2bB:
-            self.__incidenceMatrix2bB = self.calcIncidence2(self.borderEdges,self.additionalBorderFaces)
-            self.__changedIncidenceMatrix2bB = False
+        if self.__changedIncidenceBlocks[2]['bB']:
+            self.__incidenceMatrix2bB = self.incidenceBlock(2,'bB')
+            self.__changedIncidenceBlocks[2]['bB'] = False
         return self.__incidenceMatrix2bB
     incidenceMatrix2bB = property(__getIncidenceMatrix2bB)
     r'''
@@ -937,9 +1067,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2Bi(self):
-        if self.__changedIncidenceMatrix2Bi:
-            self.__incidenceMatrix2Bi = self.calcIncidence2(self.additionalBorderEdges,self.innerFaces)
-            self.__changedIncidenceMatrix2Bi = False
+        if self.__changedIncidenceBlocks[2]['Bi']:
+            self.__incidenceMatrix2Bi = self.incidenceBlock(2,'Bi')
+            self.__changedIncidenceBlocks[2]['Bi'] = False
         return self.__incidenceMatrix2Bi
     incidenceMatrix2Bi = property(__getIncidenceMatrix2Bi)
     r'''
@@ -949,9 +1079,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2Bb(self):
-        if self.__changedIncidenceMatrix2Bb:
-            self.__incidenceMatrix2Bb = self.calcIncidence2(self.additionalBorderEdges,self.borderFaces)
-            self.__changedIncidenceMatrix2Bb = False
+        if self.__changedIncidenceBlocks[2]['Bb']:
+            self.__incidenceMatrix2Bb = self.incidenceBlock(2,'Bb')
+            self.__changedIncidenceBlocks[2]['Bb'] = False
         return self.__incidenceMatrix2Bb
     incidenceMatrix2Bb = property(__getIncidenceMatrix2Bb)
     r'''
@@ -961,9 +1091,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2BB(self):
-        if self.__changedIncidenceMatrix2BB:
-            self.__incidenceMatrix2BB = self.calcIncidence2(self.additionalBorderEdges,self.additionalBorderFaces)
-            self.__changedIncidenceMatrix2BB = False
+        if self.__changedIncidenceBlocks[2]['BB']:
+            self.__incidenceMatrix2BB = self.incidenceBlock(2,'BB')
+            self.__changedIncidenceBlocks[2]['BB'] = False
         return self.__incidenceMatrix2BB
     incidenceMatrix2BB = property(__getIncidenceMatrix2BB)
     r'''
@@ -975,11 +1105,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix2(self):
-        incidencematrix2i = np.concatenate((self.incidenceMatrix2ii,self.incidenceMatrix2ib,self.incidenceMatrix2iB),axis=1)
-        incidencematrix2b = np.concatenate((self.incidenceMatrix2bi,self.incidenceMatrix2bb,self.incidenceMatrix2bB),axis=1)
-        incidencematrix2B = np.concatenate((self.incidenceMatrix2Bi,self.incidenceMatrix2Bb,self.incidenceMatrix2BB),axis=1)
-        incidencematrix2 = np.concatenate((incidencematrix2i,incidencematrix2b,incidencematrix2B))
-        return incidencematrix2
+        if 2 not in self.__incidenceMatrices:
+            self.__incidenceMatrices[2] = self.sparseIncidenceMatrix2.toarray()
+        return self.__incidenceMatrices[2]
     incidenceMatrix2 = property(__getIncidenceMatrix2)
     r'''
 
@@ -998,31 +1126,31 @@ class Complex3D(Complex):
 
 
 
-    def __getChangedIncidenceMatrix2ii(self): return self.__changedIncidenceMatrix2ii
+    def __getChangedIncidenceMatrix2ii(self): return self.__changedIncidenceBlocks[2]['ii']
     changedIncidenceMatrix2ii = property(__getChangedIncidenceMatrix2ii)
 
-    def __getChangedIncidenceMatrix2ib(self): return self.__changedIncidenceMatrix2ib
+    def __getChangedIncidenceMatrix2ib(self): return self.__changedIncidenceBlocks[2]['ib']
     changedIncidenceMatrix2ib = property(__getChangedIncidenceMatrix2ib)
 
-    def __getChangedIncidenceMatrix2iB(self): return self.__changedIncidenceMatrix2iB
+    def __getChangedIncidenceMatrix2iB(self): return self.__changedIncidenceBlocks[2]['iB']
     changedIncidenceMatrix2iB = property(__getChangedIncidenceMatrix2iB)
 
-    def __getChangedIncidenceMatrix2bi(self): return self.__changedIncidenceMatrix2bi
+    def __getChangedIncidenceMatrix2bi(self): return self.__changedIncidenceBlocks[2]['bi']
     changedIncidenceMatrix2bi = property(__getChangedIncidenceMatrix2bi)
 
-    def __getChangedIncidenceMatrix2bb(self): return self.__changedIncidenceMatrix2bb
+    def __getChangedIncidenceMatrix2bb(self): return self.__changedIncidenceBlocks[2]['bb']
     changedIncidenceMatrix2bb = property(__getChangedIncidenceMatrix2bb)
 
-    def __getChangedIncidenceMatrix2bB(self): return self.__changedIncidenceMatrix2bB
+    def __getChangedIncidenceMatrix2bB(self): return self.__changedIncidenceBlocks[2]['bB']
     changedIncidenceMatrix2bB = property(__getChangedIncidenceMatrix2bB)
 
-    def __getChangedIncidenceMatrix2Bi(self): return self.__changedIncidenceMatrix2Bi
+    def __getChangedIncidenceMatrix2Bi(self): return self.__changedIncidenceBlocks[2]['Bi']
     changedIncidenceMatrix2Bi = property(__getChangedIncidenceMatrix2Bi)
 
-    def __getChangedIncidenceMatrix2Bb(self): return self.__changedIncidenceMatrix2Bb
+    def __getChangedIncidenceMatrix2Bb(self): return self.__changedIncidenceBlocks[2]['Bb']
     changedIncidenceMatrix2Bb = property(__getChangedIncidenceMatrix2Bb)
 
-    def __getChangedIncidenceMatrix2BB(self): return self.__changedIncidenceMatrix2BB
+    def __getChangedIncidenceMatrix2BB(self): return self.__changedIncidenceBlocks[2]['BB']
     changedIncidenceMatrix2BB = property(__getChangedIncidenceMatrix2BB)
 
 
@@ -1034,9 +1162,9 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
 
     def __getIncidenceMatrix3ii(self):
-        if self.__changedIncidenceMatrix3ii:
-            self.__incidenceMatrix3ii = self.calcIncidence3(self.innerFaces,self.innerVolumes)
-            self.__changedIncidenceMatrix3ii = False
+        if self.__changedIncidenceBlocks[3]['ii']:
+            self.__incidenceMatrix3ii = self.incidenceBlock(3,'ii')
+            self.__changedIncidenceBlocks[3]['ii'] = False
         return self.__incidenceMatrix3ii
     incidenceMatrix3ii = property(__getIncidenceMatrix3ii)
     r'''
@@ -1045,9 +1173,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix3ib(self):
-        if self.__changedIncidenceMatrix3ib:
-            self.__incidenceMatrix3ib = self.calcIncidence3(self.innerFaces,self.borderVolumes)
-            self.__changedIncidenceMatrix3ib = False
+        if self.__changedIncidenceBlocks[3]['ib']:
+            self.__incidenceMatrix3ib = self.incidenceBlock(3,'ib')
+            self.__changedIncidenceBlocks[3]['ib'] = False
         return self.__incidenceMatrix3ib
     incidenceMatrix3ib = property(__getIncidenceMatrix3ib)
     r'''
@@ -1057,9 +1185,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix3bi(self):
-        if self.__changedIncidenceMatrix3bi:
-            self.__incidenceMatrix3bi = self.calcIncidence3(self.borderFaces,self.innerVolumes)
-            self.__changedIncidenceMatrix3bi = False
+        if self.__changedIncidenceBlocks[3]['bi']:
+            self.__incidenceMatrix3bi = self.incidenceBlock(3,'bi')
+            self.__changedIncidenceBlocks[3]['bi'] = False
         return self.__incidenceMatrix3bi
     incidenceMatrix3bi = property(__getIncidenceMatrix3bi)
     r'''
@@ -1068,9 +1196,9 @@ class Complex3D(Complex):
     '''
 
     def __getIncidenceMatrix3bb(self):
-        if self.__changedIncidenceMatrix3bb:
-            self.__incidenceMatrix3bb = self.calcIncidence3(self.borderFaces,self.borderVolumes)
-            self.__changedIncidenceMatrix3bb = False
+        if self.__changedIncidenceBlocks[3]['bb']:
+            self.__incidenceMatrix3bb = self.incidenceBlock(3,'bb')
+            self.__changedIncidenceBlocks[3]['bb'] = False
         return self.__incidenceMatrix3bb
     incidenceMatrix3bb = property(__getIncidenceMatrix3bb)
     r'''
@@ -1082,9 +1210,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix3Bi(self):#
-        if self.__changedIncidenceMatrix3Bi:
-            self.__incidenceMatrix3Bi = self.calcIncidence3(self.additionalBorderFaces,self.innerVolumes)
-            self.__changedIncidenceMatrix3Bi = False
+        if self.__changedIncidenceBlocks[3]['Bi']:
+            self.__incidenceMatrix3Bi = self.incidenceBlock(3,'Bi')
+            self.__changedIncidenceBlocks[3]['Bi'] = False
         return self.__incidenceMatrix3Bi
     incidenceMatrix3Bi = property(__getIncidenceMatrix3Bi)
     r'''
@@ -1094,9 +1222,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix3Bb(self):
-        if self.__changedIncidenceMatrix3Bb:
-            self.__incidenceMatrix3Bb = self.calcIncidence3(self.additionalBorderFaces,self.borderVolumes)
-            self.__changedIncidenceMatrix3Bb = False
+        if self.__changedIncidenceBlocks[3]['Bb']:
+            self.__incidenceMatrix3Bb = self.incidenceBlock(3,'Bb')
+            self.__changedIncidenceBlocks[3]['Bb'] = False
         return self.__incidenceMatrix3Bb
     incidenceMatrix3Bb = property(__getIncidenceMatrix3Bb)
     r'''
@@ -1107,11 +1235,9 @@ class Complex3D(Complex):
 
 
     def __getIncidenceMatrix3(self):
-        incidencematrix3i = np.concatenate((self.incidenceMatrix3ii,self.incidenceMatrix3ib),axis=1)
-        incidencematrix3b = np.concatenate((self.incidenceMatrix3bi,self.incidenceMatrix3bb),axis=1)
-        incidencematrix3B = np.concatenate((self.incidenceMatrix3Bi,self.incidenceMatrix3Bb),axis=1)
-        incidencematrix3 = np.concatenate((incidencematrix3i,incidencematrix3b,incidencematrix3B))
-        return incidencematrix3
+        if 3 not in self.__incidenceMatrices:
+            self.__incidenceMatrices[3] = self.sparseIncidenceMatrix3.toarray()
+        return self.__incidenceMatrices[3]
     incidenceMatrix3 = property(__getIncidenceMatrix3)
     r'''
 
@@ -1128,22 +1254,22 @@ class Complex3D(Complex):
 
     '''
 
-    def __getChangedIncidenceMatrix3ii(self): return self.__changedIncidenceMatrix3ii
+    def __getChangedIncidenceMatrix3ii(self): return self.__changedIncidenceBlocks[3]['ii']
     changedIncidenceMatrix3ii = property(__getChangedIncidenceMatrix3ii)
 
-    def __getChangedIncidenceMatrix3ib(self): return self.__changedIncidenceMatrix3ib
+    def __getChangedIncidenceMatrix3ib(self): return self.__changedIncidenceBlocks[3]['ib']
     changedIncidenceMatrix3ib = property(__getChangedIncidenceMatrix3ib)
 
-    def __getChangedIncidenceMatrix3bi(self): return self.__changedIncidenceMatrix3bi
+    def __getChangedIncidenceMatrix3bi(self): return self.__changedIncidenceBlocks[3]['bi']
     changedIncidenceMatrix3bi = property(__getChangedIncidenceMatrix3bi)
 
-    def __getChangedIncidenceMatrix3bb(self): return self.__changedIncidenceMatrix3bb
+    def __getChangedIncidenceMatrix3bb(self): return self.__changedIncidenceBlocks[3]['bb']
     changedIncidenceMatrix3bb = property(__getChangedIncidenceMatrix3bb)
 
-    def __getChangedIncidenceMatrix3Bi(self): return self.__changedIncidenceMatrix3Bi
+    def __getChangedIncidenceMatrix3Bi(self): return self.__changedIncidenceBlocks[3]['Bi']
     changedIncidenceMatrix3Bi = property(__getChangedIncidenceMatrix3Bi)
 
-    def __getChangedIncidenceMatrix3Bb(self): return self.__changedIncidenceMatrix3Bb
+    def __getChangedIncidenceMatrix3Bb(self): return self.__changedIncidenceBlocks[3]['Bb']
     changedIncidenceMatrix3Bb = property(__getChangedIncidenceMatrix3Bb)
 
 
@@ -1157,6 +1283,78 @@ class Complex3D(Complex):
 
 
 
+#-------------------------------------------------------------------------
+#    Assembled sparse incidence matrices
+#-------------------------------------------------------------------------
+
+    def __getSparseIncidenceMatrix1(self):
+        if 1 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(1)
+        return self.__sparseIncidenceMatrices[1]
+    sparseIncidenceMatrix1 = property(__getSparseIncidenceMatrix1)
+    r'''
+    Complete incidence matrix :math:`\incp{1}` as a sparse CSR matrix. It is
+    assembled from the cached sparse category blocks, so after a local change
+    only the affected blocks are recalculated. The position of each block is
+    given by :attr:`incidenceSlices1`.
+
+    '''
+
+    def __getIncidenceSlices1(self):
+        if 1 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(1)
+        return self.__incidenceSlices[1]
+    incidenceSlices1 = property(__getIncidenceSlices1)
+    '''
+    Dictionary that maps the name of each block (e.g. 'ib') to a tuple of a
+    row slice and a column slice in :attr:`sparseIncidenceMatrix1`.
+
+    '''
+
+    def __getSparseIncidenceMatrix2(self):
+        if 2 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(2)
+        return self.__sparseIncidenceMatrices[2]
+    sparseIncidenceMatrix2 = property(__getSparseIncidenceMatrix2)
+    r'''
+    Complete incidence matrix :math:`\incp{2}` as a sparse CSR matrix.
+
+    '''
+
+    def __getIncidenceSlices2(self):
+        if 2 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(2)
+        return self.__incidenceSlices[2]
+    incidenceSlices2 = property(__getIncidenceSlices2)
+    '''
+    Row and column slices of the blocks in :attr:`sparseIncidenceMatrix2`.
+
+    '''
+
+    def __getSparseIncidenceMatrix3(self):
+        if 3 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(3)
+        return self.__sparseIncidenceMatrices[3]
+    sparseIncidenceMatrix3 = property(__getSparseIncidenceMatrix3)
+    r'''
+    Complete incidence matrix :math:`\incp{3}` as a sparse CSR matrix. There
+    are no additional border volumes, so it only has two block columns.
+
+    '''
+
+    def __getIncidenceSlices3(self):
+        if 3 not in self.__sparseIncidenceMatrices:
+            self.__assembleIncidence(3)
+        return self.__incidenceSlices[3]
+    incidenceSlices3 = property(__getIncidenceSlices3)
+    '''
+    Row and column slices of the blocks in :attr:`sparseIncidenceMatrix3`.
+
+    '''
+
+
+
+
     def __getErrorCells(self): return self.__errorCells
     errorCells = property(__getErrorCells)
 
@@ -1188,8 +1386,711 @@ class Complex3D(Complex):
         self.updateComplex3D()
 
 
+    def materialize(self,dim=3):
+        '''
+        Makes sure that all cells up to dimension `dim` exist. Every getter of
+        a list of cells calls this method first. The cells of a general
+        complex exist from the start, so nothing is done here. Complexes that
+        create their cells on first access, like a lazy
+        :class:`DualComplex3D`, override it.
+
+        '''
+        pass
+
+
+
+
+
+
+#-------------------------------------------------------------------------
+#    Cells of one dimension, sorted by category
+#-------------------------------------------------------------------------
+    def categoryGroups(self,dim):
+        '''
+        Returns the lists of inner, border and additional border cells of the
+        given dimension (0 to 3). Volumes have no additional border category.
+
+        '''
+        if dim == 0:
+            return [self.innerNodes,self.borderNodes,self.additionalBorderNodes]
+        elif dim == 1:
+            return [self.innerEdges,self.borderEdges,self.additionalBorderEdges]
+        elif dim == 2:
+            return [self.innerFaces,self.borderFaces,self.additionalBorderFaces]
+        elif dim == 3:
+            return [self.innerVolumes,self.borderVolumes]
+        else:
+            _log.error('There are no cells of dimension {}'.format(dim))
+            return []
+
+#-------------------------------------------------------------------------
+#    Assemble complete sparse incidence matrix from category blocks
+#-------------------------------------------------------------------------
+    def __assembleIncidence(self,dim):
+        '''
+        Assembles the complete incidence matrix of dimension `dim` from its
+        category blocks. Rows and columns are ordered by category (inner,
+        border, additional border) and within a category by the numbers of
+        the cells, as in the dense matrices. Only blocks that have been
+        invalidated are recalculated.
+
+        '''
+        rowSlices = self.__categorySlices(self.categoryGroups(dim-1))
+        colSlices = self.__categorySlices(self.categoryGroups(dim))
+        blocks = [[self.__sparseIncidenceBlock(dim,r+c) for c in colSlices]
+                  for r in rowSlices]
+        self.__sparseIncidenceMatrices[dim] = sp.bmat(blocks,format='csr')
+        self.__incidenceSlices[dim] = {r+c: (rowSlices[r],colSlices[c])
+                                       for r in rowSlices for c in colSlices}
+
+
+    def __categorySlices(self,groups):
+        '''
+        Slices of consecutive groups of cells, keyed by the category letter.
+
+        '''
+        slices = {}
+        start = 0
+        for (letter,group) in zip('ibB',groups):
+            slices[letter] = slice(start,start+len(group))
+            start += len(group)
+        return slices
+
+
+    def __sparseIncidenceBlock(self,dim,block):
+        '''
+        Returns the cached sparse block, calculates it if necessary.
+
+        '''
+        if block not in self.__sparseIncidenceBlocks[dim]:
+            rows = self.categoryGroups(dim-1)['ibB'.index(block[0])]
+            cols = self.categoryGroups(dim)['ibB'.index(block[1])]
+            self.__sparseIncidenceBlocks[dim][block] = \
+                self.__calcIncidence(dim,rows,cols)
+        elif self.__changedIncidenceColumns[dim].get(block):
+            self.__patchIncidenceBlock(dim,block)
+        return self.__sparseIncidenceBlocks[dim][block]
+
+
+    def __calcIncidence(self,dim,rows,cols):
+        '''
+        Sparse incidence matrix of dimension `dim` between the given cells.
+
+        '''
+        calcIncidence = [self.calcIncidence1,
+                         self.calcIncidence2,
+                         self.calcIncidence3][dim-1]
+        return calcIncidence(rows,cols,sparse=True)
 
 
+    def __patchIncidenceBlock(self,dim,block):
+        '''
+        Recalculates only the columns of the cached sparse block that belong
+        to cells whose boundary has changed. All other entries are kept.
+
+        '''
+        cells = set(self.__changedIncidenceColumns[dim][block])
+        rows = self.categoryGroups(dim-1)['ibB'.index(block[0])]
+        cols = self.categoryGroups(dim)['ibB'.index(block[1])]
+        changedCols = [c for c in cells if c in cols]
+        old = self.__sparseIncidenceBlocks[dim][block].tocoo()
+        (newRows,newCols,newVals) = self.incidenceTriples(
+            dim,rows,changedCols,shape=(len(rows),len(cols)))
+        # Updating the geometry of the cells may report the same change again
+        self.__changedIncidenceColumns[dim][block] -= cells
+        keep = ~np.isin(old.col,[c.num for c in changedCols])
+        self.__sparseIncidenceBlocks[dim][block] = self.triplesToSparse(
+            np.concatenate((old.row[keep],newRows)),
+            np.concatenate((old.col[keep],newCols)),
+            np.concatenate((old.data[keep],newVals)),
+            len(rows),len(cols))
+
+#-------------------------------------------------------------------------
+#    Get one block of an incidence matrix
+#-------------------------------------------------------------------------
+    def incidenceBlock(self,dim,block,sparse=False):
+        '''
+        Returns one category block of the incidence matrix of dimension
+        `dim`. The sparse blocks are cached, see :meth:`invalidateIncidence`.
+
+        :param int dim: 1, 2 or 3
+        :param str block: Name of the block, e.g. 'ii', 'bB'
+        :param bool sparse: Return a sparse matrix instead of an array
+
+        '''
+        if dim not in self.__changedIncidenceBlocks:
+            _log.error('There is no incidence matrix {}'.format(dim))
+            return None
+        if block not in self.__changedIncidenceBlocks[dim]:
+            _log.error('Incidence matrix {} has no block {}'.format(dim,block))
+            return None
+        if sparse:
+            return self.__sparseIncidenceBlock(dim,block)
+        else:
+            return self.__sparseIncidenceBlock(dim,block).toarray()
+
+#-------------------------------------------------------------------------
+#    Invalidate cached incidence blocks
+#-------------------------------------------------------------------------
+    def invalidateIncidence(self,dim,rowCategories=None,colCategories=None):
+        '''
+        Marks blocks of the incidence matrix of dimension `dim` as changed.
+        Only blocks whose row category is in `rowCategories` and whose column
+        category is in `colCategories` are affected, None stands for all
+        categories.
+
+        :param int dim: 1, 2 or 3
+        :param list rowCategories: e.g. ['inner','additionalBorder']
+        :param list colCategories: e.g. ['border']
+
+        '''
+        if dim not in self.__changedIncidenceBlocks:
+            return
+        rowLetters = self.__categoryLetters(rowCategories)
+        colLetters = self.__categoryLetters(colCategories)
+        changed = False
+        for block in self.__changedIncidenceBlocks[dim]:
+            if block[0] in rowLetters and block[1] in colLetters:
+                self.__changedIncidenceBlocks[dim][block] = True
+                self.__sparseIncidenceBlocks[dim].pop(block,None)
+                self.__changedIncidenceColumns[dim].pop(block,None)
+                changed = True
+        if changed:
+            self.__incidenceMatrices.pop(dim,None)
+            self.__sparseIncidenceMatrices.pop(dim,None)
+
+
+    def __categoryLetters(self,categories):
+        '''
+
+        '''
+        if categories is None:
+            return 'ibB'
+        letters = {'inner': 'i', 'border': 'b', 'additionalBorder': 'B'}
+        return ''.join(letters[c] for c in categories if c in letters)
+
+#-------------------------------------------------------------------------
+#    Invalidate everything that depends on cells of one dimension
+#-------------------------------------------------------------------------
+    def changedCells(self,dim,categories=None):
+        '''
+        Invalidates the incidence blocks that contain cells of dimension `dim`
+        with the given categories (None for all), i.e. the columns of
+        incidence matrix `dim` and the rows of incidence matrix `dim+1`.
+
+        '''
+        self.invalidateIncidence(dim,None,categories)
+        self.invalidateIncidence(dim+1,categories,None)
+        self.invalidateCellIndices(dim)
+        if dim == 0:
+            self.__changedLimits = True
+            self.__coordinates = None
+
+#-------------------------------------------------------------------------
+#    React to changes of cells
+#-------------------------------------------------------------------------
+    def boundaryChanged(self,cell,boundaryCell):
+        '''
+        Called by :mod:`cell_events` if the boundary of a cell has changed.
+        Only the column of the cell is recalculated, see
+        :meth:`changedBoundary`.
+
+        '''
+        found = self.__storedCell(cell,(self.__edges,self.__faces,self.__volumes))
+        if found is not None:
+            (k,storedCell) = found
+            self.changedBoundary(k+1,[storedCell],
+                                 [self.__categoryOf(boundaryCell)])
+
+
+    def categoryChanged(self,cell,scheme,oldCategory,newCategory):
+        '''
+        Called by :mod:`cell_events` if the category of a cell has changed.
+        The category lists are not changed here, call :meth:`sortPrimal` or
+        :meth:`sortDual` to move the cell.
+
+        '''
+        if scheme != self.useCategory:
+            return
+        found = self.__storedCell(cell,(self.__nodes,self.__edges,self.__faces,self.__volumes))
+        if found is not None:
+            self.changedCells(found[0],[oldCategory,newCategory])
+
+
+    def __storedCell(self,cell,lists):
+        '''
+        Finds the cell or its reverse in one of the given lists. Reversed
+        cells that do not exist yet cannot be in a list, so they are not
+        created here.
+
+        :return: Position of the list and the cell as it is stored, None if
+            the cell is not in any of the lists
+
+        '''
+        for (k,cells) in enumerate(lists):
+            if cell in cells:
+                return (k,cell)
+            if cell.existing_reverse is not None and \
+                    cell.existing_reverse in cells:
+                return (k,cell.existing_reverse)
+        return None
+
+
+    def __categoryOf(self,cell):
+        '''
+        Category of the cell in the categorization that is currently used.
+
+        '''
+        if self.useCategory == 2:
+            return cell.category2
+        else:
+            return cell.category1
+
+
+
+#-------------------------------------------------------------------------
+#    Columns of single cells have changed
+#-------------------------------------------------------------------------
+    def changedBoundary(self,dim,cells,rowCategories=None):
+        '''
+        Marks the columns of the given cells of dimension `dim` as changed.
+        Cached sparse blocks are not thrown away, only these columns are
+        recalculated the next time the block is used.
+
+        :param int dim: 1, 2 or 3
+        :param list cells: Cells of the complex whose boundary has changed
+        :param list rowCategories: Categories of the boundary cells that
+            were added or removed, None for all categories
+
+        '''
+        if dim not in self.__changedIncidenceBlocks:
+            return
+        # Boundary cells without a known category might be in any row
+        rowLetters = self.__categoryLetters(rowCategories) or 'ibB'
+        for cell in cells:
+            colLetter = self.__categoryLetters([self.__categoryOf(cell)])
+            for block in self.__changedIncidenceBlocks[dim]:
+                if block[0] in rowLetters and block[1] == colLetter:
+                    self.__changedIncidenceBlocks[dim][block] = True
+                    if block in self.__sparseIncidenceBlocks[dim]:
+                        self.__changedIncidenceColumns[dim].setdefault(
+                            block,set()).add(cell)
+        self.__incidenceMatrices.pop(dim,None)
+        self.__sparseIncidenceMatrices.pop(dim,None)
+
+#-------------------------------------------------------------------------
+#    Local topology edits
+#-------------------------------------------------------------------------
+    def applyEdit(self,removedCells=[],addedCells=[],modifiedCells=[]):
+        '''
+        Removes and adds cells without rebuilding the incidence matrices.
+        Rows and columns of removed cells are deleted from the cached sparse
+        blocks, empty rows and columns are appended for new cells and only
+        the columns of new or modified cells are recalculated.
+
+        New cells are appended to the end of the lists that match their
+        categories, so their categories must be set beforehand. Cells whose
+        boundary was changed by the edit must be given in `modifiedCells`,
+        unless the change has been reported by :mod:`cell_events` already
+        (e.g. when the edges of a face are set).
+
+        :param list removedCells: Cells of any dimension to remove
+        :param list addedCells: Cells of any dimension to add
+        :param list modifiedCells: Cells of the complex whose boundary has
+            changed
+
+        '''
+        removed = self.__cellsByDimension(removedCells)
+        added = self.__cellsByDimension(addedCells)
+        modified = self.__cellsByDimension(modifiedCells)
+
+        for dim in range(4):
+            if removed[dim]:
+                self.__removeCells(dim,set(removed[dim]))
+            if added[dim]:
+                self.__addCells(dim,added[dim])
+
+        for dim in [1,2,3]:
+            cells = [c for c in added[dim]+modified[dim]
+                     if c not in removed[dim]]
+            if cells:
+                self.changedBoundary(dim,cells)
+
+        for dim in range(4):
+            if removed[dim] or added[dim]:
+                self.invalidateCellIndices(dim)
+
+        if removed[0] or added[0]:
+            self.__changedLimits = True
+            self.__coordinates = None
+
+
+    def __cellsByDimension(self,cells):
+        '''
+        Sorts cells into lists of nodes, edges, faces and volumes. Reversed
+        cells are replaced by the cell itself.
+
+        '''
+        byDimension = [[],[],[],[]]
+        for c in cells:
+            if c.is_reverse:
+                c = -c
+            for (dim,cellType) in enumerate((Node,Edge,Face,Volume)):
+                if isinstance(c,cellType):
+                    byDimension[dim].append(c)
+                    break
+            else:
+                _log.error('Cannot sort {} by dimension'.format(c))
+        return byDimension
+
+
+    def __cellLists(self,dim):
+        '''
+        All lists that contain cells of dimension `dim`: the list of all
+        cells and the category lists of both categorizations.
+
+        '''
+        self.materialize(dim)
+        if dim == 0:
+            return [self.__nodes,
+                    self.__innerNodes1,self.__borderNodes1,self.__additionalBorderNodes1,
+                    self.__innerNodes2,self.__borderNodes2,self.__additionalBorderNodes2]
+        elif dim == 1:
+            return [self.__edges,
+                    self.__innerEdges1,self.__borderEdges1,self.__additionalBorderEdges1,
+                    self.__innerEdges2,self.__borderEdges2,self.__additionalBorderEdges2]
+        elif dim == 2:
+            return [self.__faces,
+                    self.__innerFaces1,self.__borderFaces1,self.__additionalBorderFaces1,
+                    self.__innerFaces2,self.__borderFaces2,self.__additionalBorderFaces2]
+        else:
+            return [self.__volumes,
+                    self.__innerVolumes1,self.__borderVolumes1,
+                    self.__innerVolumes2,self.__borderVolumes2]
+
+
+    def __removeCells(self,dim,cells):
+        '''
+        Removes the cells from all lists and deletes their rows and columns
+        from the cached sparse blocks.
+
+        '''
+        keep = {}
+        for (letter,group) in zip('ibB',self.categoryGroups(dim)):
+            if any(c in group for c in cells):
+                keep[letter] = np.array([c not in cells for c in group],dtype=bool)
+
+        for myList in self.__cellLists(dim):
+            if any(c in myList for c in cells):
+                myList[:] = [c for c in myList if c not in cells]
+
+        for (matrixDim,position) in ((dim,1),(dim+1,0)):
+            if matrixDim not in self.__sparseIncidenceBlocks:
+                continue
+            blocks = self.__sparseIncidenceBlocks[matrixDim]
+            for block in list(blocks):
+                if block[position] in keep:
+                    if position == 0:
+                        blocks[block] = blocks[block][keep[block[0]],:]
+                    else:
+                        blocks[block] = blocks[block][:,keep[block[1]]]
+                    self.__changedIncidenceBlocks[matrixDim][block] = True
+                    self.__incidenceMatrices.pop(matrixDim,None)
+                    self.__sparseIncidenceMatrices.pop(matrixDim,None)
+
+
+    def __addCells(self,dim,cells):
+        '''
+        Appends the cells to the lists that match their categories and
+        appends empty rows and columns to the cached sparse blocks.
+
+        '''
+        lists = self.__cellLists(dim)
+        categories = ['inner','border','additionalBorder'][:len(lists)//2]
+        for c in cells:
+            self.addToList(c,lists[0])
+            for (scheme,category) in ((0,c.category1),(1,c.category2)):
+                if category in categories:
+                    self.addToList(c,lists[1+scheme*len(categories)+categories.index(category)])
+                elif scheme+1 == self.useCategory:
+                    _log.error('Unknown category{} {} of {}'.format(scheme+1,category,c))
+
+        for matrixDim in (dim,dim+1):
+            if matrixDim not in self.__sparseIncidenceBlocks:
+                continue
+            rowGroups = self.categoryGroups(matrixDim-1)
+            colGroups = self.categoryGroups(matrixDim)
+            blocks = self.__sparseIncidenceBlocks[matrixDim]
+            for block in list(blocks):
+                shape = (len(rowGroups['ibB'.index(block[0])]),
+                         len(colGroups['ibB'.index(block[1])]))
+                if blocks[block].shape != shape:
+                    blocks[block] = blocks[block].copy()
+                    blocks[block].resize(shape)
+                    self.__changedIncidenceBlocks[matrixDim][block] = True
+                    self.__incidenceMatrices.pop(matrixDim,None)
+                    self.__sparseIncidenceMatrices.pop(matrixDim,None)
+
+
+
+#-------------------------------------------------------------------------
+#    Sparse verification of the boundary operators
+#-------------------------------------------------------------------------
+    def verifyBoundaries(self,report=None,symbol='d',suffix=''):
+        r'''
+        Checks that the boundary of a boundary vanishes, i.e.
+        :math:`\incp{1}\incp{2} = 0` and :math:`\incp{2}\incp{3} = 0`,
+        using the assembled sparse incidence matrices. Offending entries are
+        reported with the cells of dimension k-1 and k+1 that belong to them.
+
+        :param TopologyReport report: Report that the results are added to. A
+            new one is created if None is given.
+        :param str symbol: Symbol of the incidence matrices in the descriptions
+        :param str suffix: Appended to the descriptions, e.g. the category
+        :return: The report
+
+        '''
+        if report is None:
+            report = TopologyReport()
+        cells = [list(chain(*(self.cellsByNumber(g)
+                              for g in self.categoryGroups(dim))))
+                 for dim in range(4)]
+        report.checkZero('{0}1 {0}2 = 0{1}'.format(symbol,suffix),
+                         self.sparseIncidenceMatrix1 @ self.sparseIncidenceMatrix2,
+                         cells[0],cells[2])
+        report.checkZero('{0}2 {0}3 = 0{1}'.format(symbol,suffix),
+                         self.sparseIncidenceMatrix2 @ self.sparseIncidenceMatrix3,
+                         cells[1],cells[3])
+        return report
+
+
+
+#-------------------------------------------------------------------------
+#    Compile to arrays
+#-------------------------------------------------------------------------
+    def compile(self,dualComplex=None):
+        '''
+        Freezes the complex into a :class:`CompiledComplex3D` with flat NumPy
+        arrays for coordinates, connectivity, orientation and categories.
+
+        :param Complex3D dualComplex: If given, the indices of the 3D dual
+            cells are stored as well
+
+        '''
+        return CompiledComplex3D(self,dualComplex)
+
+
+
+#-------------------------------------------------------------------------
+#    Coordinate array
+#-------------------------------------------------------------------------
+    def __calcCoordinates(self):
+        '''
+        Collects the coordinates of all nodes in one array.
+
+        '''
+        self.__nodeRows = self.cellIndex(self.__nodes)
+        self.__coordinates = np.array([n.coordinates for n in self.__nodes],
+                                      dtype=float).reshape(-1,3)
+        self.__changedLimits = True
+
+
+    def coordinatesChanged(self,node):
+        '''
+        Called by :mod:`cell_events` if the coordinates of a node have been
+        set. Only the row of this node is updated.
+
+        '''
+        if self.__coordinates is not None:
+            i = self.__nodeRows.get(node)
+            if i is not None:
+                self.__coordinates[i] = node.coordinates
+                self.__changedLimits = True
+        elif node in self.__nodes:
+            self.__changedLimits = True
+
+
+    def nodeRows(self,nodes):
+        '''
+        Rows of the given nodes in :attr:`coordinates`, -1 for nodes that are
+        not part of the complex.
+
+        '''
+        self.materialize(0)
+        if self.__coordinates is None or len(self.__coordinates) != len(self.__nodes):
+            self.__calcCoordinates()
+        return np.array([self.__nodeRows.get(n,-1) for n in nodes],dtype=np.int64)
+
+
+    def nodesInBox(self,xLim,yLim,zLim):
+        '''
+        Returns all nodes whose coordinates lie within the given limits
+        (including the limits themselves).
+
+        :param list xLim: [xMin, xMax]
+        :param list yLim: [yMin, yMax]
+        :param list zLim: [zMin, zMax]
+
+        '''
+        coordinates = self.coordinates
+        lower = np.array([xLim[0],yLim[0],zLim[0]],dtype=float)
+        upper = np.array([xLim[1],yLim[1],zLim[1]],dtype=float)
+        inside = np.all((coordinates >= lower) & (coordinates <= upper),axis=1)
+        return [self.__nodes[i] for i in np.flatnonzero(inside)]
+
+
+    def edge_lengths(self,edges=None):
+        '''
+        Total lengths of the given edges, in the same order, e.g. for the
+        edges of one category block like :attr:`innerEdges`. The lengths of
+        all simple edges are calculated together from :attr:`coordinates`.
+
+        :param list edges: Edges of this complex, all edges if None
+        :return: Array with one length per edge
+
+        '''
+        if edges is None:
+            self.materialize(1)
+            edges = self.__edges
+        chains = [[e.startNode,*e.geometricNodes,e.endNode] for e in edges]
+        counts = np.fromiter((len(c) for c in chains),dtype=np.int64,count=len(chains))
+        lengths = np.zeros(len(chains))
+        if counts.sum() == 0:
+            return lengths
+        nodes = [n for c in chains for n in c]
+        rows = self.nodeRows(nodes)
+        coordinates = self.coordinates[rows]
+        # Geometric nodes are not stored in the coordinate array
+        for i in np.flatnonzero(rows < 0):
+            coordinates[i] = nodes[i].coordinates
+
+        # Every node except the last one of each edge starts a simple edge
+        offsets = np.zeros(len(chains)+1,dtype=np.int64)
+        np.cumsum(counts,out=offsets[1:])
+        starts = np.delete(np.arange(offsets[-1]),offsets[1:]-1)
+        segments = np.linalg.norm(coordinates[starts+1]-coordinates[starts],axis=1)
+        lengths[:] = np.add.reduceat(segments,offsets[:-1]-np.arange(len(chains)))
+        return lengths
+
+
+    def updateFaceGeometry(self):
+        '''
+        Sets up all faces whose geometry has changed, e.g. because nodes have
+        been moved. The normal vectors, areas and barycenters of their simple
+        faces are then calculated together, see :mod:`simple_face_geometry`,
+        instead of one simple face after the other.
+
+        '''
+        changedFaces = [f for f in self.__faces if f.geometryChanged]
+        for f in changedFaces:
+            f.setUp(calcGeometry=False)
+        update_simple_faces([sf for f in changedFaces
+                             for sf in f.simpleFaces])
+
+
+    def updateVolumeGeometry(self):
+        '''
+        Updates the geometry of all faces, see :meth:`updateFaceGeometry`, and
+        sets up all volumes whose geometry has changed. Their volumes and
+        barycenters are then calculated together, see
+        :mod:`volume_geometry`.
+
+        '''
+        self.updateFaceGeometry()
+        changedVolumes = [v for v in self.__volumes if v.geometryChanged]
+        for v in changedVolumes:
+            v.setUp(calcGeometry=False)
+        update_volumes(changedVolumes)
+
+
+    @contextlib.contextmanager
+    def batch_geometry(self):
+        '''
+        Context manager for moving many nodes at once::
+
+            with complex.batch_geometry():
+                for n in complex.borderNodes:
+                    n.moveToBoundingBox(boundingBox)
+
+        Inside of the block, moving a node does not mark its edges, faces and
+        volumes as changed. When the block is left, every edge, face and
+        volume that contains a moved node is set up exactly once, and the
+        geometry of the faces and volumes is calculated together, see
+        :meth:`updateVolumeGeometry`. Geometry that is read inside of the
+        block can therefore be out of date.
+
+        Every complex that has opened one of the nested batches is then told
+        about its own moved nodes with :meth:`nodesMoved`. The cells of nodes
+        of other complexes are updated as well, but these complexes are not
+        told about them.
+
+        If the block raises an exception, the cells of the moved nodes are
+        only marked as changed, as without a batch, and the exception is
+        passed on.
+
+        '''
+        cell_events.begin_geometry_batch(self)
+        try:
+            yield self
+        except BaseException:
+            (nodes,owners) = cell_events.end_geometry_batch()
+            for n in nodes:
+                for e in n.edges:
+                    e.updateGeometry()
+            raise
+        else:
+            (nodes,owners) = cell_events.end_geometry_batch()
+            self.__updateMovedNodes(nodes)
+            for owner in owners:
+                (ownNodes,geometricNodes) = (owner.nodes,owner.geometricNodes)
+                owner.nodesMoved([n for n in nodes if n in ownNodes or
+                                  n in geometricNodes])
+
+
+    def nodesMoved(self,nodes):
+        '''
+        Called at the end of :meth:`batch_geometry` with the moved nodes of
+        this complex, after the geometry of their edges, faces and volumes
+        has been updated. Nothing is done here, a :class:`PrimalComplex3D` moves its
+        dual complex along.
+
+        '''
+        pass
+
+
+    def __updateMovedNodes(self,nodes):
+        '''
+        Sets up all edges, faces and volumes that contain one of the given
+        nodes.
+
+        '''
+        # Dictionaries keep the order and list every cell only once
+        edges = {}
+        for n in nodes:
+            for e in n.edges:
+                edges[-e if e.is_reverse else e] = None
+        faces = {}
+        for e in edges:
+            e.geometryChanged = True
+            for f in e.faces:
+                faces[-f if f.is_reverse else f] = None
+        volumes = {}
+        for f in faces:
+            f.geometryChanged = True
+            for v in f.volumes:
+                volumes[-v if v.is_reverse else v] = None
+        for v in volumes:
+            v.geometryChanged = True
+
+        for e in edges:
+            e.setUp()
+        for f in faces:
+            f.setUp(calcGeometry=False)
+        update_simple_faces([sf for f in faces for sf in f.simpleFaces])
+        for v in volumes:
+            v.setUp(calcGeometry=False)
+        update_volumes(volumes)
+
 
 
 #-------------------------------------------------------------------------
@@ -1200,12 +2101,13 @@ class Complex3D(Complex):
 
         '''
         _log.info('Calculating limits')
-        self.__xMax = self.myMax([n.xCoordinate for n in self.nodes])
-        self.__yMax = self.myMax([n.yCoordinate for n in self.nodes])
-        self.__zMax = self.myMax([n.zCoordinate for n in self.nodes])
-        self.__xMin = self.myMin([n.xCoordinate for n in self.nodes])
-        self.__yMin = self.myMin([n.yCoordinate for n in self.nodes])
-        self.__zMin = self.myMin([n.zCoordinate for n in self.nodes])
+        coordinates = self.coordinates
+        if len(coordinates) > 0:
+            (self.__xMax,self.__yMax,self.__zMax) = coordinates.max(axis=0).tolist()
+            (self.__xMin,self.__yMin,self.__zMin) = coordinates.min(axis=0).tolist()
+        else:
+            (self.__xMax,self.__yMax,self.__zMax) = [self.myMax([])]*3
+            (self.__xMin,self.__yMin,self.__zMin) = [self.myMin([])]*3
         self.__xLim = [self.__xMin,self.__xMax]
         self.__yLim = [self.__yMin,self.__yMax]
         self.__zLim = [self.__zMin,self.__zMax]
@@ -1222,17 +2124,17 @@ class Complex3D(Complex):
 
         '''
 
-        self.__innerNodes1 = []
-        self.__borderNodes1 = []
-        self.__additionalBorderNodes1 = []
-        self.__innerEdges1 = []
-        self.__borderEdges1 = []
-        self.__additionalBorderEdges1 = []
-        self.__borderFaces1 = []
-        self.__innerFaces1 = []
-        self.__additionalBorderFaces1 = []
-        self.__innerVolumes1 = []
-        self.__borderVolumes1 = []
+        self.__innerNodes1 = CellList()
+        self.__borderNodes1 = CellList()
+        self.__additionalBorderNodes1 = CellList()
+        self.__innerEdges1 = CellList()
+        self.__borderEdges1 = CellList()
+        self.__additionalBorderEdges1 = CellList()
+        self.__borderFaces1 = CellList()
+        self.__innerFaces1 = CellList()
+        self.__additionalBorderFaces1 = CellList()
+        self.__innerVolumes1 = CellList()
+        self.__borderVolumes1 = CellList()
 
 
         if True:
@@ -1285,17 +2187,17 @@ class Complex3D(Complex):
 
         '''
 
-        self.__innerNodes2 = []
-        self.__borderNodes2 = []
-        self.__additionalBorderNodes2 = []
-        self.__innerEdges2 = []
-        self.__borderEdges2 = []
-        self.__additionalBorderEdges2 = []
-        self.__borderFaces2 = []
-        self.__innerFaces2 = []
-        self.__additionalBorderFaces2 = []
-        self.__innerVolumes2 = []
-        self.__borderVolumes2 = []
+        self.__innerNodes2 = CellList()
+        self.__borderNodes2 = CellList()
+        self.__additionalBorderNodes2 = CellList()
+        self.__innerEdges2 = CellList()
+        self.__borderEdges2 = CellList()
+        self.__additionalBorderEdges2 = CellList()
+        self.__borderFaces2 = CellList()
+        self.__innerFaces2 = CellList()
+        self.__additionalBorderFaces2 = CellList()
+        self.__innerVolumes2 = CellList()
+        self.__borderVolumes2 = CellList()
 
         if True:
             for n in self.__nodes:
@@ -1366,36 +2268,17 @@ class Complex3D(Complex):
 #-------------------------------------------------------------------------
     def updateComplex3D(self):
         '''
+        Marks all cached data of the complex as changed. Use
+        :meth:`changedCells` or :meth:`invalidateIncidence` if only a part of
+        the complex has changed.
 
         '''
-        self.__changedIncidenceMatrix1ii = True
-        self.__changedIncidenceMatrix1ib = True
-        self.__changedIncidenceMatrix1iB = True
-        self.__changedIncidenceMatrix1bi = True
-        self.__changedIncidenceMatrix1bb = True
-        self.__changedIncidenceMatrix1bB = True
-        self.__changedIncidenceMatrix1Bi = True
-        self.__changedIncidenceMatrix1Bb = True
-        self.__changedIncidenceMatrix1BB = True
-
-        self.__changedIncidenceMatrix2ii = True
-        self.__changedIncidenceMatrix2ib = True
-        self.__changedIncidenceMatrix2iB = True
-        self.__changedIncidenceMatrix2bi = True
-        self.__changedIncidenceMatrix2bb = True
-        self.__changedIncidenceMatrix2bB = True
-        self.__changedIncidenceMatrix2Bi = True
-        self.__changedIncidenceMatrix2Bb = True
-        self.__changedIncidenceMatrix2BB = True
-
-        self.__changedIncidenceMatrix3ii = True
-        self.__changedIncidenceMatrix3ib = True
-        self.__changedIncidenceMatrix3bi = True
-        self.__changedIncidenceMatrix3bb = True
-        self.__changedIncidenceMatrix3Bi = True
-        self.__changedIncidenceMatrix3Bb = True
+        for dim in [1,2,3]:
+            self.invalidateIncidence(dim)
+        self.invalidateCellIndices()
 
         self.__changedLimits = True
+        self.__coordinates = None
 
 
 
@@ -1695,7 +2578,7 @@ class Complex3D(Complex):
 
         '''
         for c in self.nodes+self.edges+self.faces+self.volumes+self.geometricNodes+self.geometricEdges:
-            c.grayInTikz = setValue
+            c.gray_in_tikz = setValue
 
 
 
@@ -1970,17 +2853,11 @@ class Complex3D(Complex):
             file.write("from pyCellFoamCore.tools.logging_formatter import set_logging_format\n\n")
             file.write("set_logging_format(logging.INFO)\n\n")
 
-            geometric_edges = []
-            for f in self.faces:
-                for ge in f.geometricEdges:
-                    if ge not in geometric_edges:
-                        geometric_edges.append(ge)
-            geometric_nodes = []
-            for e in geometric_edges:
-                if e.startNode.is_geometrical and e.startNode not in geometric_nodes:
-                    geometric_nodes.append(e.startNode)
-                if e.endNode.is_geometrical and e.endNode not in geometric_nodes:
-                    geometric_nodes.append(e.endNode)
+            geometric_edges = unique_cells(ge for f in self.faces
+                                           for ge in f.geometricEdges)
+            geometric_nodes = unique_cells(n for e in geometric_edges
+                                           for n in (e.startNode, e.endNode)
+                                           if n.is_geometrical)
 
             _log.critical("Generating code for %d nodes", len(self.nodes))
             for n in self.nodes:
@@ -35,6 +35,8 @@ import numpy as np
 from pyCellFoamCore.k_cells.node.node import Node
 from pyCellFoamCore.k_cells.node.dualNode2D import DualNode2D
 from pyCellFoamCore.k_cells.node.dualNode3D import DualNode3D
+from pyCellFoamCore.k_cells.node.dual_node_plan import create_dual_nodes
+from pyCellFoamCore.k_cells.node.dual_node_plan import dual_node_positions
 from pyCellFoamCore.k_cells.edge.edge import Edge
 from pyCellFoamCore.k_cells.edge.dualEdge2D import DualEdge2D
 from pyCellFoamCore.k_cells.edge.dualEdge3D import DualEdge3D
@@ -43,6 +45,8 @@ from pyCellFoamCore.k_cells.face.dualFace2D import DualFace2D
 from pyCellFoamCore.k_cells.face.dualFace3D import DualFace3D
 from pyCellFoamCore.k_cells.volume.volume import Volume
 from pyCellFoamCore.k_cells.volume.dualVolume3D import DualVolume3D
+from pyCellFoamCore.k_cells.face.simple_face_geometry import update_simple_faces
+from pyCellFoamCore.k_cells.volume.volume_geometry import update_volumes
 
 from pyCellFoamCore.k_cells.node.node import NodePlotly
 from pyCellFoamCore.k_cells.edge.baseEdge import EdgePlotly
@@ -54,6 +58,7 @@ from pyCellFoamCore.k_cells.volume.volume import VolumePlotly
 # -------------------------------------------------------------------
 from pyCellFoamCore.complex.complex3D import Complex3D
 from pyCellFoamCore.complex.primalComplex3D import PrimalComplex3D
+from pyCellFoamCore.complex.topologyReport import TopologyReport
 
 #    Grids
 # -------------------------------------------------------------------
@@ -64,6 +69,7 @@ from pyCellFoamCore.complex.primalComplex3D import PrimalComplex3D
 #    Tools
 # -------------------------------------------------------------------
 from pyCellFoamCore.tools.logging_formatter import set_logging_format
+from pyCellFoamCore.tools.cellList import unique_cells
 import pyCellFoamCore.tools.placeFigures as pf
 import pyCellFoamCore.tools.colorConsole as cc
 from pyCellFoamCore.tools.tikZPicture.tikZPerspective import TikZPerspective
@@ -95,16 +101,31 @@ class DualComplex3D(Complex3D):
                  '__createNodes',
                  '__createEdges',
                  '__createFaces',
-                 '__createVolumes')
+                 '__createVolumes',
+                 '__processes',
+                 '__lazy',
+                 '__materialized')
 
 #==============================================================================
 #    INITIALIZATION
 #==============================================================================
-    def __init__(self,primalComplex,createNodes=True,createEdges=True,createFaces=True,createVolumes=True):
+    def __init__(self,primalComplex,createNodes=True,createEdges=True,createFaces=True,createVolumes=True,processes=None,lazy=False):
         '''
 
         :param PrimalComplex primalComplex: The primal complex of which the
             dual shall be constructed.
+        :param int processes: If greater than 1, the geometry of the
+            simplified dual faces and of the dual volumes is not calculated
+            cell by cell during the construction. It is calculated afterwards
+            for all cells at once, split into chunks for a pool of this many
+            processes. The dual cells themselves are always created in this
+            process, because they are linked to the primal cells. Their
+            creation takes most of the time, so the pool only pays off if
+            the geometry of many cells has to be calculated.
+        :param bool lazy: If True, no dual cells are created here. The dual
+            cells of one dimension are created when a list of cells of this
+            or a higher dimension is accessed for the first time, see
+            :meth:`materialize`.
 
         '''
 
@@ -115,6 +136,11 @@ class DualComplex3D(Complex3D):
         self.__createEdges = createEdges
         self.__createFaces = createFaces
         self.__createVolumes = createVolumes
+        # A single process gains nothing from the pool and the extra pass
+        # over all cells, so the geometry is calculated cell by cell instead
+        self.__processes = processes if processes and processes > 1 else None
+        self.__lazy = lazy
+        self.__materialized = -1
         super().__init__()
 
 
@@ -191,6 +217,14 @@ class DualComplex3D(Complex3D):
 
     '''
 
+    def __getMaterialized(self): return self.__materialized
+    materialized = property(__getMaterialized)
+    '''
+    Highest dimension of the dual cells that have been created, -1 if no
+    dual cells exist yet, see :meth:`materialize`.
+
+    '''
+
 
 
 
@@ -215,9 +249,8 @@ class DualComplex3D(Complex3D):
 
         '''
         _log.info('Called "Set Up" in DualComplex2D class')
-        self.__construct()
-        self.sortPrimal()
-        self.sortDual()
+        if not self.__lazy:
+            self.materialize()
         super().setUp()
 
 
@@ -226,31 +259,65 @@ class DualComplex3D(Complex3D):
 
 
 #-------------------------------------------------------------------------
-#    Method 1
+#    Create the dual cells
 #-------------------------------------------------------------------------
-    def __construct(self):
+    def materialize(self,dim=3):
+        '''
+        Creates the dual cells up to dimension `dim` that do not exist yet.
+        Dual edges need the dual nodes, dual faces the dual edges and so on,
+        so the lower dimensions are created first.
+
+        '''
+        if dim <= self.__materialized:
+            return
+        start = self.__materialized+1
+        # Set first, so that getters called during the creation do not start
+        # it again. Reading the geometric nodes below would otherwise create
+        # the dual faces in the middle of creating the dual edges.
+        self.__materialized = 3
         cc.printMagenta('Dual Complex 3D: Creating dual cells')
-        dualNodes = []
-        dualEdges = []
-        dualFaces = []
-        dualVolumes = []
 
+        stages = [self.__buildNodes,self.__buildEdges,self.__buildFaces,self.__buildVolumes]
+        created = {}
+        for d in range(start,dim+1):
+            created[d] = stages[d]()
+
+        # Geometric nodes
+        if 1 in created or 2 in created:
+            geometricNodes = unique_cells(n for c in created.get(1,[])+created.get(2,[])
+                                          for n in c.geometricNodes)
+            if start > 0:
+                geometricNodes = unique_cells(list(self.geometricNodes)+geometricNodes)
+            self.renumberList(geometricNodes)
+            self.geometricNodes = geometricNodes
+
+        if 0 in created:
+            self.nodes = created[0]
+        if 1 in created:
+            self.edges = created[1]
+        if 2 in created:
+            self.faces = created[2]
+        if 3 in created:
+            self.volumes = created[3]
+        self.sortPrimal()
+        self.sortDual()
+        self.__materialized = dim
 
 
-        # Dual nodes
+    def __buildNodes(self):
+        dualNodes = []
         if self.__createNodes:
             _log.info("Create 3D dual nodes")
-            for v in self.__primalComplex.volumes:
-                cc.printBlue("Create dual node of {}".format(v))
-                dualNodes.append(DualNode3D(v))
+            dualNodes += create_dual_nodes(self.__primalComplex.volumes)
             for f in self.__primalComplex.borderFaces1:
                 dualNodes.append(DualNode2D(f))
         else:
             _log.warning('Creation of nodes has been disabled')
+        return dualNodes
 
-        # return None
 
-        # Dual edges
+    def __buildEdges(self):
+        dualEdges = []
         if self.__createEdges and self.__createNodes:
             for f in self.__primalComplex.innerFaces1 + self.__primalComplex.borderFaces1:
                 dualEdges.append(DualEdge3D(f))
@@ -258,8 +325,11 @@ class DualComplex3D(Complex3D):
                 dualEdges.append(DualEdge2D(e))
         else:
             _log.warning('Creation of edges has been disabled')
+        return dualEdges
+
 
-        # Dual faces
+    def __buildFaces(self):
+        dualFaces = []
         if self.__createFaces and self.__createEdges and self.__createNodes:
             for e in self.__primalComplex.innerEdges1 +  self.__primalComplex.borderEdges1:
                 dualFaces.append(DualFace3D(e))
@@ -267,58 +337,28 @@ class DualComplex3D(Complex3D):
                 dualFaces.append(DualFace2D(n))
             for f in dualFaces:
                 f.simplifyFace()
+            if self.__processes:
+                changedFaces = [f for f in dualFaces if f.geometryChanged]
+                for f in changedFaces:
+                    f.setUp(calcGeometry=False)
+                update_simple_faces([sf for f in changedFaces
+                                     for sf in f.simpleFaces],
+                                    processes=self.__processes)
         else:
             _log.warning('Creation of faces has been disabled')
+        return dualFaces
 
 
-        # Dual volumes
+    def __buildVolumes(self):
+        dualVolumes = []
         if self.__createVolumes and self.__createFaces and self.__createEdges and self.__createNodes:
             for n in self.__primalComplex.borderNodes1+self.__primalComplex.innerNodes1:
-                dualVolumes.append(DualVolume3D(n))
+                dualVolumes.append(DualVolume3D(n,calcGeometry=not self.__processes))
+            if self.__processes:
+                update_volumes(dualVolumes,processes=self.__processes)
         else:
             _log.warning('Creation of volumes has been disabled')
-
-
-
-
-        # Geometric nodes
-
-        geometricNodes = []
-
-        for e in dualEdges:
-            for n in e.geometricNodes:
-                if not n in geometricNodes:
-                    geometricNodes.append(n)
-        for f in dualFaces:
-            for n in f.geometricNodes:
-                if not n in geometricNodes:
-                    geometricNodes.append(n)
-
-
-        self.renumberList(geometricNodes)
-
-
-
-
-
-
-#
-#
-#
-#
-##                            cc.printMagenta('Dual Complex 3D: finished simplification of faces')
-#
-#                            if True:
-#                                # Dual volumes
-#                                for n in primalComplex.borderNodes+primalComplex.innerNodes:
-#                                    volumes.append(DualVolume3D(n))
-#
-#
-        self.nodes = dualNodes
-        self.edges = dualEdges
-        self.faces = dualFaces
-        self.volumes = dualVolumes
-        self.geometricNodes = geometricNodes
+        return dualVolumes
 
 
 
@@ -367,6 +407,83 @@ class DualComplex3D(Complex3D):
 
 
 
+#-------------------------------------------------------------------------
+#    Follow moved primal nodes
+#-------------------------------------------------------------------------
+    def updatePrimalGeometry(self,nodes):
+        '''
+        Updates the dual complex after the given primal nodes have been
+        moved, instead of creating it again. This is done automatically at
+        the end of :meth:`batch_geometry` of the primal complex.
+
+        Only the dual nodes of the moved nodes and of the primal edges, faces
+        and volumes that contain them get new coordinates, see
+        :func:`dual_node_positions`. The dual edges, faces and volumes of
+        these dual nodes are then updated together in a
+        :meth:`batch_geometry`. The topology of the dual complex is not
+        changed, e.g. a geometric node that was left out of a dual edge
+        because it lay on a straight line is not added again.
+
+        Nodes that are moved outside of a :meth:`batch_geometry` only mark
+        their primal cells as changed. The dual complex is not told about
+        them and stays at the old geometry until this method is called with
+        these nodes or the dual complex is created again.
+
+        :param list nodes: Moved primal nodes
+
+        '''
+        # Dictionaries keep the order and list every cell only once
+        primalCells = {}
+        for n in nodes:
+            primalCells[n] = 0
+            for e in n.edges:
+                e = -e if e.is_reverse else e
+                primalCells[e] = 1
+                for f in e.faces:
+                    f = -f if f.is_reverse else f
+                    primalCells[f] = 2
+                    for v in f.volumes:
+                        primalCells[-v if v.is_reverse else v] = 3
+
+        dualNodes = {}
+        for (c,dim) in primalCells.items():
+            if dim == 0:
+                d = c.dualCell0D
+            elif dim == 1:
+                d = c.dualCell1D
+            elif dim == 2:
+                d = c.dualCell2D
+            else:
+                d = c.dualCell3D
+            if isinstance(d,Node):
+                dualNodes[d] = None
+        dualNodes = list(dualNodes)
+        if not dualNodes:
+            return
+
+        positions = dual_node_positions(dualNodes)
+        with self.batch_geometry():
+            for (n,position) in zip(dualNodes,positions):
+                if not np.array_equal(n.coordinates,position):
+                    n.coordinates = position
+
+
+
+#-------------------------------------------------------------------------
+#    Compile to arrays
+#-------------------------------------------------------------------------
+    def compile(self,dualComplex=None):
+        '''
+        Like :meth:`Complex3D.compile`, but uses the primal complex as dual
+        by default.
+
+        '''
+        if dualComplex is None:
+            dualComplex = self.primalComplex
+        return super().compile(dualComplex)
+
+
+
 #-------------------------------------------------------------------------
 #    Check category 2
 #-------------------------------------------------------------------------
@@ -653,57 +770,26 @@ class DualComplex3D(Complex3D):
 
     def checkAllIncidenceMatrices(self,doPrints=True):
         '''
+        Checks the duality of the primal and dual incidence matrices for both
+        categories. The sparse category blocks are compared, see
+        :meth:`verifyIncidenceMatrices` for a report with the offending cells.
 
         '''
         checks = []
 
-        self.useCategory = 1
         if doPrints:
             cc.printBlue()
             cc.printBlue('Checking incidence matrix dualities')
             cc.printBlue('='*35)
-            cc.printBlue()
-            cc.printBlue('Using category 1')
-            cc.printBlue('-'*15)
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3ii,-self.__primalComplex.incidenceMatrix1ii,'d̂3ii','-d1ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3ib,-self.__primalComplex.incidenceMatrix1bi,'d̂3ib','-d1bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3bi,-self.__primalComplex.incidenceMatrix1ib,'d̂3bi','-d1ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3bb,-self.__primalComplex.incidenceMatrix1bb,'d̂3bb','-d1bb',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2ii,self.__primalComplex.incidenceMatrix2ii,'d̂2ii','d2ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2ib,self.__primalComplex.incidenceMatrix2bi,'d̂2ib','d2bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2bi,self.__primalComplex.incidenceMatrix2ib,'d̂2bi','d2ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2bb,self.__primalComplex.incidenceMatrix2bb,'d̂2bb','d2bb',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1ii,-self.__primalComplex.incidenceMatrix3ii,'d̂1ii','-d3ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1ib,-self.__primalComplex.incidenceMatrix3bi,'d̂1ib','-d3bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1bi,-self.__primalComplex.incidenceMatrix3ib,'d̂1bi','-d3ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1bb,-self.__primalComplex.incidenceMatrix3bb,'d̂1bb','-d3bb',doPrints))
-
-#        checks.append(self.checkIncidenceMatrixZero(self.incidenceMatrix1bb,'d̂1bb',doPrints))
-#        checks.append(self.checkIncidenceMatrixZero(self.__primalComplex.incidenceMatrix1bb,'d1bb',doPrints))
-
-
-        if doPrints:
-            cc.printBlue()
-            cc.printBlue('Using category 2')
-            cc.printBlue('-'*15)
-
-        self.useCategory = 2
-
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3ii,-self.__primalComplex.incidenceMatrix1ii,'d̂3ii','-d1ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3ib,-self.__primalComplex.incidenceMatrix1bi,'d̂3ib','-d1bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3bi,-self.__primalComplex.incidenceMatrix1ib,'d̂3bi','-d1ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix3bb,-self.__primalComplex.incidenceMatrix1bb,'d̂3bb','-d1bb',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2ii,self.__primalComplex.incidenceMatrix2ii,'d̂2ii','d2ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2ib,self.__primalComplex.incidenceMatrix2bi,'d̂2ib','d2bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2bi,self.__primalComplex.incidenceMatrix2ib,'d̂2bi','d2ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix2bb,self.__primalComplex.incidenceMatrix2bb,'d̂2bb','d2bb',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1ii,-self.__primalComplex.incidenceMatrix3ii,'d̂1ii','-d3ii',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1ib,-self.__primalComplex.incidenceMatrix3bi,'d̂1ib','-d3bi',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1bi,-self.__primalComplex.incidenceMatrix3ib,'d̂1bi','-d3ib',doPrints))
-        checks.append(self.checkIncidenceMatrixEqual(self.incidenceMatrix1bb,-self.__primalComplex.incidenceMatrix3bb,'d̂1bb','-d3bb',doPrints))
-
-
 
+        for category in [1,2]:
+            self.useCategory = category
+            if doPrints:
+                cc.printBlue()
+                cc.printBlue('Using category {}'.format(category))
+                cc.printBlue('-'*15)
+            for (dualDescription,primalDescription,dualBlock,primalBlock,rows,cols) in self.__dualityBlocks():
+                checks.append(self.checkIncidenceMatrixEqual(dualBlock,primalBlock,dualDescription,primalDescription,doPrints))
 
         if doPrints:
             cc.printGreen()
@@ -723,6 +809,76 @@ class DualComplex3D(Complex3D):
 
 
 
+#-------------------------------------------------------------------------
+#    Blocks of the primal and dual incidence matrices that are dual
+#-------------------------------------------------------------------------
+    def __dualityBlocks(self):
+        '''
+        Yields the sparse blocks of the dual incidence matrices together with
+        the (signed) primal blocks whose transpose they should be equal to:
+        d̂3 = -d1^T, d̂2 = d2^T and d̂1 = -d3^T for inner and border cells.
+
+        '''
+        for (dualDim,primalDim,sign) in [(3,1,-1),(2,2,1),(1,3,-1)]:
+            for r in 'ib':
+                for c in 'ib':
+                    dualBlock = self.incidenceBlock(dualDim,r+c,sparse=True)
+                    primalBlock = self.__primalComplex.incidenceBlock(primalDim,c+r,sparse=True)
+                    rows = self.cellsByNumber(
+                        self.categoryGroups(dualDim-1)['ibB'.index(r)])
+                    cols = self.cellsByNumber(
+                        self.categoryGroups(dualDim)['ibB'.index(c)])
+                    yield ('d̂{}{}'.format(dualDim,r+c),
+                           '{}d{}{}'.format('-' if sign < 0 else '',primalDim,c+r),
+                           dualBlock,
+                           sign*primalBlock,
+                           rows,
+                           cols)
+
+#-------------------------------------------------------------------------
+#    Sparse verification of all incidence matrices
+#-------------------------------------------------------------------------
+    def verifyIncidenceMatrices(self,categories=[1,2],doPrints=False):
+        '''
+        Verifies the topology of the primal and the dual complex using sparse
+        matrices only: the boundary of a boundary must vanish in both
+        complexes (see :meth:`Complex3D.verifyBoundaries`) and every dual
+        block must be the (signed) transpose of the primal block. The effort
+        is proportional to the number of non-zero entries, so this can also be
+        used for large complexes.
+
+        :param list categories: The categories (1 and/or 2) that are checked
+        :param bool doPrints: Print the report
+        :return: :class:`TopologyReport` with the offending cells
+
+        '''
+        report = TopologyReport()
+        if self.__primalComplex is None:
+            _log.error('Cannot verify incidence matrices: no primal complex defined')
+            return report
+        oldCategory = self.useCategory
+
+        for category in categories:
+            self.useCategory = category
+            suffix = ' (category {})'.format(category)
+            self.__primalComplex.verifyBoundaries(report,'d',suffix)
+            self.verifyBoundaries(report,'d̂',suffix)
+            for (dualDescription,primalDescription,dualBlock,primalBlock,rows,cols) in self.__dualityBlocks():
+                description = '{} = {}^T{}'.format(dualDescription,primalDescription,suffix)
+                if dualBlock.shape == primalBlock.T.shape:
+                    report.checkZero(description,dualBlock-primalBlock.T,rows,cols)
+                else:
+                    report.checkShape(description,dualBlock.shape,primalBlock.T.shape)
+
+        if self.useCategory != oldCategory:
+            self.useCategory = oldCategory
+        if doPrints:
+            report.printReport()
+        return report
+
+
+
+
 # =============================================================================
 #    TEST FUNCTIONS
 # =============================================================================
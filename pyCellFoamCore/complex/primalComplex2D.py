@@ -383,6 +383,8 @@ class PrimalComplex2D(Complex2D):
 
         '''
         self.renumberList(self.geometricNodes)
+        # The category lists may have been reordered in place
+        self.invalidateCellIndices()
         if self.useCategory == 1:
             self.renumberList(self.innerNodes1)
             self.renumberList(self.borderNodes1)
@@ -56,6 +56,7 @@ import pyCellFoamCore.tools.colorConsole as cc
 import pyCellFoamCore.tools.placeFigures as pf
 # import pyCellFoamCore.tools.tumcolor as tc
 from pyCellFoamCore.tools.logging_formatter import set_logging_format
+from pyCellFoamCore.tools.cellList import unique_cells
 from pyCellFoamCore.tools.myVTK import MyVTK
 
 
@@ -83,6 +84,8 @@ class PrimalComplex3D(Complex3D):
         '__dualComplex',
         '__renumber',
         '__changedNumbering',
+        '__cellNumbers',
+        '__numberedCells',
         '__useCategory',
         "__volumes_to_combine",
         "__faces_to_combine",
@@ -105,6 +108,8 @@ class PrimalComplex3D(Complex3D):
         self.__boundingBox = boundingBox
         self.__renumber = renumber
         self.__changedNumbering = True
+        self.__cellNumbers = []
+        self.__numberedCells = None
         self.__useCategory = 1
         self.__dualComplex = None
         self.__volumes_to_combine = volumes_to_combine
@@ -135,6 +140,10 @@ class PrimalComplex3D(Complex3D):
     def __getUseCategory(self): return self.__useCategory
     def __setUseCategory(self,u):
         if u in [1,2]:
+            # The dual cells read the categories of the primal cells when they
+            # are created, so a lazy dual complex is completed beforehand
+            if self.__dualComplex:
+                self.__dualComplex.materialize()
             self.__useCategory = u
             for c in chain(self.nodes,self.edges,self.faces,self.volumes):
                 c.useCategory = u
@@ -154,6 +163,18 @@ class PrimalComplex3D(Complex3D):
 
 
 
+    def __getCellNumbers(self):
+        if self.__changedNumbering:
+            self.renumber()
+        return self.__cellNumbers
+    cellNumbers = property(__getCellNumbers)
+    '''
+    List with one array per dimension (nodes to volumes) that contains the
+    numbers of the cells in the order of the category lists, i.e. the inner
+    cells, followed by the border and the additional border cells.
+
+    '''
+
     def __getChangedNumbering(self): return self.__changedNumbering
     changedNumbering = property(__getChangedNumbering)
     '''
@@ -205,41 +226,35 @@ class PrimalComplex3D(Complex3D):
 
     def renumber(self):
         '''
+        Numbers the cells in each category list. The numbers are stored in
+        :attr:`cellNumbers` and passed to the cells when they are read.
 
-        '''
-
+        The category lists may have been reordered in place, so the cached
+        incidence blocks and cell indices of every dimension whose lists
+        differ from the ones of the last renumbering are thrown away, see
+        :meth:`invalidateIncidence` and :meth:`invalidateCellIndices`. Edits
+        by :meth:`applyEdit` keep the cached blocks in the order of the lists
+        and do not count as a change.
 
-        if self.useCategory == 1:
-            self.renumberList(self.innerNodes1)
-            self.renumberList(self.borderNodes1)
-            self.renumberList(self.additionalBorderNodes1)
-            self.renumberList(self.innerEdges1)
-            self.renumberList(self.borderEdges1)
-            self.renumberList(self.additionalBorderEdges1)
-            self.renumberList(self.innerFaces1)
-            self.renumberList(self.borderFaces1)
-            self.renumberList(self.additionalBorderFaces1)
-            self.renumberList(self.innerVolumes1)
-            self.renumberList(self.borderVolumes1)
-        elif self.useCategory == 2:
-            self.renumberList(self.innerNodes2)
-            self.renumberList(self.borderNodes2)
-            self.renumberList(self.additionalBorderNodes2)
-            self.renumberList(self.innerEdges2)
-            self.renumberList(self.borderEdges2)
-            self.renumberList(self.additionalBorderEdges2)
-            self.renumberList(self.innerFaces2)
-            self.renumberList(self.borderFaces2)
-            self.renumberList(self.additionalBorderFaces2)
-            self.renumberList(self.innerVolumes2)
-            self.renumberList(self.borderVolumes2)
-        else:
-            _log.error('Unknown useCategory {}'.format(self.useCategory))
+        '''
+        groups = self.__numberingGroups()
+        self.__cellNumbers = [self.numberCells(g) for g in groups]
+
+        numberedCells = [[list(g) for g in dimGroups] for dimGroups in groups]
+        for (dim,cells) in enumerate(numberedCells):
+            if self.__numberedCells is None or cells != self.__numberedCells[dim]:
+                for matrixDim in (dim,dim+1):
+                    if matrixDim in [1,2,3]:
+                        self.invalidateIncidence(matrixDim)
+                self.invalidateCellIndices(dim)
+        self.__numberedCells = numberedCells
 
         self.renumberList(self.geometricNodes)
         self.renumberList(self.geometricEdges)
 
-        if self.dualComplex:
+        # The geometric cells of a lazy dual complex are numbered when they
+        # are created
+        if self.dualComplex and self.dualComplex.materialized >= 2:
             self.renumberList(self.dualComplex.geometricNodes)
             self.renumberList(self.dualComplex.geometricEdges)
 
@@ -249,10 +264,35 @@ class PrimalComplex3D(Complex3D):
         self.__changedNumbering = False
 
 
+    def nodesMoved(self,nodes):
+        '''
+        Moves the dual complex along after nodes have been moved in
+        :meth:`batch_geometry`, see :meth:`DualComplex3D.updatePrimalGeometry`.
+
+        '''
+        if self.__dualComplex:
+            self.__dualComplex.updatePrimalGeometry(nodes)
+
+
 
 
 
 
+#-------------------------------------------------------------------------
+#    Compile to arrays
+#-------------------------------------------------------------------------
+    def compile(self,dualComplex=None):
+        '''
+        Like :meth:`Complex3D.compile`, but uses the dual complex of this
+        primal complex by default.
+
+        '''
+        if dualComplex is None:
+            dualComplex = self.dualComplex
+        return super().compile(dualComplex)
+
+
+
 #-------------------------------------------------------------------------
 #    Combine additional border faces
 #-------------------------------------------------------------------------
@@ -481,12 +521,9 @@ class PrimalComplex3D(Complex3D):
                         _log.debug("Found three additional border faces. Checking if the corner is included")
                         all_nodes = []
                         for f in additional_border_faces:
-                            temp_nodes = []
-                            for e in f.edges:
-                                for n in [e.startNode, e.endNode]:
-                                    if not n in temp_nodes:
-                                        temp_nodes.append(n)
-                            all_nodes.append(temp_nodes)
+                            all_nodes.append(unique_cells(
+                                n for e in f.edges
+                                for n in [e.startNode, e.endNode]))
                         _log.debug("Found nodes: {}".format(all_nodes))
                         shared_nodes = set(all_nodes[0]).intersection(*[set(nodes) for nodes in all_nodes[1:]])
                         _log.debug("Shared nodes: {}".format(shared_nodes))
@@ -687,10 +724,7 @@ class PrimalComplex3D(Complex3D):
                                 newEdge.category1 = 'additionalBorder'
                                 _log.debug('New edge: {}'.format(newEdge))
 
-                                currentFaces = e0.faces[:]
-                                for f in e1.faces:
-                                    if not f in currentFaces:
-                                        currentFaces.append(f)
+                                currentFaces = unique_cells(e0.faces+e1.faces)
                                 for f in currentFaces:
                                     allEdges = f.rawEdges[:]
                                     _log.debug('Old edges in {}: {}'.format(f,f.rawEdges))
@@ -1032,6 +1066,7 @@ class PrimalComplex3D(Complex3D):
 
     def __split_edges(self):
         _log.critical("Split edges")
+        new_nodes = []
         new_edges = []
         old_edges = []
         # v = self.volumes[12]
@@ -1067,7 +1102,7 @@ class PrimalComplex3D(Complex3D):
                 )
                 new_node.category1 = "inner"
                 new_node.category2 = "inner"
-                self.nodes.append(new_node)
+                new_nodes.append(new_node)
 
                 _log.critical("Old nodes: %s and %s. New node: %s",e.startNode.coordinates, e.endNode.coordinates, new_node.coordinates)
 
@@ -1117,11 +1152,40 @@ class PrimalComplex3D(Complex3D):
                     f.edges = new_edges_face
                     _log.critical("New edges: %s", f.edges)
 
-        for e in old_edges:
-            self.edges.remove(e)
+        self.applyEdit(old_edges, new_nodes + new_edges)
+
+    def applyEdit(self, removedCells=[], addedCells=[], modifiedCells=[]):
+        '''
+        Removes and adds cells, see :meth:`Complex3D.applyEdit`. The cells
+        are renumbered the next time a category list is used.
 
-        for e in new_edges:
-            self.edges.append(e)
+        '''
+        super().applyEdit(removedCells, addedCells, modifiedCells)
+        if self.__numberedCells is not None:
+            self.__numberedCells = [[list(g) for g in dimGroups]
+                                    for dimGroups in self.__numberingGroups()]
+        if self.__renumber:
+            self.__changedNumbering = True
+
+    def __numberingGroups(self):
+        '''
+        Category lists of the cells of each dimension that are numbered by
+        :meth:`renumber`.
+
+        '''
+        if self.useCategory == 1:
+            return [[self.innerNodes1,self.borderNodes1,self.additionalBorderNodes1],
+                    [self.innerEdges1,self.borderEdges1,self.additionalBorderEdges1],
+                    [self.innerFaces1,self.borderFaces1,self.additionalBorderFaces1],
+                    [self.innerVolumes1,self.borderVolumes1]]
+        elif self.useCategory == 2:
+            return [[self.innerNodes2,self.borderNodes2,self.additionalBorderNodes2],
+                    [self.innerEdges2,self.borderEdges2,self.additionalBorderEdges2],
+                    [self.innerFaces2,self.borderFaces2,self.additionalBorderFaces2],
+                    [self.innerVolumes2,self.borderVolumes2]]
+        else:
+            _log.error('Unknown useCategory {}'.format(self.useCategory))
+            return []
 
     def updateComplex3D(self):
         '''
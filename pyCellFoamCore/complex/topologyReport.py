@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# TOPOLOGY REPORT
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 15:26:40 2026
+
+'''
+Result of the sparse verification of the incidence matrices of a complex,
+see :meth:`Complex3D.verifyBoundaries` and
+:meth:`DualComplex3D.verifyIncidenceMatrices`.
+
+Every check is identified by a short description such as ``'d1 d2 = 0'`` or
+``'d̂3ib = -d1bi^T'``. For every check that fails, the non-zero entries of the
+residual are stored together with the cells of the corresponding row and
+column.
+
+'''
+
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import logging
+
+# ------------------------------------------------------------------------
+#    Third-Party Libraries
+# ------------------------------------------------------------------------
+import numpy as np
+import scipy.sparse as sp
+
+# ------------------------------------------------------------------------
+#    Local Libraries
+# ------------------------------------------------------------------------
+
+#    Tools
+# -------------------------------------------------------------------
+import pyCellFoamCore.tools.colorConsole as cc
+
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    CLASS DEFINITION
+# =============================================================================
+class TopologyReport:
+    '''
+    Collects the results of several checks of sparse matrices that should be
+    zero.
+
+    '''
+
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__checks',
+                 '__issues')
+
+# =============================================================================
+#    INITIALIZATION
+# =============================================================================
+    def __init__(self):
+        '''
+
+        '''
+        self.__checks = {}
+        self.__issues = []
+
+# =============================================================================
+#    SETTER AND GETTER
+# =============================================================================
+    def __getOk(self): return not self.__issues
+    ok = property(__getOk)
+    '''
+    True if all checks have passed.
+
+    '''
+
+    def __getChecks(self): return self.__checks
+    checks = property(__getChecks)
+    '''
+    Dictionary that maps the description of every check to True (passed) or
+    False (failed).
+
+    '''
+
+    def __getIssues(self): return self.__issues
+    issues = property(__getIssues)
+    '''
+    List of all offending entries. Every entry is a dictionary with the keys
+    'check', 'row', 'column' and 'value', where 'row' and 'column' are the
+    cells that belong to the non-zero entry of the residual.
+
+    '''
+
+# =============================================================================
+#    MAGIC METHODS
+# =============================================================================
+    def __repr__(self):
+        return 'TopologyReport with {} checks, {} failed, {} offending entries'\
+            .format(len(self.__checks),
+                    list(self.__checks.values()).count(False),
+                    len(self.__issues))
+
+    def __bool__(self):
+        return self.ok
+
+# =============================================================================
+#    METHODS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Check that a sparse matrix is zero
+# ------------------------------------------------------------------------
+    def checkZero(self, description, residual, rowCells, colCells):
+        '''
+        Stores the result of one check. The residual is expected to be zero,
+        all non-zero entries are reported. The work is proportional to the
+        number of stored entries of the residual.
+
+        :param str description: Name of the check, e.g. 'd1 d2 = 0'
+        :param residual: Sparse matrix
+        :param list rowCells: Cells that belong to the rows of the residual
+        :param list colCells: Cells that belong to the columns of the residual
+        :return: True if the residual is zero
+
+        '''
+        residual = sp.coo_matrix(residual)
+        nonZero = np.flatnonzero(residual.data)
+        for k in nonZero:
+            self.__issues.append({'check': description,
+                                  'row': rowCells[residual.row[k]],
+                                  'column': colCells[residual.col[k]],
+                                  'value': residual.data[k]})
+        self.__checks[description] = len(nonZero) == 0
+        if len(nonZero) > 0:
+            _log.warning('Check {} failed with {} non-zero entries'
+                         .format(description, len(nonZero)))
+        return self.__checks[description]
+
+# ------------------------------------------------------------------------
+#    Check that two matrices can be compared
+# ------------------------------------------------------------------------
+    def checkShape(self, description, shape1, shape2):
+        '''
+        Stores a failed check if the two shapes differ. Matrices of different
+        shape cannot be compared entry by entry, so no cells are reported.
+
+        :return: True if the shapes are equal
+
+        '''
+        passed = tuple(shape1) == tuple(shape2)
+        if not passed:
+            self.__issues.append({'check': description,
+                                  'row': None,
+                                  'column': None,
+                                  'value': 'shape {} != {}'.format(shape1,
+                                                                   shape2)})
+            _log.warning('Check {} failed: shape {} != {}'
+                         .format(description, shape1, shape2))
+        self.__checks[description] = passed
+        return passed
+
+# ------------------------------------------------------------------------
+#    Cells that are part of failed checks
+# ------------------------------------------------------------------------
+    def offendingCells(self, check=None):
+        '''
+        Set of all cells that appear in an offending entry.
+
+        :param str check: Only consider this check, None for all checks
+
+        '''
+        cells = set()
+        for issue in self.__issues:
+            if check is None or issue['check'] == check:
+                cells.update(c for c in (issue['row'], issue['column'])
+                             if c is not None)
+        return cells
+
+# ------------------------------------------------------------------------
+#    Print the report
+# ------------------------------------------------------------------------
+    def printReport(self, maxNumEntries=10):
+        '''
+        Prints all checks and the first offending entries of every failed
+        check.
+
+        '''
+        for (description, passed) in self.__checks.items():
+            cc.printBlue('Check {} ... '.format(description), end='')
+            if passed:
+                cc.printGreen('Ok')
+            else:
+                cc.printRed('Not ok')
+                issues = [i for i in self.__issues
+                          if i['check'] == description]
+                for issue in issues[:maxNumEntries]:
+                    cc.printRed('    {} / {}: {}'.format(
+                        issue['row'], issue['column'], issue['value']))
+                if len(issues) > maxNumEntries:
+                    cc.printRed('    ... {} more'.format(
+                        len(issues) - maxNumEntries))
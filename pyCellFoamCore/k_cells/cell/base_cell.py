@@ -64,6 +64,11 @@ class BaseCell(SuperBaseCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__tikz_label_position',)
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
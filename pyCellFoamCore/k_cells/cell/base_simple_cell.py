@@ -57,6 +57,12 @@ class BaseSimpleCell(SuperBaseCell):
 
     '''
 
+    # =========================================================================
+    #    SLOTS
+    # =========================================================================
+    __slots__ = ('__belongs_to',
+                 '__tikz_label_position')
+
     # =========================================================================
     #    INITIALIZATION
     # =========================================================================
@@ -85,8 +91,8 @@ class BaseSimpleCell(SuperBaseCell):
     '''
 
     def __get_tikz_label_position(self):
-        if self.__tikz_label_position is None and self.__belongs_to:
-            return self.__belongs_to.tikz_label_position
+        if self.__tikz_label_position is None and self.belongs_to:
+            return self.belongs_to.tikz_label_position
         else:
             return self.__tikz_label_position
 
@@ -31,6 +31,8 @@ import logging
 from pyCellFoamCore.k_cells.cell.base_cell import BaseCell
 from pyCellFoamCore.k_cells.cell.super_cell import SuperCell
 from pyCellFoamCore.k_cells.cell.reversed_cell import ReversedCell
+from pyCellFoamCore.k_cells.cell import cell_events
+from pyCellFoamCore.k_cells.cell import cell_numbering
 
 #    Tools
 # -------------------------------------------------------------------
@@ -58,6 +60,28 @@ class Cell(BaseCell, SuperCell):
 
     '''
 
+    # =========================================================================
+    #    SLOTS
+    # =========================================================================
+    __slots__ = ('__label',
+                 '__num',
+                 '__category1',
+                 '__category2',
+                 '__category_text',
+                 '__category_text_changed',
+                 '__show_label',
+                 '__color',
+                 '__dual_cell_3d',
+                 '__dual_cell_2d',
+                 '__dual_cell_1d',
+                 '__dual_cell_0d',
+                 '__is_geometrical',
+                 '__use_category',
+                 '__geometry_changed',
+                 '__gray_in_tikz',
+                 '__imorph_type',
+                 '__show_in_plot')
+
     # =========================================================================
     #    INITIALIZATION
     # =========================================================================
@@ -87,9 +111,6 @@ class Cell(BaseCell, SuperCell):
 
         '''
 
-        if my_reverse is None:
-            my_reverse = ReversedCell(my_reverse=self, **kwargs)
-
         self.__label = label
         self.__num = num
         self.__category1 = category
@@ -115,9 +136,12 @@ class Cell(BaseCell, SuperCell):
     #    SETTER AND GETTER
     # =========================================================================
 
-    def __get_num(self): return self.__num
+    def __get_num(self):
+        cell_numbering.resolve(self)
+        return self.__num
 
     def __set_num(self, n):
+        cell_numbering.discard(self)
         self.__num = n
         if not self.is_dual:
             if self.dualCell3D:
@@ -132,7 +156,8 @@ class Cell(BaseCell, SuperCell):
 
     num = property(__get_num, __set_num)
     '''
-    Number of this k-cell.
+    Number of this k-cell. A number that has been set by a complex with
+    :func:`cell_numbering.set_numbers` is taken when it is read.
 
     '''
 
@@ -154,7 +179,9 @@ class Cell(BaseCell, SuperCell):
     def __set_category1(self, t):
         if self.__category1 == 'undefined' or t == 'undefined':
             if t in ['inner', 'border', 'additionalBorder', 'undefined']:
+                old_category = self.__category1
                 self.__category1 = t
+                cell_events.category_changed(self, 1, old_category, t)
                 self.__category_text_changed = True
                 self.update_text()
             else:
@@ -180,7 +207,9 @@ class Cell(BaseCell, SuperCell):
     def __set_category2(self, t):
         if self.__category2 == 'undefined' or t == 'undefined':
             if t in ['inner', 'border', 'additionalBorder', 'undefined']:
+                old_category = self.__category2
                 self.__category2 = t
+                cell_events.category_changed(self, 2, old_category, t)
                 self.__category_text_changed = True
                 self.update_text()
             else:
@@ -443,6 +472,13 @@ class Cell(BaseCell, SuperCell):
                           .format(self.info_text))
         self.__geometry_changed = True
 
+    def create_reverse(self):
+        '''
+        The reversed cell is created when it is needed for the first time.
+
+        '''
+        return ReversedCell(my_reverse=self)
+
 
 # =============================================================================
 #    TEST FUNCTIONS
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# CELL EVENTS
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 12:05:18 2026
+
+'''
+Notifications about changes of k-cells.
+
+k-cells do not know the complexes they belong to. Instead, objects that cache
+data derived from the cells (e.g. the incidence matrices of a complex)
+register as listeners here and are told which cell was modified. Listeners
+are stored as weak references, so registering does not keep a complex alive.
+
+A listener implements the methods
+
+* ``boundaryChanged(cell, boundaryCell)``: `boundaryCell` was added to or
+  removed from the boundary of `cell`
+* ``categoryChanged(cell, scheme, oldCategory, newCategory)``: category 1 or
+  2 (given by `scheme`) of `cell` has changed
+* ``coordinatesChanged(node)``: the coordinates of `node` have been set
+
+While a geometry batch is open, see :func:`begin_geometry_batch`, moved nodes
+do not mark their edges, faces and volumes as changed one after the other.
+They are collected instead and handed to the caller when the batch ends,
+together with the objects that have opened the nested batches.
+
+'''
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import logging
+import weakref
+
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    LISTENERS
+# =============================================================================
+
+_listeners = weakref.WeakSet()
+
+
+def register_listener(listener):
+    '''
+    Register an object that wants to be notified about changes of k-cells.
+
+    '''
+    _listeners.add(listener)
+
+
+def unregister_listener(listener):
+    '''
+    Stop notifying the given object.
+
+    '''
+    _listeners.discard(listener)
+
+
+# =============================================================================
+#    EVENTS
+# =============================================================================
+
+def boundary_changed(cell, boundary_cell):
+    '''
+    Called when `boundary_cell` is added to or removed from the boundary of
+    `cell`, e.g. when a face registers itself at one of its edges.
+
+    '''
+    if _listeners:
+        for listener in list(_listeners):
+            listener.boundaryChanged(cell, boundary_cell)
+
+
+def category_changed(cell, scheme, old_category, new_category):
+    '''
+    Called when category 1 or 2 of a cell has been changed.
+
+    '''
+    if _listeners and old_category != new_category:
+        for listener in list(_listeners):
+            listener.categoryChanged(cell, scheme, old_category,
+                                     new_category)
+
+
+def coordinates_changed(node):
+    '''
+    Called when the coordinates of a node have been set.
+
+    '''
+    if _listeners:
+        for listener in list(_listeners):
+            listener.coordinatesChanged(node)
+
+
+# =============================================================================
+#    GEOMETRY BATCHES
+# =============================================================================
+
+_batch_depth = 0
+_batch_nodes = {}
+_batch_owners = {}
+
+
+def begin_geometry_batch(owner=None):
+    '''
+    Start collecting moved nodes instead of updating the geometry of their
+    edges, faces and volumes right away. Batches can be nested, the nodes
+    are collected until the outermost batch ends.
+
+    :param owner: Object that opens the batch, e.g. a complex. The owners of
+        all nested batches are returned when the outermost batch ends.
+
+    '''
+    global _batch_depth
+    _batch_depth += 1
+    if owner is not None:
+        _batch_owners[owner] = None
+
+
+def end_geometry_batch():
+    '''
+    End a geometry batch.
+
+    :return: The nodes that have been moved since the outermost batch began,
+        in the order of their first move, and the owners of all batches
+        since then. Both are empty if an outer batch is still open.
+
+    '''
+    global _batch_depth, _batch_nodes, _batch_owners
+    if _batch_depth == 0:
+        _log.error('There is no geometry batch to end')
+        return ([], [])
+    _batch_depth -= 1
+    if _batch_depth > 0:
+        return ([], [])
+    nodes = list(_batch_nodes)
+    owners = list(_batch_owners)
+    _batch_nodes = {}
+    _batch_owners = {}
+    return (nodes, owners)
+
+
+def defer_geometry_update(node):
+    '''
+    Called when the geometry of a node has changed.
+
+    :return: True if a geometry batch is open and the node has been
+        collected, False if the node must update its edges itself
+
+    '''
+    if _batch_depth == 0:
+        return False
+    _batch_nodes[node] = None
+    return True
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# CELL NUMBERING
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 14:41:09 2026
+
+'''
+Deferred numbering of k-cells.
+
+Setting ``cell.num`` updates the duals and the label texts of the cell, which
+is slow if a whole complex is renumbered. Instead, a complex calculates all
+numbers at once in an array that it keeps, e.g.
+:attr:`PrimalComplex3D.cellNumbers`. With :func:`set_numbers`, every cell
+only gets a reference to this array and its position in it, see
+:attr:`SuperBaseCell.pending_number`. A cell takes its number from the array
+as soon as its number or one of its texts is read.
+
+There is no state in this module. A pending number belongs to the cell, so
+it disappears together with the cell.
+
+'''
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import logging
+
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    PENDING NUMBERS
+# =============================================================================
+
+def set_numbers(cells, numbers):
+    '''
+    Store new numbers for the given cells. If a cell gets several numbers
+    before it is read, the last one is used, like for repeated assignments
+    of ``cell.num``.
+
+    :param list cells: k-cells
+    :param numbers: NumPy array with one number per cell. It is not copied,
+        the cells read their numbers from it.
+
+    '''
+    for (i, c) in enumerate(cells):
+        if c.is_reverse:
+            c = c.my_reverse
+        c.pending_number = (numbers, i)
+
+
+def discard(cell):
+    '''
+    Forget the pending number of a cell, because it has been set directly.
+
+    '''
+    cell.pending_number = None
+
+
+def _take(cell):
+    '''
+    Removes the pending number from the cell and returns it, None if there
+    is none.
+
+    '''
+    pending = cell.pending_number
+    if pending is None:
+        return None
+    cell.pending_number = None
+    (numbers, i) = pending
+    return int(numbers[i])
+
+
+def resolve(cell):
+    '''
+    Hand the pending number to the cell. Reversed cells use the number of the
+    original cell and dual cells copy the number of their primal cell, so
+    these are resolved as well.
+
+    '''
+    # Plain test cells do not know whether they are reversed, and reversed
+    # cells can exist without the original cell
+    if getattr(cell, 'is_reverse', False):
+        cell = cell.my_reverse
+        if cell is None:
+            return
+    number = _take(cell)
+
+    if hasattr(cell, 'updateNum'):
+        for c in (cell.dualCell3D, cell.dualCell2D,
+                  cell.dualCell1D, cell.dualCell0D):
+            # Skip missing duals and lists of geometric duals
+            if not hasattr(c, 'pending_number'):
+                continue
+            if c.is_reverse:
+                c = c.my_reverse
+            primalNumber = _take(c)
+            if primalNumber is not None:
+                c.num = primalNumber
+
+    if number is not None:
+        cell.num = number
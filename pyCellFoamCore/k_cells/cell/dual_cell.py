@@ -58,7 +58,7 @@ class DualCell(Cell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
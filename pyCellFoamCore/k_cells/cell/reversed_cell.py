@@ -61,7 +61,7 @@ class ReversedCell(BaseCell, SuperReversedCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -359,13 +359,13 @@ class ReversedCell(BaseCell, SuperReversedCell):
 
     def __getGrayInTikz(self):
         if self.my_reverse:
-            return self.my_reverse.grayInTikz
+            return self.my_reverse.gray_in_tikz
         else:
             _log.error('No reverse defined, cannot return grayInTikz')
 
     def __setGrayInTikz(self, g):
         if self.my_reverse:
-            self.my_reverse.grayInTikz = g
+            self.my_reverse.gray_in_tikz = g
         else:
             _log.error('No reverse defined, cannot return grayInTikz')
 
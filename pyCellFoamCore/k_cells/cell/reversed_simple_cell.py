@@ -59,6 +59,11 @@ class ReversedSimpleCell(BaseSimpleCell, SuperReversedCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -95,6 +100,21 @@ class ReversedSimpleCell(BaseSimpleCell, SuperReversedCell):
 
     '''
 
+    def __get_belongs_to(self):
+        belongs_to = super().belongs_to
+        if belongs_to is None and self.my_reverse \
+                and self.my_reverse.belongs_to:
+            return self.my_reverse.belongs_to.my_reverse
+        return belongs_to
+
+    belongs_to = property(__get_belongs_to)
+    '''
+    The reverse of the k-cell that the positive simple cell belongs to. It is
+    looked up when needed, so creating the reversed simple cell does not
+    create the reversed k-cell.
+
+    '''
+
 # =============================================================================
 #    METHODS
 # =============================================================================
@@ -63,6 +63,11 @@ class SimpleCell(BaseSimpleCell, SuperCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__label_suffix',)
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -78,14 +83,6 @@ class SimpleCell(BaseSimpleCell, SuperCell):
             class at the lowest level by loggerName = __name__
 
         '''
-        if my_reverse is None:
-            if belongsTo is not None:
-                belongsToReversed = belongsTo.my_reverse
-            else:
-                belongsToReversed = None
-            my_reverse = ReversedSimpleCell(my_reverse=self,
-                                           belongsTo=belongsToReversed,
-                                           **kwargs)
         super().__init__(*args,
                          belongsTo=belongsTo,
                          my_reverse=my_reverse,
@@ -114,6 +111,13 @@ class SimpleCell(BaseSimpleCell, SuperCell):
 #    METHODS
 # =============================================================================
 
+    def create_reverse(self):
+        '''
+        The reversed cell is created when it is needed for the first time.
+
+        '''
+        return ReversedSimpleCell(my_reverse=self)
+
 
 # =============================================================================
 #    TEST FUNCTIONS
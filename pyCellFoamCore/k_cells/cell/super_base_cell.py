@@ -27,6 +27,12 @@ import logging
 #    Local Libraries
 # ------------------------------------------------------------------------
 
+#    kCells
+# -------------------------------------------------------------------
+
+from pyCellFoamCore.k_cells.cell import cell_numbering
+from pyCellFoamCore.tools.cellList import CellList
+
 #    Tools
 # -------------------------------------------------------------------
 
@@ -54,7 +60,29 @@ class SuperBaseCell:
     #    CLASS VARIABLES
     # =========================================================================
 
-    allCells = []
+    allCells = CellList()
+
+    reversed_cell_count = 0
+    '''
+    Number of reversed cells that have been created on demand, see
+    :attr:`my_reverse`.
+
+    '''
+
+    # =========================================================================
+    #    SLOTS
+    # =========================================================================
+    __slots__ = ('__my_reverse',
+                 '__label_text',
+                 '__label_text_short',
+                 '__label_text_changed',
+                 '__info_text',
+                 '__info_text_changed',
+                 '__pending_number',
+                 # Attribute of SuperCell. Cell and SimpleCell also inherit
+                 # slots from BaseCell and BaseSimpleCell, so SuperCell cannot
+                 # have slots of its own.
+                 '_SuperCell__is_deleted')
 
     # =========================================================================
     #    INITIALIZATION
@@ -74,6 +102,7 @@ class SuperBaseCell:
         self.__label_text_changed = True
         self.__info_text = ''
         self.__info_text_changed = True
+        self.__pending_number = None
 
         # Check if there are any non-used positional arguments
         if args:
@@ -104,6 +133,7 @@ class SuperBaseCell:
     # =========================================================================
 
     def __get_info_text(self):
+        cell_numbering.resolve(self)
         if self.__info_text_changed:
             self.__create_info_text()
         return self.__info_text
@@ -115,6 +145,7 @@ class SuperBaseCell:
     '''
 
     def __get_label_text(self):
+        cell_numbering.resolve(self)
         if self.__label_text_changed:
             self.__create_label_text()
         return self.__label_text
@@ -125,6 +156,7 @@ class SuperBaseCell:
     '''
 
     def __get_label_text_short(self):
+        cell_numbering.resolve(self)
         if self.__label_text_changed:
             self.__create_label_text()
         return self.__label_text_short
@@ -149,11 +181,42 @@ class SuperBaseCell:
     '''
 
     def __get_my_reverse(self):
+        if self.__my_reverse is None:
+            self.__my_reverse = self.create_reverse()
+            if self.__my_reverse is not None:
+                SuperBaseCell.reversed_cell_count += 1
         return self.__my_reverse
     my_reverse = property(__get_my_reverse)
     '''
     Returns the reverse of this cell, can also be accesed by using the - symbol
 
+    Most reversed cells are never used, so they are only created when they are
+    needed for the first time. Afterwards, always the same reversed cell is
+    returned.
+
+    '''
+
+    def __get_existing_reverse(self):
+        return self.__my_reverse or None
+    existing_reverse = property(__get_existing_reverse)
+    '''
+    The reverse of this cell if it exists already, otherwise None. Unlike
+    :attr:`my_reverse`, this does not create the reversed cell.
+
+    '''
+
+    def __get_pending_number(self):
+        return self.__pending_number
+
+    def __set_pending_number(self, p):
+        self.__pending_number = p
+    pending_number = property(__get_pending_number, __set_pending_number)
+    '''
+    Number that a complex has calculated for this cell but that has not been
+    taken yet, as a tuple of the array of numbers of the complex and the
+    position of this cell in it. None if there is no pending number, see
+    :mod:`cell_numbering`.
+
     '''
 
     def __get_label_text_changed(self):
@@ -282,7 +345,7 @@ class SuperBaseCell:
         Simply Use " - " sign to get the reversed kCell
 
         '''
-        return self.__my_reverse
+        return self.my_reverse
 
     def __repr__(self):
         '''
@@ -350,6 +413,14 @@ class SuperBaseCell:
         self.__label_text_changed = True
         self.__info_text_changed = True
 
+    def create_reverse(self):
+        '''
+        Creates the reverse of this cell when it is needed for the first time.
+        Child classes that have a reverse return a new reversed cell here.
+
+        '''
+        return None
+
     def tikz_coords(self, v, precission=3):
         '''
         Transform given coordinates from a vector into a string that is used
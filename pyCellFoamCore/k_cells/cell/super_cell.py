@@ -57,6 +57,11 @@ class SuperCell(SuperBaseCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -64,13 +69,11 @@ class SuperCell(SuperBaseCell):
         '''
 
 
-        :param SuperBaseCell my_reverse:
+        :param SuperBaseCell my_reverse: Leave empty to create the reversed
+            cell when it is needed
         :param str loggerName: The logger name needs to be passed from the
             class at the lowest level by loggerName = __name__
         '''
-        if my_reverse is None:
-            my_reverse = SuperReversedCell(my_reverse=self, **kwargs)
-
         self.__is_deleted = False
         super().__init__(*args, my_reverse=my_reverse, **kwargs)
 
@@ -136,8 +139,8 @@ class SuperCell(SuperBaseCell):
 
         '''
         super().update_text()
-        if self.my_reverse:
-            self.my_reverse.update_text()
+        if self.existing_reverse:
+            self.existing_reverse.update_text()
 
     def delete(self):
         '''
@@ -149,6 +152,13 @@ class SuperCell(SuperBaseCell):
         self.__is_deleted = True
         self.update_text()
 
+    def create_reverse(self):
+        '''
+        The reversed cell is created when it is needed for the first time.
+
+        '''
+        return SuperReversedCell(my_reverse=self)
+
 
 # =============================================================================
 #    TEST FUNCTIONS
@@ -62,6 +62,11 @@ class SuperReversedCell(SuperBaseCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -62,6 +62,11 @@ class BaseEdge(BaseCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
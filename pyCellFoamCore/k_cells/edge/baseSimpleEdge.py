@@ -70,6 +70,11 @@ class BaseSimpleEdge(BaseSimpleCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
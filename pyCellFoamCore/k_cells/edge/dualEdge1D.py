@@ -89,7 +89,7 @@ class DualEdge1D(Edge, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -64,7 +64,7 @@ class DualEdge2D(Edge, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -87,7 +87,7 @@ class DualEdge3D(Edge, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -63,6 +63,21 @@ class Edge(BaseEdge, Cell):
     '''
     edgeCount = 0
 
+    # =========================================================================
+    #    SLOTS
+    # =========================================================================
+    __slots__ = ('__startNode',
+                 '__endNode',
+                 '__faces',
+                 '__geometricNodes',
+                 '__simpleEdges',
+                 '__showArrow',
+                 '__projectedEdge',
+                 '__projectionFace',
+                 '__length',
+                 '__directionVec',
+                 '__barycenter')
+
     # =========================================================================
     #    INITIALIZATION
     # =========================================================================
@@ -92,7 +107,6 @@ class Edge(BaseEdge, Cell):
         super().__init__(*args,
                          label=label,
                          num=num,
-                         my_reverse=ReversedEdge(my_reverse=self),
                          **kwargs)
         self.__geometricNodes = geometricNodes
         self.__startNode = start
@@ -100,6 +114,9 @@ class Edge(BaseEdge, Cell):
         self.__showArrow = True
         self.__faces = []
         self.__simpleEdges = []
+        self.__length = None
+        self.__directionVec = None
+        self.__barycenter = None
 
         self.setUp()
         if self.__simpleEdges:
@@ -213,6 +230,53 @@ class Edge(BaseEdge, Cell):
 
     simpleEdges = property(__getSimpleEdges)
 
+    def __getLength(self):
+        if self.geometryChanged:
+            self.setUp()
+        if self.__length is None:
+            lengths = [se.length for se in self.__simpleEdges]
+            self.__length = (lengths, sum(lengths))
+        (lengths, totalLength) = self.__length
+        return [list(lengths), totalLength]
+
+    length = property(__getLength)
+    '''
+    List with the lengths of all simple edges and the total length. It is
+    calculated once and kept until the geometry of the edge changes. A new
+    list is returned each time, so the cached values cannot be changed from
+    outside.
+
+    '''
+
+    def __getDirectionVec(self):
+        if self.geometryChanged:
+            self.setUp()
+        if self.__directionVec is None:
+            self.__directionVec = [se.directionVec
+                                   for se in self.__simpleEdges]
+        return list(self.__directionVec)
+
+    directionVec = property(__getDirectionVec)
+    '''
+    List with the direction vectors of all simple edges, kept until the
+    geometry of the edge changes. A new list is returned each time.
+
+    '''
+
+    def __getBarycenter(self):
+        if self.geometryChanged:
+            self.setUp()
+        if self.__barycenter is None:
+            self.__barycenter = [se.barycenter for se in self.__simpleEdges]
+        return list(self.__barycenter)
+
+    barycenter = property(__getBarycenter)
+    '''
+    List with the barycenters of all simple edges, kept until the geometry
+    of the edge changes. A new list is returned each time.
+
+    '''
+
     def __getCylinders(self):
         if self.geometryChanged:
             self.setUp()
@@ -236,6 +300,16 @@ class Edge(BaseEdge, Cell):
 #    METHODS
 # =============================================================================
 
+# ------------------------------------------------------------------------
+#    Create the reversed edge
+# ------------------------------------------------------------------------
+    def create_reverse(self):
+        '''
+        The reversed edge is created when it is needed for the first time.
+
+        '''
+        return ReversedEdge(my_reverse=self)
+
 # ------------------------------------------------------------------------
 #    Set up edge
 # ------------------------------------------------------------------------
@@ -245,6 +319,9 @@ class Edge(BaseEdge, Cell):
         for se in self.__simpleEdges:
             se.delete()
         self.__simpleEdges = []
+        self.__length = None
+        self.__directionVec = None
+        self.__barycenter = None
 
         if isinstance(self.geometricNodes, Node):
             self.__geometricNodes = [self.__geometricNodes, ]
@@ -55,7 +55,7 @@ class ReversedEdge(BaseEdge, ReversedCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -141,6 +141,31 @@ class ReversedEdge(BaseEdge, ReversedCell):
 
     simpleEdges = property(__getSimpleEdges)
 
+    def __getLength(self):
+        if self.my_reverse:
+            (lengths, totalLength) = self.my_reverse.length
+            return [list(reversed(lengths)), totalLength]
+        else:
+            _log.error('No reverse defined')
+
+    length = property(__getLength)
+
+    def __getDirectionVec(self):
+        if self.my_reverse:
+            return [-d for d in reversed(self.my_reverse.directionVec)]
+        else:
+            _log.error('No reverse defined')
+
+    directionVec = property(__getDirectionVec)
+
+    def __getBarycenter(self):
+        if self.my_reverse:
+            return list(reversed(self.my_reverse.barycenter))
+        else:
+            _log.error('No reverse defined')
+
+    barycenter = property(__getBarycenter)
+
     def __getTopologicNodes(self):
         if self.my_reverse:
             return list(reversed(self.my_reverse.topologicNodes))
@@ -50,7 +50,7 @@ class ReversedSimpleEdge(BaseSimpleEdge, ReversedSimpleCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
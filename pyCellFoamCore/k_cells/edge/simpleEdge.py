@@ -76,6 +76,18 @@ class SimpleEdge(BaseSimpleEdge, SimpleCell):
 
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__startNode',
+                 '__endNode',
+                 '__simpleFaces',
+                 '__connectionVec',
+                 '__directionVec',
+                 '__barycenter',
+                 '__radius',
+                 '__cylinder')
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -91,13 +103,7 @@ class SimpleEdge(BaseSimpleEdge, SimpleCell):
         :param bool is_dual: Does this edge belong to a dual complex
 
         '''
-        if belongsTo is None:
-            belongsToRev = None
-        else:
-            belongsToRev = belongsTo.my_reverse
         super().__init__(*args,
-                         my_reverse=ReversedSimpleEdge(my_reverse=self,
-                                                      belongsTo=belongsToRev),
                          belongsTo=belongsTo,
                          **kwargs)
 
@@ -202,6 +208,17 @@ class SimpleEdge(BaseSimpleEdge, SimpleCell):
 #    METHODS
 # =============================================================================
 
+# ------------------------------------------------------------------------
+#    Create the reversed simple edge
+# ------------------------------------------------------------------------
+    def create_reverse(self):
+        '''
+        The reversed simple edge is created when it is needed for the first
+        time.
+
+        '''
+        return ReversedSimpleEdge(my_reverse=self)
+
 # ------------------------------------------------------------------------
 #    Calculate barycenter of simple edge
 # ------------------------------------------------------------------------
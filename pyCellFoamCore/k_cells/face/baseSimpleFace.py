@@ -64,6 +64,11 @@ class BaseSimpleFace(BaseSimpleCell):
     '''
     '''
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -84,7 +84,7 @@ class DualFace2D(Face, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -338,7 +338,7 @@ if __name__ == "__main__":
     nodes = [n0, n1, n2, n3, n4, n5, n6]
 
     for n in nodes:
-        n.useCategory1 = 1
+        n.useCategory = 1
 
     e0 = Edge(n0, n1)
     e1 = Edge(n0, n2)
@@ -80,7 +80,7 @@ class DualFace3D(Face, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ('___log.debug', '___log.error')
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
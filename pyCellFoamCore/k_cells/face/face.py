@@ -76,6 +76,15 @@ Center
 """""""""""""""""""""""""""""""""""""""""""""""""""
 
 
+Fan
+"""""""""""""""""""""""""""""""""""""""""""""""""""
+The face keeps the pseudo simple face as one simple face and only stores its
+triangulation as an array of node indices, see :attr:`Face.triangles`. The
+triangles form a fan around the first node of the simple face. No geometric
+edges are created until they are needed, e.g. for plotting, see
+:meth:`Face.materializeTriangulation`.
+
+
 
 
 
@@ -125,6 +134,7 @@ from pyCellFoamCore.k_cells.edge.baseEdge import BaseEdge, EdgePlotly
 from pyCellFoamCore.k_cells.edge.edge import Edge
 from pyCellFoamCore.k_cells.face.baseFace import BaseFace, FacePlotly
 from pyCellFoamCore.k_cells.cell.cell import Cell
+from pyCellFoamCore.k_cells.cell import cell_events
 from pyCellFoamCore.k_cells.face.simpleFace import SimpleFace
 from pyCellFoamCore.k_cells.face.reversedFace import ReversedFace
 
@@ -166,6 +176,27 @@ class Face(BaseFace, Cell):
 
     faceCount = 0
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__rawEdges',
+                 '__edges',
+                 '__simpleFaces',
+                 '__geometricEdges',
+                 '__geometricNodes',
+                 '__centerNodes',
+                 '__topologicNodes',
+                 '__volumes',
+                 '__sortEdges',
+                 '__triangulate',
+                 '__triangulationMethod',
+                 '__forceTriangulate',
+                 '__triangles',
+                 '__triangleNodes',
+                 '__materializeTriangulation',
+                 '__showNormalVec',
+                 '__showBarycenter')
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -191,7 +222,6 @@ class Face(BaseFace, Cell):
         super().__init__(*args,
                          label=label,
                          num=num,
-                         my_reverse=ReversedFace(my_reverse=self),
                          **kwargs)
 
         self.__rawEdges = rawEdges[:]
@@ -206,6 +236,9 @@ class Face(BaseFace, Cell):
         self.__triangulate = triangulate
         self.__sortEdges = sortEdges
         self.__forceTriangulate = forceTriangulate
+        self.__triangles = None
+        self.__triangleNodes = None
+        self.__materializeTriangulation = False
         self.triangulationMethod = triangulationMethod
         self.color = tc.TUMGreen()
         self.setUp()
@@ -223,6 +256,12 @@ class Face(BaseFace, Cell):
     def __setEdges(self, edges):
         self.__rawEdges = edges
         self.updateGeometry()
+        # The face is set up lazily, so report the new edges right away
+        newEdges = edges
+        if len(edges) > 0 and not isinstance(edges[0], BaseEdge):
+            newEdges = [e for loop in edges for e in loop]
+        for e in set(self.__edges).symmetric_difference(newEdges):
+            cell_events.boundary_changed(self, e)
 
     edges = property(__getEdges, __setEdges)
 
@@ -299,7 +338,7 @@ class Face(BaseFace, Cell):
     def __getTriangulationmethod(self): return self.__triangulationMethod
 
     def __setTriangulationmethod(self, t):
-        if t in ['center', 'alternating']:
+        if t in ['center', 'alternating', 'fan']:
             self.__triangulationMethod = t
         else:
             self.__triangulationMethod = None
@@ -309,21 +348,64 @@ class Face(BaseFace, Cell):
     triangulationMethod = property(__getTriangulationmethod,
                                    __setTriangulationmethod)
 
+    def __getTriangleNodes(self):
+        if self.geometryChanged:
+            self.setUp()
+        if self.__triangleNodes is None:
+            self.__calcTriangles()
+        return self.__triangleNodes
+
+    triangleNodes = property(__getTriangleNodes)
+    '''
+    All nodes of the simple faces, every node is listed only once.
+
+    '''
+
+    def __getTriangles(self):
+        if self.geometryChanged:
+            self.setUp()
+        if self.__triangles is None:
+            self.__calcTriangles()
+        return self.__triangles
+
+    triangles = property(__getTriangles)
+    '''
+    Integer array of shape (n, 3) with the indices of the corners of all
+    triangles in :attr:`triangleNodes`. Every simple face is split into a fan
+    around its first node, in the same order as the sub-areas in
+    :attr:`SimpleFace.area`.
+
+    '''
+
 # =============================================================================
 #    METHODS
 # =============================================================================
 
 # ------------------------------------------------------------------------
-#    Set up face
+#    Create the reversed face
 # ------------------------------------------------------------------------
+    def create_reverse(self):
+        '''
+        The reversed face is created when it is needed for the first time.
 
-    def setUp(self):
         '''
+        return ReversedFace(my_reverse=self)
 
+# ------------------------------------------------------------------------
+#    Set up face
+# ------------------------------------------------------------------------
 
+    def setUp(self, calcGeometry=True):
         '''
+        :param bool calcGeometry: If False, the geometry of the new simple
+            faces is not calculated, see :meth:`Complex3D.updateFaceGeometry`.
+
+        '''
+        self.__triangles = None
+        self.__triangleNodes = None
 
         _log.debug('setting up face {}'.format(self))
+        oldEdges = self.__edges
         for e in self.__edges+self.__geometricEdges:
             e.delFace(self)
 
@@ -356,118 +438,8 @@ class Face(BaseFace, Cell):
             # Find all simple edges to define simple faces
             for subEdges in self.__rawEdges:
 
-                simpleEdges = []
-
-                # Add all simple Edges of first raw edge of this set
-                _log.debug('Starting with edge {}'.format(subEdges[0]))
-                for se in subEdges[0].simpleEdges:
-                    simpleEdges.append(se)
-
-                # Go through the other raw Edges of this set
-                for e in subEdges[1:]:
-                    _log.debug("Adding edge %s", e)
-                    found = False
-                    # Go through all the already found simple edges,
-                    # but in inversed direction
-                    for seOld in reversed(simpleEdges):
-                        if not found:
-                            # Got through the simple edges of the new edge
-                            # to be added
-                            for seNew in e.simpleEdges:
-                                _log.debug(
-                                    'Trying edge with start {} and end {}'
-                                    .format(seNew.startNode, seNew.endNode))
-                                # If the nodes are the same, then the first
-                                # simple edge that should be added is found
-                                if seNew.startNode == seOld.endNode:
-                                    found = True
-                                    _log.debug(
-                                        'node {} and {} are the same'
-                                        .format(seNew.startNode,
-                                                seOld.endNode))
-                                else:
-                                    _log.debug(
-                                        'node {} and {} are not the same'
-                                        .format(seNew.startNode,
-                                                seOld.endNode))
-                                    _log.debug('seNew.endNode {}'
-                                                      .format(seNew.endNode))
-
-                                # If the beginning was found (maybe in a
-                                # previous iteration of this for loop), then
-                                # add all other simple edges of this new edges
-                                if found:
-                                    _log.debug('found')
-                                    simpleEdges.append(seNew)
-
-                        # If a connection between the last simple edge and the
-                        # new full edge is not found, then there were to may
-                        # simple edges from the last edge added to simpleEdges,
-                        # therefore remove the last one and try again
-                        if not found:
-                            _log.debug('removing')
-                            simpleEdges.remove(seOld)
-
-                # The list of simple edges now looks like that:
-                # [? ? ok ok ok ok ? ? ?]
+                (simpleEdges, nodes) = self.__assembleCycle(subEdges, num)
                 if len(simpleEdges) > 0:
-                    nodes = [simpleEdges[0].startNode, ]
-                    for se in simpleEdges:
-                        nodes.append(se.endNode)
-                    _log.debug(
-                        'Nodes before cutting first and last simple edges ' +
-                        'in subface {} of face {}: {}'
-                        .format(an.alphaNum(num),
-                                self.info_text,
-                                ', '.join(str(n) for n in nodes)))
-
-                    # Start and end of this list still has to be adjusted
-                    count = 0
-                    while len(simpleEdges) > 0 \
-                            and simpleEdges[-1].endNode \
-                            != simpleEdges[0].startNode \
-                            and count < 50:
-                        count += 1
-                        # Check if the last node occurs in the other nodes
-                        # again and could maybe close the circle
-                        if nodes[-1] in nodes[:-1]:
-                            _log.debug('last node ok')
-                        else:
-                            _log.debug('last node not ok')
-                            if len(simpleEdges) > 0:
-                                simpleEdges.pop()
-                                nodes.pop()
-
-                        # Check if the first node occurs in the other nodes
-                        # again and could maybe close the circle
-                        if nodes[0] in nodes[1:]:
-                            _log.debug('first node ok')
-                        else:
-                            _log.debug('first node not ok')
-                            if len(simpleEdges) > 0:
-                                simpleEdges.pop(0)
-                                nodes.pop(0)
-
-                    # The list of simple edges now should like that:
-                    # [ok ok ok ok ok ok]
-                    # Check that the cycled could really be closed and that it
-                    # is not empty
-                    if len(simpleEdges) > 0 and \
-                            simpleEdges[-1].endNode \
-                            == simpleEdges[0].startNode:
-                        _log.debug('Found complete simple face')
-                    else:
-                        _log.error('Simple face cannot be built.')
-                        if num == 50:
-                            _log.error('Reached iteration limit')
-                        if len(simpleEdges) == 0 or len(nodes) == 0:
-                            _log.error(
-                                'Removed all simple edges while trying to ' +
-                                'close the cycle of edges: {} in face {}'
-                                .format(', '.
-                                        join([se for se in subEdges]),
-                                        self.info_text))
-                            self.delete()
 
                     # Find all real edges to define real Face
                     for e in subEdges:
@@ -476,8 +448,11 @@ class Face(BaseFace, Cell):
                         # this is a geometrical edge, otherwise it is a real
                         # edge
                         if e not in allEdges and not e.is_geometrical:
-                            me = -e
-                            if me in allEdges:
+                            # A reversed edge that does not exist yet cannot
+                            # be in the list, so it is not created here
+                            me = e.my_reverse if e.is_reverse \
+                                else e.existing_reverse
+                            if me is not None and me in allEdges:
                                 allEdges.remove(me)
                                 try:
                                     e.is_geometrical = True
@@ -514,6 +489,7 @@ class Face(BaseFace, Cell):
                             self.__simpleFaces.append(
                                 SimpleFace(localSimpleEdges,
                                            belongsTo=self,
+                                           calcGeometry=calcGeometry,
                                            label_suffix='('
                                            + an.alphaNum(num)
                                            + ')'))
@@ -552,6 +528,7 @@ class Face(BaseFace, Cell):
                                 self.__simpleFaces.append(
                                     SimpleFace(localSimpleEdges,
                                                belongsTo=self,
+                                               calcGeometry=calcGeometry,
                                                label_suffix='('
                                                + an.alphaNum(num)
                                                + ')'))
@@ -567,6 +544,7 @@ class Face(BaseFace, Cell):
                             self.__simpleFaces.append(
                                 SimpleFace(localSimpleEdges,
                                            belongsTo=self,
+                                           calcGeometry=calcGeometry,
                                            label_suffix='('
                                            + an.alphaNum(num)
                                            + ')'))
@@ -606,6 +584,7 @@ class Face(BaseFace, Cell):
                                                 ge2.simpleEdges[0],
                                                 -ge1.simpleEdges[0]],
                                                belongsTo=self,
+                                               calcGeometry=calcGeometry,
                                                label_suffix='('
                                                + an.alphaNum(num) + ')'))
 
@@ -617,9 +596,27 @@ class Face(BaseFace, Cell):
                                             ge2.simpleEdges[0],
                                             -ge1.simpleEdges[0]],
                                            belongsTo=self,
+                                           calcGeometry=calcGeometry,
                                            label_suffix='('
                                            + an.alphaNum(num)+')'))
 
+                        # Fan Triangulation
+                        # -------------------------------
+                        elif self.__triangulationMethod == 'fan':
+
+                            if self.__materializeTriangulation:
+                                num = self.__fanSimpleFaces(simpleEdges, num,
+                                                            calcGeometry)
+                            else:
+                                self.__simpleFaces.append(
+                                    SimpleFace(simpleEdges,
+                                               belongsTo=self,
+                                               calcGeometry=calcGeometry,
+                                               label_suffix='('
+                                               + an.alphaNum(num)
+                                               + ')'))
+                                num += 1
+
                         else:
                             _log.error('Unknown triangulation method')
 
@@ -627,6 +624,7 @@ class Face(BaseFace, Cell):
                         self.__simpleFaces.append(
                             SimpleFace(simpleEdges,
                                        belongsTo=self,
+                                       calcGeometry=calcGeometry,
                                        label_suffix='('+an.alphaNum(num)+')'))
                         num += 1
                 else:
@@ -661,7 +659,9 @@ class Face(BaseFace, Cell):
 #                    for e in group:
                     if e.is_reverse:
                         e = -e
-                    if e not in allEdges and -e not in allEdges  \
+                    me = e.existing_reverse
+                    if e not in allEdges \
+                            and (me is None or me not in allEdges) \
                             and e not in self.__geometricEdges:
                         self.__geometricEdges.append(e)
 
@@ -684,8 +684,171 @@ class Face(BaseFace, Cell):
             self.__edges = []
             self.__topologicNodes = []
 
+        # Only report edges that really changed, not the ones that were
+        # removed and added again
+        for e in set(oldEdges).symmetric_difference(self.__edges):
+            cell_events.boundary_changed(self, e)
+
         self.geometryChanged = False
 
+# ------------------------------------------------------------------------
+#    Chain the simple edges of some edges to a closed cycle
+# ------------------------------------------------------------------------
+    def __assembleCycle(self, subEdges, num):
+        '''
+        Chains the simple edges of the given edges. Every edge is attached
+        where one of its simple edges starts at the end of the simple edges
+        found so far, simple edges behind this point are dropped. Then the
+        open ends are cut off until the cycle is closed. Node to position
+        maps are used, so that the work is linear in the number of simple
+        edges.
+
+        :return: List of simple edges and list of their nodes, where the
+            first node is repeated at the end if the cycle is closed
+
+        '''
+        # Add all simple Edges of first raw edge of this set
+        _log.debug('Starting with edge {}'.format(subEdges[0]))
+        simpleEdges = list(subEdges[0].simpleEdges)
+
+        # Go through the other raw Edges of this set
+        for e in subEdges[1:]:
+            _log.debug("Adding edge %s", e)
+
+            # First simple edge of the new edge that starts in each node
+            startPositions = {}
+            for (j, se) in enumerate(e.simpleEdges):
+                startPositions.setdefault(se.startNode, j)
+
+            # Go back until a simple edge is found where the new edge can
+            # be attached, dropping the simple edges behind it
+            while simpleEdges and \
+                    simpleEdges[-1].endNode not in startPositions:
+                _log.debug('removing')
+                simpleEdges.pop()
+            if simpleEdges:
+                j = startPositions[simpleEdges[-1].endNode]
+                simpleEdges += e.simpleEdges[j:]
+
+        if not simpleEdges:
+            return ([], [])
+
+        # The list of simple edges now looks like that:
+        # [? ? ok ok ok ok ? ? ?]
+        nodes = [simpleEdges[0].startNode, ]
+        for se in simpleEdges:
+            nodes.append(se.endNode)
+        _log.debug(
+            'Nodes before cutting first and last simple edges ' +
+            'in subface {} of face {}: {}'
+            .format(an.alphaNum(num),
+                    self.info_text,
+                    ', '.join(str(n) for n in nodes)))
+
+        # Start and end of this list still has to be adjusted. An end can be
+        # cut off if its node does not occur again, because then it cannot
+        # close the cycle
+        numOccurrences = {}
+        for n in nodes:
+            numOccurrences[n] = numOccurrences.get(n, 0) + 1
+        first = 0
+        last = len(simpleEdges)
+        while last > first and \
+                simpleEdges[last-1].endNode != simpleEdges[first].startNode:
+            cut = False
+            if numOccurrences[nodes[last]] < 2:
+                _log.debug('last node not ok')
+                numOccurrences[nodes[last]] -= 1
+                last -= 1
+                cut = True
+            if last > first and numOccurrences[nodes[first]] < 2:
+                _log.debug('first node not ok')
+                numOccurrences[nodes[first]] -= 1
+                first += 1
+                cut = True
+            if not cut:
+                break
+        simpleEdges = simpleEdges[first:last]
+        nodes = nodes[first:last+1]
+
+        # The list of simple edges now should like that:
+        # [ok ok ok ok ok ok]
+        # Check that the cycled could really be closed and that it is not
+        # empty
+        if len(simpleEdges) > 0 and \
+                simpleEdges[-1].endNode == simpleEdges[0].startNode:
+            _log.debug('Found complete simple face')
+        else:
+            _log.error('Simple face cannot be built.')
+            if len(simpleEdges) == 0:
+                _log.error(
+                    'Removed all simple edges while trying to ' +
+                    'close the cycle of edges: {} in face {}'
+                    .format(', '.join(str(e) for e in subEdges),
+                            self.info_text))
+                self.delete()
+                return ([], [])
+
+        return (simpleEdges, nodes)
+
+# ------------------------------------------------------------------------
+#    Fan triangulation
+# ------------------------------------------------------------------------
+    def __fanSimpleFaces(self, simpleEdges, num, calcGeometry):
+        '''
+        Splits a closed cycle of simple edges into triangles around the start
+        node of the first simple edge. The diagonals are created as geometric
+        edges.
+
+        :return: The next free number for the label of a simple face
+
+        '''
+        numTriangles = len(simpleEdges)-2
+        diagonal = None
+        for i in range(numTriangles):
+            if i == 0:
+                first = simpleEdges[0]
+            else:
+                first = -diagonal.simpleEdges[0]
+            if i == numTriangles-1:
+                last = simpleEdges[-1]
+            else:
+                diagonal = Edge(simpleEdges[i+1].endNode,
+                                simpleEdges[0].startNode,
+                                is_geometrical=True)
+                last = diagonal.simpleEdges[0]
+            self.__simpleFaces.append(
+                SimpleFace([first, simpleEdges[i+1], last],
+                           belongsTo=self,
+                           calcGeometry=calcGeometry,
+                           label_suffix='(' + an.alphaNum(num) + ')'))
+            num += 1
+        return num
+
+    def __calcTriangles(self):
+        nodeIndex = {}
+        triangles = []
+        for sf in self.__simpleFaces:
+            indices = [nodeIndex.setdefault(n, len(nodeIndex))
+                       for n in sf.nodes]
+            for i in range(1, len(indices)-1):
+                triangles.append((indices[0], indices[i], indices[i+1]))
+        self.__triangleNodes = list(nodeIndex)
+        self.__triangles = np.array(triangles, dtype=int).reshape(-1, 3)
+
+    def materializeTriangulation(self):
+        '''
+        Creates the geometric edges of a face with the triangulation method
+        'fan', so that every triangle in :attr:`triangles` becomes a simple
+        face of its own, e.g. before exporting the face to TikZ. Nothing
+        changes for the other triangulation methods.
+
+        '''
+        if self.__triangulationMethod == 'fan' and \
+                not self.__materializeTriangulation:
+            self.__materializeTriangulation = True
+            self.setUp()
+
 # ------------------------------------------------------------------------
 #    Update geometry
 # ------------------------------------------------------------------------
@@ -58,7 +58,7 @@ class ReversedFace(BaseFace, ReversedCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -222,8 +222,11 @@ class ReversedFace(BaseFace, ReversedCell):
                 'from reversed face {} '.format(self.info_text) +
                 'because it does not belong to a face')
 
-    def setUp(self):
-        self.my_reverse.setUp()
+    def setUp(self, calcGeometry=True):
+        self.my_reverse.setUp(calcGeometry)
+
+    def materializeTriangulation(self):
+        self.my_reverse.materializeTriangulation()
 
 
 # =============================================================================
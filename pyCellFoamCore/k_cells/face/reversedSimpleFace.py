@@ -50,11 +50,10 @@ class ReversedSimpleFace(BaseSimpleFace, ReversedSimpleCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ('__coordinates',
-#                 '__nodes',
-#                 '__normalVec',
-#                 '__area')
-#
+    __slots__ = ('__coordinates',
+                 '__nodes',
+                 '__normalVec',
+                 '__area')
 
 # =============================================================================
 #    INITIALIZATION
@@ -134,6 +133,24 @@ class ReversedSimpleFace(BaseSimpleFace, ReversedSimpleCell):
             return []
     simpleEdges = property(__getSimpleEdges)
 
+# =============================================================================
+#    METHODS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Forget the geometry taken from the simple face
+# ------------------------------------------------------------------------
+    def resetGeometry(self):
+        '''
+        Called when the geometry of the simple face has been recalculated.
+        The coordinates, area and normal vector are taken from the simple
+        face again when they are needed the next time.
+
+        '''
+        self.__coordinates = None
+        self.__area = None
+        self.__normalVec = None
+
 #    def __getEdges(self):
 #        edges = []
 #        for e in self.data.edges:
@@ -50,9 +50,8 @@ import numpy as np
 from pyCellFoamCore.k_cells.face.reversedSimpleFace import ReversedSimpleFace
 from pyCellFoamCore.k_cells.face.baseSimpleFace import BaseSimpleFace
 from pyCellFoamCore.k_cells.cell.simple_cell import SimpleCell
+from pyCellFoamCore.k_cells.face.simple_face_geometry import fan_geometry
 import pyCellFoamCore.tools.colorConsole as cc
-import math
-from scipy.spatial import ConvexHull
 
 from pyCellFoamCore.k_cells.node.node import Node
 from pyCellFoamCore.k_cells.edge.edge import Edge
@@ -83,38 +82,37 @@ class SimpleFace(BaseSimpleFace, SimpleCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ('__simpleEdges',
-#                 '__coordinates',
-#                 '__barycenter',
-#                 '__normalVec',
-#                 '__polygon',
-#                 '__area',
-#                 '__nodes')
+    __slots__ = ('__simpleEdges',
+                 '__coordinates',
+                 '__barycenter',
+                 '__normalVec',
+                 '__polygon',
+                 '__area',
+                 '__nodes')
 
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
-    def __init__(self, simpleEdges, *args, belongsTo=None, **kwargs):
+    def __init__(self, simpleEdges, *args, belongsTo=None, calcGeometry=True,
+                 **kwargs):
         '''
+        :param bool calcGeometry: If False, the normal vector, area and
+            barycenter are not calculated. They must be set later, e.g. by
+            :func:`simple_face_geometry.update_simple_faces`.
 
         '''
-        if belongsTo is None:
-            belongsToRev = None
-        else:
-            belongsToRev = belongsTo.my_reverse
         super().__init__(*args,
-                         my_reverse=ReversedSimpleFace(my_reverse=self,
-                                                      belongsTo=belongsToRev),
                          belongsTo=belongsTo,
                          **kwargs)
         self.__simpleEdges = simpleEdges
         self.__normalVec = None
+        self.__area = None
+        self.__barycenter = None
         if len(self.__simpleEdges) > 2:
             if self.__checkContinuity(self.__simpleEdges):
                 self.__createCoordinates()
-                self.__checkPlane()
-                self.__calcArea()
-                self.__calcBarycenter()
+                if calcGeometry:
+                    self.__calcGeometry()
 
                 for se in self.simpleEdges:
                     se.addSimpleFace(self)
@@ -170,6 +168,17 @@ class SimpleFace(BaseSimpleFace, SimpleCell):
 #    METHODS
 # =============================================================================
 
+# ------------------------------------------------------------------------
+#    Create the reversed simple face
+# ------------------------------------------------------------------------
+    def create_reverse(self):
+        '''
+        The reversed simple face is created when it is needed for the first
+        time.
+
+        '''
+        return ReversedSimpleFace(my_reverse=self)
+
 # ------------------------------------------------------------------------
 #    Check if the given edges form a closed cycle
 # ------------------------------------------------------------------------
@@ -220,160 +229,54 @@ class SimpleFace(BaseSimpleFace, SimpleCell):
         _log.debug('Created Coordinates')
 
 # ------------------------------------------------------------------------
-#    Check if the given nodes lay in the same plane
+#    Calculate normal vector, area and barycenter
 # ------------------------------------------------------------------------
-    def __checkPlane(self):
-        inPlane = True
-        tol = 1E-4
-        o = self.__coordinates[0]
-        x = self.__coordinates[1]
-
-        # If first three coordinates are in one line, choose another coordinate
-        # to calculate the normal vector. Keep searching, when its still the
-        # case
-        count = 0
-        vec0 = np.array([0, 0, 0])
-        while count < len(self.__coordinates) - 2 and \
-                np.linalg.norm(vec0) < tol:
-            y = self.__coordinates[count+2]
-            vec0 = np.cross(x-o, y-o)
-            _log.debug('vec1: {} x vec2: {} = vec0: {}'
-                              .format(x-o, y-o, vec0))
-            count += 1
-
-        if np.linalg.norm(vec0) > tol:
-            vec0 = vec0/np.linalg.norm(vec0)
-            self.__normalVec = vec0
-        else:
-            self.__normalVec = np.array([0, 0, 0])
-            _log.error('Could not find a valid normal vector for {}'
-                              .format(self))
-
-        # Go through all triangles
-        for x, y in zip(self.__coordinates[1:-1], self.__coordinates[2:]):
-            vec = np.cross(x-o, y-o)
-            # If vec is close to zero, the two vectors are close to beeing
-            # parallel thereofore they also must lie in the same plane
-            if np.linalg.norm(vec) > tol:
-                vec = vec/np.linalg.norm(vec)
-                if np.linalg.norm(vec-vec0) > tol \
-                        and np.linalg.norm(vec+vec0) > tol:
-                    inPlane = False
-                    _log.error('Simple face {} is not a plane'
-                                      .format(self))
-
-        # return result
-        _log.debug('Checked planarity')
-
-        _log.debug('SimpleFace: Checking for convexity')
-        v1 = np.array([0, 0, 1])
-        v2 = self.__normalVec
-        angle = np.arccos(np.dot(v1, v2) /
-                          (np.linalg.norm(v1) * np.linalg.norm(v2)))
-        _log.debug('Angle between normal vector and z direction: {}'
-                          .format(360*angle/math.tau))
-        axis = np.cross(v1, v2)
-        _log.debug('Axis for rotation: {}'.format(axis))
-        if np.linalg.norm(axis) < self.tolerance:
-            rot = np.eye(3)
-            _log.debug('No rotation needed')
-        else:
-            rot = self.__rotationMatrix(-angle, axis)
-            _log.debug('Rotating with rotation matrix:\r\n {}'
-                              .format(rot))
-
-        localCoordinates3D = (rot @ self.__coordinates.transpose()).transpose()
-#        cc.printYellow('Local coordinates with 3rd dimension:')
-#        cc.printYellow(localCoordinates3D)
-        localCoordiantes2D = localCoordinates3D[:, 0:2]
-#        cc.printYellow('Local coordiantes in 2D:')
-#        cc.printYellow(localCoordiantes2D)
-        try:
-            hull = ConvexHull(localCoordiantes2D)
-        except Exception as e:
-            _log.error(
-                'Cannot caculate convex hull for simpleface {} in face {}.'
-                .format(self, self.belongs_to) +
-                'Error: {}'.format(e))
-            hull = False
-
-        if hull:
-            hull.vertices.sort()
-            convexHullPoints = localCoordinates3D[hull.vertices]
-            o = convexHullPoints[0]
-            x = convexHullPoints[1]
-
-            count = 0
-            vec0 = np.array([0, 0, 0])
-            while count < len(convexHullPoints)-2 and \
-                    np.linalg.norm(vec0) < tol:
-                y = convexHullPoints[count+2]
-                vec0 = np.cross(x-o, y-o)
-                _log.debug('vec1: {} x vec2: {} = vec0: {}'
-                                  .format(x-o, y-o, vec0))
-                count += 1
-
-            if np.linalg.norm(vec0) > tol:
-                vec0 = vec0/np.linalg.norm(vec0)
-                comparisonNormalVec = vec0
-            else:
-                comparisonNormalVec = np.array([0, 0, 0])
-                _log.error(
-                    'Could not find a valid normal vector of the convex  ' +
-                    'hull for {}'.format(self))
-
-            comparisonNormalVec = rot.transpose() @ comparisonNormalVec
-            if np.linalg.norm(self.__normalVec - comparisonNormalVec) > \
-                    self.tolerance:
-                self.__normalVec = -self.__normalVec
-                _log.debug('Turning normal vector around')
-
-            if np.linalg.norm(self.__normalVec - comparisonNormalVec) > \
-                    self.tolerance:
-                _log.error('Cannot find correct normal vector')
-            else:
-                _log.debug('Found hopefully correct normal vector')
-
-        return inPlane
+    def __calcGeometry(self):
+        offsets = np.array([0, len(self.__coordinates)])
+        (triangleAreas, _, areas, normals, barycenters, deviations) = \
+            fan_geometry(self.__coordinates, offsets, self.tolerance)
+        self.set_geometry(self.__coordinates,
+                          normals[0],
+                          [list(triangleAreas), areas[0]],
+                          barycenters[0],
+                          deviations[0])
 
 # ------------------------------------------------------------------------
-#    Calculate area
+#    Store the geometry
 # ------------------------------------------------------------------------
-    def __calcArea(self):
-        o = self.__coordinates[0]
-        areas = []
-        totalArea = 0
-        for x, y in zip(self.coordinates[1:-1], self.coordinates[2:]):
-            area = 1/2*np.linalg.norm(np.cross(x-o, y-o))
-            totalArea += area
-            areas.append(area)
-
-        self.__area = [areas, totalArea]
-        if totalArea < self.tolerance:
-            _log.error('{}: area is close to zero or negative: {}'
-                              .format(self.info_text, totalArea))
-        _log.debug('Calculated area')
+    def set_geometry(self, coordinates, normalVec, area, barycenter,
+                     deviation=0):
+        '''
+        Stores geometry that has been calculated by the functions in
+        :mod:`simple_face_geometry`, possibly for many simple faces at once.
+        The reversed simple face takes the new values from this simple face.
 
-# ------------------------------------------------------------------------
-#    Calculate barycenter
-# ------------------------------------------------------------------------
-    def __calcBarycenter(self):
-        if self.area[1] > self.tolerance:
-            o = self.__coordinates[0]
-            barycenter = np.array([0., 0., 0.])
-            for x, y, a in zip(self.__coordinates[1:-1],
-                               self.__coordinates[2:],
-                               self.__area[0]):
-                barycenter += (o+x+y)/3*a
-
-            self.__barycenter = barycenter/self.area[1]
-            _log.debug('Calculated barycenter')
-        else:
-            self.__barycenter = np.array([0, 0, 0])
+        :param coordinates: Coordinates of the nodes
+        :param normalVec: Unit normal vector, zero if none was found
+        :param list area: Areas of the triangles and the total area
+        :param barycenter: Barycenter, zero if the area is too small
+        :param float deviation: Deviation from a plane
+
+        '''
+        self.__coordinates = coordinates
+        self.__normalVec = normalVec
+        self.__area = area
+        self.__barycenter = barycenter
+
+        if np.linalg.norm(normalVec) < self.tolerance:
+            _log.error('Could not find a valid normal vector for {}'
+                       .format(self))
+        elif deviation > self.tolerance:
+            _log.error('Simple face {} is not a plane'.format(self))
+        if area[1] < self.tolerance:
+            _log.error('{}: area is close to zero or negative: {}'
+                       .format(self.info_text, area[1]))
             _log.error('Cannot calculate barycenter ' +
-                              'of {} because the area is too small, '
-                              .format(self) +
-                              'it is only {}'.format(self.area[1]))
+                       'of {} because the area is too small, '.format(self) +
+                       'it is only {}'.format(area[1]))
+
+        if self.existing_reverse is not None:
+            self.existing_reverse.resetGeometry()
 
 # ------------------------------------------------------------------------
 #    Delete the entire simple face
@@ -383,36 +286,6 @@ class SimpleFace(BaseSimpleFace, SimpleCell):
             se.delSimpleFace(self)
         super().delete()
 
-    def __rotationMatrix(self, angle, axis):
-        a = angle
-        n = axis
-        cos = math.cos
-        sin = math.sin
-        if np.linalg.norm(n) < self.tolerance:
-            _log.error('Cannot find rotation matrix')
-            return np.eye(3)
-        else:
-            n = n/np.linalg.norm(n)
-            n1 = n[0]
-            n2 = n[1]
-            n3 = n[2]
-            return np.array([
-                    [
-                        n1**2*(1-cos(a))+cos(a),
-                        n1*n2*(1-cos(a))-n3*sin(a),
-                        n1*n3*(1-cos(a))+n2*sin(a)
-                    ],
-                    [
-                        n2*n1*(1-cos(a))+n3*sin(a),
-                        n2**2*(1-cos(a))+cos(a),
-                        n2*n3*(1-cos(a))-n1*sin(a)
-                    ],
-                    [
-                        n3*n1*(1-cos(a))-n2*sin(a),
-                        n3*n2*(1-cos(a))+n1*sin(a),
-                        n3**2*(1-cos(a))+cos(a)
-                    ]])
-
 
 # =============================================================================
 #    TEST FUNCTIONS
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+# SIMPLE FACE GEOMETRY
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 17:12:36 2026
+
+"""
+Geometry of many simple faces at once.
+
+The corners of all polygons are stored in one array of coordinates. The
+polygon i consists of the rows ``offsets[i]`` to ``offsets[i+1]-1``, like the
+index pointer of a CSR matrix. Every polygon is split into a fan of triangles
+around its first corner, and all triangles are processed together. Large
+tables can be split into chunks of whole polygons that are processed in a
+pool of processes, see :func:`pool_map`.
+
+"""
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import concurrent.futures
+import logging
+
+# ------------------------------------------------------------------------
+#    Third-Party Libraries
+# ------------------------------------------------------------------------
+import numpy as np
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    POLYGON ARRAYS
+# =============================================================================
+
+def polygon_arrays(simple_faces):
+    """
+    Collects the current coordinates of the nodes of the given simple faces.
+
+    :param list simple_faces: Simple faces with at least three nodes each
+    :return: Array of coordinates with one row per node and array of offsets
+        with one entry more than there are simple faces
+
+    """
+    counts = np.fromiter((len(sf.nodes) for sf in simple_faces),
+                         dtype=np.int64, count=len(simple_faces))
+    offsets = np.zeros(len(simple_faces)+1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    coordinates = np.array([n.coordinates for sf in simple_faces
+                            for n in sf.nodes], dtype=float)
+    return (coordinates.reshape(-1, 3), offsets)
+
+
+# =============================================================================
+#    FAN TRIANGULATION
+# =============================================================================
+
+def fan_triangles(coordinates, offsets):
+    """
+    Splits all polygons into fans of triangles around their first corner.
+
+    :param coordinates: Array of shape (n, 3)
+    :param offsets: Array of length m+1 for m polygons, every polygon must
+        have at least three corners
+    :return: A tuple with
+
+        * the index of the polygon of every triangle
+        * the offsets of the triangles of every polygon
+        * three arrays with the corners of all triangles, the first one is
+          the first corner of the polygon
+
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    num_triangles = np.diff(offsets) - 2
+    triangle_offsets = np.zeros(len(num_triangles)+1, dtype=np.int64)
+    np.cumsum(num_triangles, out=triangle_offsets[1:])
+
+    polygon = np.repeat(np.arange(len(num_triangles)), num_triangles)
+    local = np.arange(triangle_offsets[-1]) - triangle_offsets[polygon]
+    o = coordinates[offsets[polygon]]
+    x = coordinates[offsets[polygon] + local + 1]
+    y = coordinates[offsets[polygon] + local + 2]
+    return (polygon, triangle_offsets, o, x, y)
+
+
+def fan_geometry(coordinates, offsets, tol=1E-4):
+    """
+    Calculates the geometry of all polygons.
+
+    The normal vector is the unit normal vector of the first triangle of the
+    fan whose area is not close to zero. It is turned around if it points
+    away from the side from which the corners are ordered counter-clockwise,
+    also if the polygon is not convex. The deviation from a plane is the
+    largest distance between the unit normal vector of a triangle and the
+    normal vector of the polygon (or its negative), triangles with an area
+    close to zero are ignored.
+
+    :param coordinates: Array of shape (n, 3)
+    :param offsets: Array of length m+1 for m polygons, every polygon must
+        have at least three corners
+    :param float tol: Tolerance for zero vectors
+    :return: A tuple with
+
+        * the areas of all triangles, ordered by polygon
+        * the offsets of the triangles of every polygon
+        * the area of every polygon
+        * the unit normal vector of every polygon, zero if none was found
+        * the barycenter of every polygon, zero if the area is too small
+        * the deviation of every polygon from a plane
+
+    """
+    (polygon, triangle_offsets, o, x, y) = fan_triangles(coordinates,
+                                                         offsets)
+    starts = triangle_offsets[:-1]
+
+    cross = np.cross(x-o, y-o)
+    length = np.linalg.norm(cross, axis=1)
+    triangle_areas = length/2
+    areas = np.add.reduceat(triangle_areas, starts)
+
+    unit = np.zeros_like(cross)
+    valid = length > tol
+    unit[valid] = cross[valid]/length[valid, None]
+
+    first = np.minimum.reduceat(
+        np.where(valid, np.arange(len(cross)), len(cross)), starts)
+    found = first < triangle_offsets[1:]
+    normals = np.zeros((len(starts), 3))
+    normals[found] = unit[first[found]]
+    orientation = np.einsum('ij,ij->i', normals,
+                            np.add.reduceat(cross, starts, axis=0))
+    normals[orientation < 0] *= -1
+
+    barycenters = np.add.reduceat((o+x+y)/3*triangle_areas[:, None],
+                                  starts, axis=0)
+    valid = areas > tol
+    barycenters[valid] /= areas[valid, None]
+    barycenters[~valid] = 0
+
+    valid = length > tol
+    n = normals[polygon]
+    distance = np.minimum(np.linalg.norm(unit-n, axis=1),
+                          np.linalg.norm(unit+n, axis=1))
+    distance[~valid] = 0
+    deviations = np.maximum.reduceat(distance, starts)
+
+    return (triangle_areas, triangle_offsets, areas, normals, barycenters,
+            deviations)
+
+
+# =============================================================================
+#    PROCESS POOL
+# =============================================================================
+
+def pool_map(function, chunks, processes):
+    """
+    Calls the function for every chunk in a pool of processes. The function
+    must only work on arrays, k-cells cannot be handed to other processes.
+
+    :param function: Function defined at module level
+    :param list chunks: Tuples of arguments, one for every call
+    :param int processes: Number of processes
+    :return: List with the results in the order of the chunks
+
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) \
+            as pool:
+        return list(pool.map(function, *zip(*chunks)))
+
+
+def fan_geometry_chunked(coordinates, offsets, tol=1E-4, processes=None):
+    """
+    Same as :func:`fan_geometry`, but the polygons are split into chunks with
+    about the same number of corners, which are calculated in a pool of
+    processes.
+
+    :param int processes: Number of processes. If not given or if there are
+        fewer polygons than processes, everything is calculated here.
+
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if processes is None or processes < 2 or len(offsets)-1 < processes:
+        return fan_geometry(coordinates, offsets, tol)
+
+    bounds = np.searchsorted(
+        offsets, np.linspace(0, offsets[-1], processes+1)[1:-1])
+    bounds = np.unique(np.concatenate(([0], bounds, [len(offsets)-1])))
+    chunks = [(coordinates[offsets[p0]:offsets[p1]],
+               offsets[p0:p1+1]-offsets[p0],
+               tol)
+              for (p0, p1) in zip(bounds[:-1], bounds[1:])]
+    results = pool_map(fan_geometry, chunks, processes)
+
+    # Shift the offsets of the triangles of every chunk
+    shifts = np.cumsum([0]+[len(r[0]) for r in results])
+    triangle_offsets = np.concatenate(
+        [r[1][:-1]+shift for (r, shift) in zip(results, shifts)]
+        + [shifts[-1:]])
+    return (np.concatenate([r[0] for r in results]),
+            triangle_offsets,
+            np.concatenate([r[2] for r in results]),
+            np.concatenate([r[3] for r in results]),
+            np.concatenate([r[4] for r in results]),
+            np.concatenate([r[5] for r in results]))
+
+
+# =============================================================================
+#    UPDATE SIMPLE FACES
+# =============================================================================
+
+def update_simple_faces(simple_faces, tol=1E-4, processes=None):
+    """
+    Recalculates the geometry of the given simple faces from the current
+    coordinates of their nodes, e.g. after nodes have been moved. The
+    topology of the simple faces is not changed.
+
+    :param list simple_faces: Non-reversed simple faces
+    :param int processes: Number of processes, see
+        :func:`fan_geometry_chunked`
+
+    """
+    simple_faces = [sf for sf in simple_faces if len(sf.nodes) > 2]
+    if not simple_faces:
+        return
+    (coordinates, offsets) = polygon_arrays(simple_faces)
+    (triangle_areas, triangle_offsets, areas, normals, barycenters,
+     deviations) = fan_geometry_chunked(coordinates, offsets, tol,
+                                        processes)
+    for (k, sf) in enumerate(simple_faces):
+        sf.set_geometry(
+            coordinates[offsets[k]:offsets[k+1]],
+            normals[k],
+            [list(triangle_areas[triangle_offsets[k]:triangle_offsets[k+1]]),
+             areas[k]],
+            barycenters[k],
+            deviations[k])
@@ -113,7 +113,7 @@ class DualNode2D(Node, DualCell):
 # =============================================================================
 #    SLOTS
 # =============================================================================
-#    __slots__ = ()
+    __slots__ = ()
 
 # =============================================================================
 #    INITIALIZATION
@@ -143,12 +143,17 @@ class DualNode2D(Node, DualCell):
                  face,
                  *args,
                  volume=None,
+                 coordinates=None,
                  **kwargs):
         '''
         :param Face face: Primal face to which a 2D dual is wanted to be
             calculated
         :param Volume volume: If this dual node is generated as a special case
             of a higher dimension, the duality is stored also in the volume.
+        :param coordinates: Position of the dual node if it is already known,
+            e.g. from
+            :func:`~pyCellFoamCore.k_cells.node.dual_node_plan.plan_dual_nodes`.
+            The barycenter of the face is not calculated then.
 
 
         '''
@@ -174,11 +179,20 @@ class DualNode2D(Node, DualCell):
 
         _log.debug('Calculating 2D dual of {}'.format(face))
 
+# ------------------------------------------------------------------------
+#    Position already known
+# ------------------------------------------------------------------------
+
+        if coordinates is not None:
+            self.xCoordinate = coordinates[0]
+            self.yCoordinate = coordinates[1]
+            self.zCoordinate = coordinates[2]
+
 # ------------------------------------------------------------------------
 #    Standard-Case: One simple face
 # ------------------------------------------------------------------------
 
-        if len(face.barycenter) == 1:
+        elif len(face.barycenter) == 1:
             bc = face.barycenter[0]
 
             self.xCoordinate = bc[0]
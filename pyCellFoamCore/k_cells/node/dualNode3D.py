@@ -147,15 +147,18 @@ class DualNode3D(Node, DualCell):
 
         '''
         _log.debug("Creating dual Node 3D")
-        _log.debug("Number of additional border faces: {}".format(len([f for f in volume.faces if f.category1 == 'additionalBorder'])))
+        if volume.category1 == 'border':
+            additionalBorderFaces = [f for f in volume.faces
+                                     if f.category1 == 'additionalBorder']
+        else:
+            additionalBorderFaces = []
+        _log.debug("Number of additional border faces: %s",
+                   len(additionalBorderFaces))
 
 
-        if volume.category1 == 'border' and \
-            len([f for f in volume.faces
-                 if f.category1 == 'additionalBorder']) == 1:
-            additionalBorderFace = [f for f in volume.faces
-                                    if f.category1 == 'additionalBorder'][0]
-            _log.debug("Additional border face: {}".format(additionalBorderFace))
+        if len(additionalBorderFaces) == 1:
+            additionalBorderFace = additionalBorderFaces[0]
+            _log.debug("Additional border face: %s", additionalBorderFace)
 
             if len(additionalBorderFace.simpleFaces) == 1:
                 return DualNode2D(additionalBorderFace.simpleFaces[0].
@@ -220,6 +223,11 @@ class DualNode3D(Node, DualCell):
         else:
             return super(DualNode3D, cls).__new__(cls)
 
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ()
+
 # =============================================================================
 #    INITIALIZATION
 # =============================================================================
@@ -227,10 +235,15 @@ class DualNode3D(Node, DualCell):
     def __init__(self,
                  volume,
                  *args,
+                 coordinates=None,
                  **kwargs):
         '''
         :param Volume volume: Primal volume to which a 0D dual is wanted to be
             calculated
+        :param coordinates: Position of the dual node of an inner volume if it
+            is already known, e.g. from
+            :func:`~pyCellFoamCore.k_cells.node.dual_node_plan.plan_dual_nodes`.
+            The barycenter of the volume is not calculated then.
         :param _log.debug: alternate printing function to redirect debug
             messages.
         :param _log.error: alternate printing function to redirect error
@@ -248,7 +261,10 @@ class DualNode3D(Node, DualCell):
 # ------------------------------------------------------------------------
 #    Inner volume
 # ------------------------------------------------------------------------
-        if volume.category1 == 'inner':
+        if volume.category1 == 'inner' and coordinates is not None:
+            (x, y, z) = coordinates
+
+        elif volume.category1 == 'inner':
             x = volume.barycenter[0]
             y = volume.barycenter[1]
             z = volume.barycenter[2]
@@ -686,7 +702,7 @@ if __name__ == "__main__":
     f202.useCategory = 1
     f202.category1 = 'additionalBorder'
     for f in [f200, f201, f203]:
-        f.useCategory1 = 1
+        f.useCategory = 1
         f.category1 = 'inner'
 
     v200 = Volume([-f200, -f201, f202, f203], num=2)
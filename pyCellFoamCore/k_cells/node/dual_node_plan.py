@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+# DUAL NODE PLAN
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 22:10:47 2026
+
+"""
+Position of the 3D dual nodes of many volumes at once.
+
+The rules are the same as in :class:`DualNode3D`: the dual node of an inner
+volume lies in the barycenter of the volume. A border volume with one
+additional border face gets its dual node in the barycenter of this face if
+the face has one simple face, in the middle of the rim edge between the
+simple faces if it has two, and in the corner node if it has three.
+
+The volumes are first classified with arrays of categories. Then the
+barycenters of all volumes, the barycenters of all additional border faces
+and the middles of all rim edges are calculated together with the kernels of
+:mod:`volume_geometry` and :mod:`simple_face_geometry`. Only finding the rim
+edges and corner nodes is done face by face, because it depends on the
+topology of the few rim and corner volumes.
+
+Every volume gets a type code, which is the dimension of the primal cell the
+dual node is placed at. Volumes that do not fit any of the rules get the
+code :data:`DUAL_NODE_OTHER` and are left to :class:`DualNode3D`.
+
+When the primal nodes have been moved, :func:`dual_node_positions` calculates
+new positions for dual nodes that already exist, without changing which
+primal cell they are placed at.
+
+"""
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import logging
+
+# ------------------------------------------------------------------------
+#    Third-Party Libraries
+# ------------------------------------------------------------------------
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    Local Libraries
+# ------------------------------------------------------------------------
+
+#    kCells
+# -------------------------------------------------------------------
+from pyCellFoamCore.k_cells.node.dualNode0D import DualNode0D
+from pyCellFoamCore.k_cells.node.dualNode1D import DualNode1D
+from pyCellFoamCore.k_cells.node.dualNode2D import DualNode2D
+from pyCellFoamCore.k_cells.node.dualNode3D import DualNode3D
+from pyCellFoamCore.k_cells.face.simple_face_geometry import polygon_arrays
+from pyCellFoamCore.k_cells.face.simple_face_geometry import fan_geometry
+from pyCellFoamCore.k_cells.volume.volume_geometry import volume_geometry
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    TYPE CODES
+# =============================================================================
+
+DUAL_NODE_OTHER = -1
+'''The volume does not fit any rule, see :class:`DualNode3D`.'''
+
+DUAL_NODE_0D = 0
+'''The dual node lies in the corner node of the additional border face.'''
+
+DUAL_NODE_1D = 1
+'''The dual node lies in the middle of the rim edge.'''
+
+DUAL_NODE_2D = 2
+'''The dual node lies in the barycenter of the additional border face.'''
+
+DUAL_NODE_3D = 3
+'''The dual node lies in the barycenter of the volume.'''
+
+
+# =============================================================================
+#    PLAN
+# =============================================================================
+
+def plan_dual_nodes(volumes):
+    """
+    Classifies the volumes and calculates the positions of their dual nodes.
+
+    :param list volumes: Primal volumes
+    :return: A tuple with
+
+        * array of shape (n, 3) with the positions, NaN for
+          :data:`DUAL_NODE_OTHER`
+        * array with the type code of every volume
+        * list with the primal cell of every volume that the dual node is
+          placed at: the volume, the additional border face, the rim edge or
+          the corner node, None for :data:`DUAL_NODE_OTHER`
+
+    """
+    return _plan(volumes)[:3]
+
+
+def _plan(volumes):
+    '''
+    Same as :func:`plan_dual_nodes`, the additional border face of every
+    volume is returned as fourth entry.
+
+    '''
+    volumes = list(volumes)
+    num_volumes = len(volumes)
+    positions = np.full((num_volumes, 3), np.nan)
+    types = np.full(num_volumes, DUAL_NODE_OTHER, dtype=np.int64)
+    anchors = [None]*num_volumes
+    additional_faces = [None]*num_volumes
+    if not num_volumes:
+        return (positions, types, anchors, additional_faces)
+
+    # Classify with arrays of categories
+    face_lists = [v.faces for v in volumes]
+    faces = [f for fs in face_lists for f in fs]
+    owner = np.repeat(np.arange(num_volumes),
+                      [len(fs) for fs in face_lists])
+    categories = np.array([v.category1 for v in volumes])
+    additional = np.array([f.category1 == 'additionalBorder' for f in faces],
+                          dtype=bool)
+    num_additional = np.bincount(owner[additional], minlength=num_volumes)
+    additional_face = np.full(num_volumes, -1, dtype=np.int64)
+    additional_face[owner[additional]] = np.flatnonzero(additional)
+
+    types[categories == 'inner'] = DUAL_NODE_3D
+    single = np.flatnonzero((categories == 'border') & (num_additional == 1))
+    for k in single:
+        additional_faces[k] = faces[additional_face[k]]
+    num_simple_faces = np.array(
+        [len(additional_faces[k].simpleFaces) for k in single],
+        dtype=np.int64)
+
+    # Special cases in which DualNode2D and DualNode1D choose another
+    # position themselves are left to DualNode3D
+
+    # Border: barycenter of the additional border face
+    for k in single[num_simple_faces == 1]:
+        face = additional_faces[k].simpleFaces[0].belongs_to
+        if len([e for e in face.edges
+                if e.category == 'additionalBorder']) != 1:
+            types[k] = DUAL_NODE_2D
+            anchors[k] = face
+
+    # Rim: middle of the edge between the two simple faces
+    for k in single[num_simple_faces == 2]:
+        rim_edge = _rim_edge(additional_faces[k])
+        if rim_edge is not None and len(rim_edge.simpleEdges) == 1 and \
+                (rim_edge.startNode.category == 'additionalBorder') == \
+                (rim_edge.endNode.category == 'additionalBorder'):
+            types[k] = DUAL_NODE_1D
+            anchors[k] = rim_edge
+
+    # Corner: node between the three simple faces
+    for k in single[num_simple_faces == 3]:
+        corner_node = _corner_node(additional_faces[k])
+        if corner_node is not None:
+            types[k] = DUAL_NODE_0D
+            anchors[k] = corner_node
+
+    # Positions of all dual nodes of the same type together
+    inner = np.flatnonzero(types == DUAL_NODE_3D)
+    for k in inner:
+        anchors[k] = volumes[k]
+    if len(inner):
+        positions[inner] = volume_geometry([face_lists[k] for k in inner])[1]
+
+    border = np.flatnonzero(types == DUAL_NODE_2D)
+    if len(border):
+        simple_faces = [additional_faces[k].simpleFaces[0] for k in border]
+        (coordinates, offsets) = polygon_arrays(
+            [sf.my_reverse if sf.is_reverse else sf for sf in simple_faces])
+        positions[border] = fan_geometry(coordinates, offsets)[4]
+
+    rim = np.flatnonzero(types == DUAL_NODE_1D)
+    if len(rim):
+        ends = np.array([[anchors[k].startNode.coordinates,
+                          anchors[k].endNode.coordinates]
+                         for k in rim], dtype=float)
+        positions[rim] = (ends[:, 0]+ends[:, 1])/2
+
+    corner = np.flatnonzero(types == DUAL_NODE_0D)
+    if len(corner):
+        positions[corner] = [anchors[k].coordinates for k in corner]
+
+    return (positions, types, anchors, additional_faces)
+
+
+def _rim_edge(face):
+    '''
+    The only edge that is shared by both simple faces of the face, or None.
+
+    '''
+    edges1 = [se.belongs_to for se in face.simpleFaces[0].simpleEdges]
+    edges2 = set(se.belongs_to for se in face.simpleFaces[1].simpleEdges)
+    # The reverse of an edge can only be in the second face if it exists
+    shared = [-e if e.is_reverse else e for e in edges1
+              if (e.my_reverse if e.is_reverse else e.existing_reverse)
+              in edges2]
+    if len(shared) == 1:
+        return shared[0]
+    return None
+
+
+def _corner_node(face):
+    '''
+    The geometric node of the face that belongs to all of its geometric
+    edges, or None.
+
+    '''
+    geometricNodes = face.geometricNodes
+    if len(geometricNodes) == 1:
+        return geometricNodes[0]
+    possibleNodes = [n for n in geometricNodes
+                     if all(e.startNode == n or e.endNode == n
+                            for e in face.geometricEdges)]
+    if len(possibleNodes) == 1:
+        return possibleNodes[0]
+    return None
+
+
+# =============================================================================
+#    CREATE
+# =============================================================================
+
+def create_dual_nodes(volumes):
+    """
+    Creates the 3D dual nodes of the given volumes as planned by
+    :func:`plan_dual_nodes`. The planned positions are handed to the dual
+    nodes of inner volumes and border faces, so their barycenters are not
+    calculated again one by one. Volumes that do not fit any rule are handed
+    to :class:`DualNode3D`.
+
+    :param list volumes: Primal volumes
+    :return: List with the dual node of every volume
+
+    """
+    volumes = list(volumes)
+    (positions, types, anchors, additional_faces) = _plan(volumes)
+    dualNodes = []
+    for (volume, kind, anchor, face, position) in zip(volumes, types,
+                                                      anchors,
+                                                      additional_faces,
+                                                      positions):
+        if kind == DUAL_NODE_3D:
+            dualNodes.append(DualNode3D(volume, coordinates=position))
+        elif kind == DUAL_NODE_2D:
+            dualNodes.append(DualNode2D(anchor, volume=volume,
+                                        coordinates=position))
+        elif kind == DUAL_NODE_1D:
+            dualNodes.append(DualNode1D(anchor, face=face, volume=volume))
+        elif kind == DUAL_NODE_0D:
+            dualNodes.append(DualNode0D(anchor,
+                                        volume=volume,
+                                        face=face,
+                                        edge=[e for e in anchor.edges
+                                              if e.is_geometrical]))
+        else:
+            dualNodes.append(DualNode3D(volume))
+    return dualNodes
+
+
+# =============================================================================
+#    POSITIONS OF EXISTING DUAL NODES
+# =============================================================================
+
+def dual_node_positions(dualNodes):
+    """
+    Calculates the positions of existing dual nodes from the current
+    geometry of their primal cells, e.g. after primal nodes have been moved.
+    The rule of every dual node is given by its class and the primal cell it
+    is the dual of, so the topology of the dual complex is not changed.
+
+    :param list dualNodes: Dual nodes of the classes :class:`DualNode0D` to
+        :class:`DualNode3D`
+    :return: Array of shape (n, 3) with the positions, nodes without a rule
+        keep their current coordinates
+
+    """
+    positions = np.array([n.coordinates for n in dualNodes],
+                         dtype=float).reshape(-1, 3)
+    for (k, n) in enumerate(dualNodes):
+        if isinstance(n, DualNode0D):
+            position = n.dualCell0D.coordinates
+        elif isinstance(n, DualNode1D):
+            position = n.dualCell1D.barycenter[0]
+        elif isinstance(n, DualNode2D):
+            barycenters = n.dualCell2D.barycenter
+            position = barycenters[0] if len(barycenters) == 1 else None
+        elif isinstance(n, DualNode3D):
+            position = _volume_position(n.dualCell3D)
+        else:
+            position = None
+        if position is not None:
+            positions[k] = position
+    return positions
+
+
+def _volume_position(volume):
+    '''
+    Position of a :class:`DualNode3D`, following the rules of its
+    initialization.
+
+    '''
+    if volume.category1 == 'inner':
+        return volume.barycenter
+    if volume.category1 != 'border':
+        return None
+    faces = [f for f in volume.faces if f.category1 == 'additionalBorder']
+    if len(faces) != 1:
+        return volume.barycenter
+    face = faces[0]
+    if len(face.simpleFaces) == 1:
+        return face.barycenter[0]
+    if len(face.simpleFaces) == 2:
+        rim_edge = _rim_edge(face)
+        if rim_edge is not None:
+            return rim_edge.barycenter[0]
+    elif len(face.simpleFaces) == 3:
+        corner_node = _corner_node(face)
+        if corner_node is not None:
+            return corner_node.coordinates
+    return None
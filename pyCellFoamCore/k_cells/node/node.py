@@ -39,6 +39,7 @@ import plotly.graph_objects as go
 # -------------------------------------------------------------------
 from pyCellFoamCore.k_cells.cell.cell import Cell
 from pyCellFoamCore.k_cells.cell.base_cell import BaseCellPlotly
+from pyCellFoamCore.k_cells.cell import cell_events
 
 #    Tools
 # --------------------------------------------------------------------
@@ -68,6 +69,21 @@ class Node(Cell):
     '''
     nodeCount = 0
 
+    # ------------------------------------------------------------------------
+    #    Slots
+    # ------------------------------------------------------------------------
+    __slots__ = ('__coordinates',
+                 '__edges',
+                 '__connectedNodes',
+                 '__simpleEdges',
+                 '__radius',
+                 '__sphere',
+                 '__draw',
+                 '__tikZNodes',
+                 '__onBoundingBoxSides',
+                 '__projectedNode',
+                 '__projectionEdge')
+
     # ------------------------------------------------------------------------
     #    Initialization
     # ------------------------------------------------------------------------
@@ -123,10 +139,14 @@ class Node(Cell):
         self.__coordinates[1] = float(c[1])
         self.__coordinates[2] = float(c[2])
         self.updateGeometry()
+        cell_events.coordinates_changed(self)
 
     coordinates = property(__getCoordinates, __setCoordinates)
     '''
-    The x-, y- and z-coordinates of the node, in a numpy array.
+    The x-, y- and z-coordinates of the node, in a numpy array. Set the
+    coordinates with this property (or the single coordinates) instead of
+    changing the array in place, so complexes can update their coordinate
+    arrays.
 
     '''
 
@@ -137,6 +157,7 @@ class Node(Cell):
     def __setXCoordinate(self, x):
         self.__coordinates[0] = float(x)
         self.updateGeometry()
+        cell_events.coordinates_changed(self)
 
     xCoordinate = property(__getXCoordinate, __setXCoordinate)
     '''
@@ -151,6 +172,7 @@ class Node(Cell):
     def __setYCoordinate(self, y):
         self.__coordinates[1] = float(y)
         self.updateGeometry()
+        cell_events.coordinates_changed(self)
 
     yCoordinate = property(__getYCoordinate, __setYCoordinate)
     '''
@@ -163,6 +185,7 @@ class Node(Cell):
     def __setZCoordinate(self, z):
         self.__coordinates[2] = float(z)
         self.updateGeometry()
+        cell_events.coordinates_changed(self)
 
     zCoordinate = property(__getZCoordinate, __setZCoordinate)
     '''
@@ -620,6 +643,7 @@ class Node(Cell):
             self.__edges.append(edge)
             _log.debug('Added edge {} to node {}'
                              .format(edge.num, self.num))
+            cell_events.boundary_changed(edge, self)
 
             if not self.is_geometrical:
                 if edge.startNode == self and edge.endNode == self:
@@ -650,6 +674,7 @@ class Node(Cell):
             self.__edges.remove(edge)
             _log.debug('Removed edge {} from node {}'
                              .format(edge.num, self.num))
+            cell_events.boundary_changed(edge, self)
 
             if not self.is_geometrical:
                 if edge.startNode == self and edge.endNode == self:
@@ -677,11 +702,14 @@ class Node(Cell):
     def updateGeometry(self):
         '''
         Register the changed geometry in this node and in all connected edges.
+        Inside of :meth:`Complex3D.batch_geometry` the edges are updated when
+        the batch ends.
 
         '''
         _log.debug('Updating node {}'.format(self))
-        for e in self.__edges:
-            e.updateGeometry()
+        if not cell_events.defer_geometry_update(self):
+            for e in self.__edges:
+                e.updateGeometry()
         if self.__sphere:
             self.__sphere.update()
 
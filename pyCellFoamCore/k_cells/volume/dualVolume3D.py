@@ -79,21 +79,22 @@ class DualVolume3D(Volume,DualCell):
 #==============================================================================
 #    SLOTS
 #==============================================================================
-#    __slots__ = ('__facesTemp',
-#                 '__edgesTemp')
+    __slots__ = ('__facesTemp',
+                 '__edgesTemp')
 
 #==============================================================================
 #    INITIALIZATION
 #==============================================================================
-    def __init__(self,node,*args,**kwargs):
+    def __init__(self,node,*args,calcGeometry=True,**kwargs):
 
         '''
         This is the explanation of the __init__ method.
 
         All parameters should be listed:
 
-        :param int a: Some Number
-        :param str b: Some String
+        :param Node node: Primal node
+        :param bool calcGeometry: If False, the volume and the barycenter
+            must be calculated later, see :meth:`Volume.setUp`
 
         '''
 
@@ -213,7 +214,7 @@ class DualVolume3D(Volume,DualCell):
                 self.faces = unalignedFaces
 
 #            cc.printMagenta('DualVolume3D:',unalignedFaces)
-            self.setUp()
+            self.setUp(calcGeometry)
             if self.faces:
                 _log.info('Created dual volume of node {}'.format(node.info_text))
                 self.dualCell3D = node
@@ -24,6 +24,8 @@ beginning
 # ------------------------------------------------------------------------
 #    Standard Libraries
 # ------------------------------------------------------------------------
+import collections
+import heapq
 import logging
 
 # ------------------------------------------------------------------------
@@ -39,10 +41,12 @@ import plotly.graph_objects as go
 #    kCells
 # -------------------------------------------------------------------
 from pyCellFoamCore.k_cells.cell.cell import Cell
+from pyCellFoamCore.k_cells.cell import cell_events
 from pyCellFoamCore.k_cells.node.node import Node
 from pyCellFoamCore.k_cells.edge.edge import Edge
 from pyCellFoamCore.k_cells.face.face import Face
 from pyCellFoamCore.k_cells.face.baseFace import FacePlotly
+from pyCellFoamCore.k_cells.volume.volume_geometry import volume_geometry
 
 #    Tools
 # -------------------------------------------------------------------
@@ -65,6 +69,19 @@ class Volume(Cell):
 
     volumeCount = 0
 
+    # =========================================================================
+    #    SLOTS
+    # =========================================================================
+    __slots__ = ('__rawFaces',
+                 '__faces',
+                 '__facesTemp',
+                 '__unalignedFaces',
+                 '__volume',
+                 '__barycenter',
+                 '__showBarycenter',
+                 '__accept_incomplete_geometry',
+                 '__alignmentConflicts')
+
     # =========================================================================
     #    INITIALIZATION
     # =========================================================================
@@ -91,6 +108,7 @@ class Volume(Cell):
         self.__showBarycenter = True
         self.__unalignedFaces = unalignedFaces
         self.__accept_incomplete_geometry = accept_incomplete_geometry
+        self.__alignmentConflicts = []
         self.color =  tc.TUMRose()
         self.setUp()
         _log.info('Created volume {}'.format(self.info_text))
@@ -127,6 +145,9 @@ class Volume(Cell):
     def __setFaces(self,f):
         self.__rawFaces = f
         self.updateGeometry()
+        # The volume is set up lazily, so report the new faces right away
+        for face in set(self.__faces).symmetric_difference(f):
+            cell_events.boundary_changed(self, face)
     faces = property(__getFaces,__setFaces)
 
 
@@ -136,6 +157,21 @@ class Volume(Cell):
 
     def __getAlignFaces(self): return self.__alignFaces
     alignFaces = property(__getAlignFaces)
+
+    def __getAlignmentConflicts(self): return self.__alignmentConflicts
+    alignmentConflicts = property(__getAlignmentConflicts)
+    '''
+    Problems found when the faces were aligned during the last set up, empty
+    if all faces could be aligned. Every entry is a dictionary with the keys
+
+    * 'reason': 'orientation' (the face would have to be turned around and
+      not turned around at the same time), 'multiplicity' (the simple edge
+      belongs to more than two faces) or 'unreachable' (the face does not
+      share a simple edge with the other faces)
+    * 'face': the face as given when the volume was defined
+    * 'simpleEdge': the simple edge that caused the problem or None
+
+    '''
 #
 #
     def __get_category(self): return super().category
@@ -169,9 +205,17 @@ class Volume(Cell):
     #==========================================================================
 
 
-    def setUp(self):
+    def setUp(self,calcGeometry=True):
+        '''
+        :param bool calcGeometry: If False, the volume and the barycenter are
+            not calculated and the faces are not turned around. This must be
+            done later by :meth:`set_geometry`, e.g. for many volumes at once
+            with :func:`volume_geometry.update_volumes`.
+
+        '''
 #        cc.printGreen('Volume: setting up')
         # Remove this volume from all old faces
+        oldFaces = self.__faces
         for s in self.__faces:
             s.delVolume(self)
         # (Re-)create volume
@@ -180,16 +224,15 @@ class Volume(Cell):
 
         if self.__checkClosed(self.__rawFaces):
             self.__faces = self.__rawFaces
-            self.__calcVolume()
-            if self.__volume < 0:
-                newFaces = [-f for f in self.__faces]
-                _log.debug('{}: Faces pointed in the wrong direction'.format(self.info_text))
-                self.__faces = newFaces
-                self.__calcVolume()
+            if calcGeometry:
+                ((volume,),(barycenter,)) = volume_geometry([self.__faces])
+                self.__storeGeometry(volume,barycenter)
+            else:
+                self.__volume = None
+                self.__barycenter = None
 
             for s in self.__faces:
                 s.addVolume(self)
-            self.__calcBarycenter()
             self.geometryChanged = False
             _log.debug('Succesfully set up volume {}'.format(self.info_text))
 
@@ -207,6 +250,41 @@ class Volume(Cell):
         else:
             self.__faces = []
 
+        for f in set(oldFaces).symmetric_difference(self.__faces):
+            cell_events.boundary_changed(self, f)
+
+# ------------------------------------------------------------------------
+#    Store the geometry
+# ------------------------------------------------------------------------
+    def set_geometry(self,volume,barycenter):
+        '''
+        Stores the volume and the barycenter that have been calculated by
+        :func:`volume_geometry.volume_geometry`, possibly for many volumes at
+        once. If the volume is negative, the faces are turned around.
+
+        '''
+        oldFaces = self.__faces
+        if volume < 0:
+            for s in self.__faces:
+                s.delVolume(self)
+        self.__storeGeometry(volume,barycenter)
+        if volume < 0:
+            for s in self.__faces:
+                s.addVolume(self)
+            for f in set(oldFaces).symmetric_difference(self.__faces):
+                cell_events.boundary_changed(self, f)
+
+
+    def __storeGeometry(self,volume,barycenter):
+        if volume < 0:
+            _log.debug('{}: Faces pointed in the wrong direction'.format(self.info_text))
+            self.__faces = [-f for f in self.__faces]
+            volume = -volume
+        self.__volume = volume
+        self.__barycenter = barycenter
+        if volume < 1E-3 and self.__faces:
+            _log.error('{}: volume is close to zero or negative: {}'.format(self.info_text,volume))
+
 # ------------------------------------------------------------------------
 #    Delete the entire volume
 # ------------------------------------------------------------------------
@@ -245,251 +323,114 @@ class Volume(Cell):
 
 
     def __alignFaces(self):
-#        cc.printGreen('Volume: aligning faces')
-
-        faces = self.__rawFaces.copy()
-
-        myPrintDebug = _log.debug
-#        myPrintDebug = cc.printYellow
-        myPrintInfo = _log.info
-        myPrintError = _log.error
-
+        '''
+        Turns the raw faces around so that they have the same orientation as
+        the first face. Starting from the first face, the faces are visited
+        along shared simple edges, each face is oriented once. Two faces
+        that share a simple edge have the same orientation if they contain
+        it in opposite directions. As before, the face with the lowest
+        index among all faces next to the aligned ones is added next.
 
-        simpleEdges = []
+        Problems are stored in :attr:`alignmentConflicts`.
 
-        # Check if the normal vector points outwards
-#            if np.dot(faces[0].simpleFaces[0].normalVec,node.coordinates-faces[0].simpleFaces[0].barycenter) > 0:
-#                cc.printGreen('{}: first face points in the right direction'.format(self.info_text))
-#            else:
-#                cc.printRed('{}: first face points in the wrong direction'.format(self.info_text))
+        '''
+        faces = self.__rawFaces
+        self.__alignmentConflicts = []
 
         # Do not do this if there are no faces
-        if faces:
-            for se in faces[0].simpleEdges:
-                simpleEdges.append(se)
-            facesForVolume = [faces[0],]
-            faces.pop(0)
-
-            myPrintDebug('Starting with edges {}'.format(simpleEdges))
-            count = 0
-            maxCount = 50
-
-            while len(faces) > 0 and count < maxCount:
-                count += 1
-                # Go through all faces that are not added yet
-                found = False
-                for f in faces:
-
-                    # Skip, if already found
-                    if not found:
-                        mf = -f
-
-                        myPrintDebug('Trying to add face {} with simple edges {}'.format(f.info_text,f.simpleEdges))
-
-                        # Go through all edges in current face
-                        for se in f.simpleEdges:
-                            # Skip, if already found
-                            if not found:
-                                mse = -se
-
-
-
-                            # If the current edge is in the found edges and not the reversed one, then the reversed face should be added
-                                if se in simpleEdges and not mse in simpleEdges:
-                                    myPrintDebug('Found shared simple Edge {}'.format(se.info_text))
-                                    found = True
-                                    facesForVolume.append(mf)
-                                    faces.remove(f)
-                                    for se in mf.simpleEdges:
-                                        simpleEdges.append(se)
-                                    myPrintDebug('Simple edges so far: {}'.format(simpleEdges))
-
-                                # If the reversed of the current edge is in the found edges, then the face should be added
-                                elif not se in simpleEdges and mse in simpleEdges:
-                                    myPrintDebug('Found shared simple Edge {}'.format(se.info_text))
-                                    found = True
-                                    facesForVolume.append(f)
-                                    faces.remove(f)
-                                    for se in f.simpleEdges:
-                                        simpleEdges.append(se)
-                                    myPrintDebug('Simple edges so far: {}'.format(simpleEdges))
-
-                                # Detect possible errors
-                                elif se in simpleEdges and mse in simpleEdges:
-                                    myPrintError('One edge is not allowed to be more than twice (normal and reversed) in the same volume {}'.format(self.info_text))
-
-                if not found:
-                    myPrintError('Cannot add one of the faces {} to volume {}'.format(faces,self.info_text))
-                    count = maxCount
-
-    #        self.__facesTemp = facesForVolume
-
-    #        for f in facesForVolume:
-    #            for e in f.edges:
-    #                if not e in self.__edgesTemp:
-    #                    self.__edgesTemp.append(e)
-
-
-            self.__rawFaces = facesForVolume
-        else:
+        if not faces:
             self.__rawFaces = []
+            return
+
+        # Faces at every simple edge and the direction in which they
+        # contain it
+        faceEdges = [self.__directedSimpleEdges([f]) for f in faces]
+        edgeFaces = {}
+        for (i,directedEdges) in enumerate(faceEdges):
+            for (se,d) in directedEdges:
+                edgeFaces.setdefault(se,[]).append((i,d))
+
+        orientations = [0]*len(faces)
+        proposed = [0]*len(faces)
+        proposed[0] = 1
+        candidates = [0]
+        order = []
+        reportedEdges = set()
+        reportedPairs = set()
+        while candidates:
+            i = heapq.heappop(candidates)
+            if orientations[i]:
+                continue
+            orientations[i] = proposed[i]
+            order.append(i)
+            _log.debug('Adding face {}'.format(faces[i].info_text))
+
+            for (se,d) in faceEdges[i]:
+                shared = edgeFaces[se]
+                if len(shared) > 2:
+                    if se not in reportedEdges:
+                        reportedEdges.add(se)
+                        _log.error('One edge is not allowed to be more than twice (normal and reversed) in the same volume {}'.format(self.info_text))
+                        self.__alignmentConflicts.append(
+                            {'reason': 'multiplicity',
+                             'face': faces[i],
+                             'simpleEdge': se})
+                    continue
+                for (j,dj) in shared:
+                    if j == i:
+                        continue
+                    orientation = -orientations[i]*d*dj
+                    current = orientations[j] or proposed[j]
+                    if not current:
+                        proposed[j] = orientation
+                        heapq.heappush(candidates,j)
+                    elif current != orientation and \
+                            frozenset((i,j)) not in reportedPairs:
+                        reportedPairs.add(frozenset((i,j)))
+                        _log.error('Face {} cannot be aligned in volume {}: the simple edge {} requires both orientations'.format(faces[j].info_text,self.info_text,se.info_text))
+                        self.__alignmentConflicts.append(
+                            {'reason': 'orientation',
+                             'face': faces[j],
+                             'simpleEdge': se})
+
+        if len(order) < len(faces):
+            missing = [f for (f,o) in zip(faces,orientations) if not o]
+            _log.error('Cannot add one of the faces {} to volume {}'.format(missing,self.info_text))
+            for f in missing:
+                self.__alignmentConflicts.append({'reason': 'unreachable',
+                                                  'face': f,
+                                                  'simpleEdge': None})
+
+        self.__rawFaces = [faces[i] if orientations[i] > 0 else -faces[i]
+                           for i in order]
+
+
+    @staticmethod
+    def __directedSimpleEdges(faces):
+        '''
+        Simple edges of the edges of the faces as tuples of the simple edge
+        (never a reversed one) and +1 or -1 for the direction. This way no
+        reversed simple edges have to be created.
 
-
-
-
-
-
+        '''
+        return [(se.my_reverse,-1) if se.is_reverse else (se,1)
+                for f in faces for e in f.edges for se in e.simpleEdges]
 
 
     def __checkClosed(self,faces):
         closed = True
-        simpleEdges = []
-        for f in faces:
-            for e in f.edges:
-#                print(e.num)
-                for se in e.simpleEdges:
-                    if se in simpleEdges:
-                        _log.error('Error, simple edge {} occurs twice in volume {} which is not allowed'.format(se.info_text,self))
-                        closed = False
-                    else:
-                        simpleEdges.append(se)
-
-        for se in simpleEdges :
-            mse = -se
-            if not mse in simpleEdges:
-                _log.error('Error, simple edge {} in the volume {} has no counterpart'.format(se.info_text,self.info_text))
+        multiplicity = collections.Counter()
+        for (se,d) in self.__directedSimpleEdges(faces):
+            if multiplicity[se,d]:
+                _log.error('Error, simple edge {} occurs twice in volume {} which is not allowed'.format((se if d > 0 else -se).info_text,self))
                 closed = False
-        return closed
-
-
-    def __calcBarycenter(self):
-        r'''
-        Calculate the barycenter of a 3-cell :math:`P` (which is confusingly
-        also called volume).
-        The formula is taken from here_.
-
-        .. _here: http://www.ma.ic.ac.uk/~rn/centroid.pdf
-
-        The barycenter in general can be calculated with the integral
-
-        .. math::
-
-            \mathbf{c} = \frac{1}{V} \iiint\limits_P \mathbf{x} \; \mathrm{d} V
-
-        with :math:`\mathbf{x}` beeing the vector to each point in
-        :math:`\mathbf{P}` and :math:`V` beeing the volume of :math:`P`.
-
+            multiplicity[se,d] += 1
 
-        Applying the divergence theorem leads to:
-
-        .. math::
-
-            \mathbf{c} = \frac{1}{V} \iint\limits_{\partial P} \frac{1}{2} \mathbf{x}^\mathrm{T} \mathbf{x} \mathbf{n}   \; \mathrm{d} A
-
-        For convenience we look at it coordinate wise:
-
-        .. math::
-
-            c_j = \frac{1}{V} \iint\limits_{\partial P} \frac{1}{2}  x_j^2 n_j   \; \mathrm{d} A
-
-        The surface of the :math:`P` is devided into triangles, which gives us:
-
-        .. math::
-
-            c_j = \sum_i \iint\limits_{A_i} \frac{1}{2}  x_j^2 n_{i,j}   \; \mathrm{d} A
-
-        The integral can be calculated by the midpoint formula. We denote the
-        vectors to the corners of the triangle by :math:`o`, :math:`a` and
-        :math:`b`.
-
-        .. math::
-
-            c_j = \frac{1}{24 V} \sum_i  A_i n_{j,i} \left(
-                            (o_{i,j} + a_{i,j})^2
-                            (o_{i,j} + b_{i,j})^2
-                            (a_{i,j} + b_{i,j})^2
-                            \right)
-
-        As a reminder: :math:`i` is the index of the triangle, :math:`j` is the
-        index of the dimension
-
-
-        '''
-        bc = np.array([0.,0.,0.])
-        if len(self.__faces)>0:
-
-            # Go through all 3 dimensions
-            for d in range(3):
-                e = np.zeros(3)
-                e[d] = 1
-
-                # Go through all faces in volume
-                for f in self.__faces:
-
-                    # Go through all simple faces in current face
-                    for sf in f.simpleFaces:
-
-                        # Choose first corner of simple face as local origin for all triangles
-                        o = sf.coordinates[0]
-
-                        # Build little triangles, with one corner always beeing the origin
-                        # Attention, the same order as for the calculation of the area is used
-                        # Therefor the areas do not have to be recalculated
-                        for (n,(x,y)) in enumerate(zip(sf.coordinates[1:-1],sf.coordinates[2:])):
-#                            tempvalue = sf.area[0][n] * np.dot(sf.normalVec,e)*((np.dot(o+x,e))**2+(np.dot(o+y,e))**2+(np.dot(x+y,e))**2)
-                            bc[d] += sf.area[0][n] * sf.normalVec[d]*((o[d]+x[d])**2+(o[d]+y[d])**2+(x[d]+y[d])**2)
-
-            if self.__volume < 1E-3:
-                _log.error('{}: volume is close to zero or negative: {}'.format(self.info_text,self.__volume))
-            else:
-                bc = bc/(24*self.__volume)
-        self.__barycenter = bc
-
-
-
-    def __calcVolume(self):
-        r'''
-        Calculate the volume of a 3-cell :math:`P` (which is confusingly also
-        called volume).
-        The formula is taken from here_ and adapted for non triangular faces.
-
-        .. _here: http://www.ma.ic.ac.uk/~rn/centroid.pdf
-
-        We start with the simple calculation of the volume by integration:
-
-        .. math::
-
-            V = \iiint\limits_P 1 \; \mathrm{d}V
-
-        Applying the divergence theorem leads to:
-
-        .. math::
-
-            V = \frac{1}{3} \iint\limits_{\partial P} \mathbf{x}^\mathrm{T}
-            \mathbf{n} \; \mathrm{d} A
-
-        with :math:`\mathbf{x}` beeing the vector to each point on
-        :math:`\partial P` and the normalized normal vector :math:`\mathbf{n}`.
-        Using the fact that :math:`\mathbf{x}^\mathrm{T} \mathbf{n}` is
-        constant on each face (namely the perpendicular distance from the
-        origin to the face) and assuming that the area :math:`A_i` of each face
-        is known, we can rewrite the integral as the sum
-
-        .. math::
-
-            V =  \sum_i \frac{1}{3} A_i \mathbf{x}_i^\mathrm{T} \mathbf{n}_i
-
-        where :math:`\mathbf{x}_i` is the vector to an arbitrary point on the
-        :math:`i`-th face.
-
-
-        '''
-
-        volume = 0
-        for f in self.__faces:
-            for sf in f.simpleFaces:
-                volume += 1/3*sf.area[1]*np.dot(sf.coordinates[0],sf.normalVec)
-        self.__volume = volume
+        for (se,d) in list(multiplicity):
+            if not multiplicity[se,-d]:
+                _log.error('Error, simple edge {} in the volume {} has no counterpart'.format((se if d > 0 else -se).info_text,self.info_text))
+                closed = False
+        return closed
 
 
     def plotTemp(self,ax,temp,tempMin,tempMax):
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+# VOLUME GEOMETRY
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 18:03:12 2026
+
+r"""
+Volume and barycenter of many volumes at once.
+
+The simple faces of all faces of all volumes are collected in one table of
+polygons, see :mod:`simple_face_geometry`, and split into triangles. The
+contributions of the triangles are summed up per volume with
+``np.add.reduceat``. The table can be split into chunks of whole volumes
+that are calculated in separate processes.
+
+The formulas are taken from here_, the one for the volume is adapted for
+non triangular faces.
+
+.. _here: http://www.ma.ic.ac.uk/~rn/centroid.pdf
+
+Volume
+------
+
+We start with the simple calculation of the volume by integration:
+
+.. math::
+
+    V = \iiint\limits_P 1 \; \mathrm{d}V
+
+Applying the divergence theorem leads to:
+
+.. math::
+
+    V = \frac{1}{3} \iint\limits_{\partial P} \mathbf{x}^\mathrm{T}
+    \mathbf{n} \; \mathrm{d} A
+
+with :math:`\mathbf{x}` beeing the vector to each point on
+:math:`\partial P` and the normalized normal vector :math:`\mathbf{n}`.
+Using the fact that :math:`\mathbf{x}^\mathrm{T} \mathbf{n}` is
+constant on each face (namely the perpendicular distance from the
+origin to the face) and assuming that the area :math:`A_i` of each face
+is known, we can rewrite the integral as the sum
+
+.. math::
+
+    V =  \sum_i \frac{1}{3} A_i \mathbf{x}_i^\mathrm{T} \mathbf{n}_i
+
+where :math:`\mathbf{x}_i` is the vector to an arbitrary point on the
+:math:`i`-th face.
+
+Barycenter
+----------
+
+The barycenter in general can be calculated with the integral
+
+.. math::
+
+    \mathbf{c} = \frac{1}{V} \iiint\limits_P \mathbf{x} \; \mathrm{d} V
+
+with :math:`\mathbf{x}` beeing the vector to each point in
+:math:`\mathbf{P}` and :math:`V` beeing the volume of :math:`P`.
+
+
+Applying the divergence theorem leads to:
+
+.. math::
+
+    \mathbf{c} = \frac{1}{V} \iint\limits_{\partial P} \frac{1}{2} \mathbf{x}^\mathrm{T} \mathbf{x} \mathbf{n}   \; \mathrm{d} A
+
+For convenience we look at it coordinate wise:
+
+.. math::
+
+    c_j = \frac{1}{V} \iint\limits_{\partial P} \frac{1}{2}  x_j^2 n_j   \; \mathrm{d} A
+
+The surface of the :math:`P` is devided into triangles, which gives us:
+
+.. math::
+
+    c_j = \sum_i \iint\limits_{A_i} \frac{1}{2}  x_j^2 n_{i,j}   \; \mathrm{d} A
+
+The integral can be calculated by the midpoint formula. We denote the
+vectors to the corners of the triangle by :math:`o`, :math:`a` and
+:math:`b`.
+
+.. math::
+
+    c_j = \frac{1}{24 V} \sum_i  A_i n_{j,i} \left(
+                    (o_{i,j} + a_{i,j})^2
+                    (o_{i,j} + b_{i,j})^2
+                    (a_{i,j} + b_{i,j})^2
+                    \right)
+
+As a reminder: :math:`i` is the index of the triangle, :math:`j` is the
+index of the dimension
+
+"""
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import logging
+
+# ------------------------------------------------------------------------
+#    Third-Party Libraries
+# ------------------------------------------------------------------------
+import numpy as np
+
+# ------------------------------------------------------------------------
+#    Local Libraries
+# ------------------------------------------------------------------------
+
+#    kCells
+# -------------------------------------------------------------------
+from pyCellFoamCore.k_cells.face.simple_face_geometry import polygon_arrays
+from pyCellFoamCore.k_cells.face.simple_face_geometry import fan_triangles
+from pyCellFoamCore.k_cells.face.simple_face_geometry import pool_map
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    VOLUME GEOMETRY
+# =============================================================================
+
+def volume_geometry(face_lists, tol=1E-3, processes=None):
+    """
+    Calculates the signed volume and the barycenter of every volume.
+
+    The volume is negative if the normal vectors of the faces point inwards.
+    The barycenter does not depend on the orientation of the faces.
+
+    :param list face_lists: One list of faces for every volume
+    :param float tol: Volumes with an absolute value below this tolerance
+        get the barycenter zero
+    :param int processes: If given, the volumes are split into this many
+        chunks that are calculated in a pool of processes, see
+        :func:`pool_map`
+    :return: Array with the volumes and array of shape (n, 3) with the
+        barycenters
+
+    """
+    # Reversed simple faces are replaced by their simple face and a negative
+    # sign, so that neighbouring volumes use the same triangles
+    simple_faces = [[sf for f in faces for sf in f.simpleFaces
+                     if len(sf.coordinates) > 2]
+                    for faces in face_lists]
+    num_simple_faces = np.fromiter((len(s) for s in simple_faces),
+                                   dtype=np.int64, count=len(simple_faces))
+    if num_simple_faces.sum() == 0:
+        return (np.zeros(len(simple_faces)), np.zeros((len(simple_faces), 3)))
+    simple_faces = [sf for s in simple_faces for sf in s]
+    signs = np.array([-1. if sf.is_reverse else 1. for sf in simple_faces])
+    (coordinates, offsets) = polygon_arrays(
+        [sf.my_reverse if sf.is_reverse else sf for sf in simple_faces])
+
+    if processes is None or processes < 2 \
+            or len(num_simple_faces) < processes:
+        return polyhedron_geometry(coordinates, offsets, signs,
+                                   num_simple_faces, tol)
+
+    # Split the volumes into chunks with about the same number of polygons
+    polygon_offsets = np.zeros(len(num_simple_faces)+1, dtype=np.int64)
+    np.cumsum(num_simple_faces, out=polygon_offsets[1:])
+    bounds = np.searchsorted(
+        polygon_offsets,
+        np.linspace(0, polygon_offsets[-1], processes+1)[1:-1])
+    bounds = np.unique(np.concatenate(([0], bounds,
+                                       [len(num_simple_faces)])))
+    chunks = []
+    for (v0, v1) in zip(bounds[:-1], bounds[1:]):
+        (p0, p1) = (polygon_offsets[v0], polygon_offsets[v1])
+        chunks.append((coordinates[offsets[p0]:offsets[p1]],
+                       offsets[p0:p1+1]-offsets[p0],
+                       signs[p0:p1],
+                       num_simple_faces[v0:v1],
+                       tol))
+    results = pool_map(polyhedron_geometry, chunks, processes)
+    return (np.concatenate([r[0] for r in results]),
+            np.concatenate([r[1] for r in results]))
+
+
+def polyhedron_geometry(coordinates, offsets, signs, num_simple_faces,
+                        tol=1E-3):
+    """
+    Calculates the signed volume and the barycenter of every volume from a
+    table of polygons, see :func:`volume_geometry`.
+
+    :param coordinates: Array of shape (n, 3) with the corners of all simple
+        faces
+    :param offsets: Array of offsets of the simple faces
+    :param signs: Array with -1 for every simple face that is used reversed
+        and 1 otherwise
+    :param num_simple_faces: Array with the number of simple faces of every
+        volume
+    :param float tol: Volumes with an absolute value below this tolerance
+        get the barycenter zero
+    :return: Array with the volumes and array of shape (n, 3) with the
+        barycenters
+
+    """
+    volumes = np.zeros(len(num_simple_faces))
+    barycenters = np.zeros((len(num_simple_faces), 3))
+    if len(offsets) < 2:
+        return (volumes, barycenters)
+    (polygon, triangle_offsets, o, x, y) = fan_triangles(coordinates,
+                                                         offsets)
+
+    # Area times normal vector of every triangle, pointing outwards
+    weighted_normals = np.cross(x-o, y-o)/2*signs[polygon, None]
+
+    # Sum up per volume, volumes without simple faces stay zero
+    polygon_offsets = np.zeros(len(num_simple_faces)+1, dtype=np.int64)
+    np.cumsum(num_simple_faces, out=polygon_offsets[1:])
+    has_faces = num_simple_faces > 0
+    starts = triangle_offsets[polygon_offsets[:-1][has_faces]]
+
+    volumes[has_faces] = np.add.reduceat(
+        np.einsum('ij,ij->i', o, weighted_normals)/3, starts)
+    barycenters[has_faces] = np.add.reduceat(
+        weighted_normals*((o+x)**2 + (o+y)**2 + (x+y)**2), starts, axis=0)
+    valid = np.abs(volumes) >= tol
+    barycenters[valid] /= 24*volumes[valid, None]
+    barycenters[~valid] = 0
+
+    return (volumes, barycenters)
+
+
+# =============================================================================
+#    UPDATE VOLUMES
+# =============================================================================
+
+def update_volumes(volumes, processes=None):
+    """
+    Recalculates the volume and the barycenter of the given volumes from the
+    current geometry of their faces and writes them back, see
+    :meth:`Volume.set_geometry`.
+
+    :param int processes: Number of processes, see :func:`volume_geometry`
+
+    """
+    volumes = list(volumes)
+    if not volumes:
+        return
+    (values, barycenters) = volume_geometry([v.faces for v in volumes],
+                                            processes=processes)
+    for (v, value, barycenter) in zip(volumes, values, barycenters):
+        v.set_geometry(value, barycenter)
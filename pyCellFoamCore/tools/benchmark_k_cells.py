@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+# =============================================================================
+# BENCHMARK K-CELLS
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 16:02:51 2026
+
+"""
+Benchmarks for the k-cells.
+
+The memory benchmark builds a lattice of cubes from nodes, edges, faces and
+volumes and reports how many bytes are allocated per cell of every type. The
+numbers include everything a cell allocates on construction, i.e. its
+reversed twin and the simple cells that describe its geometry.
+
+The build and teardown benchmark measures how long it takes to create a grid
+and to delete all of its cells again. Both steps register and unregister the
+cells at their neighbours, e.g. edges at their nodes.
+
+The deduplication benchmark compares collecting cells with a loop over a
+growing list, as it was done for the geometric nodes of the dual complex,
+with :func:`unique_cells`.
+
+Run this module directly to print the results::
+
+    python -m pyCellFoamCore.tools.benchmark_k_cells
+
+"""
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+import gc
+import logging
+import random
+import time
+import tracemalloc
+
+# ------------------------------------------------------------------------
+#    Local Libraries
+# ------------------------------------------------------------------------
+
+#    k-Cells
+# -------------------------------------------------------------------
+from pyCellFoamCore.k_cells.cell.super_base_cell import SuperBaseCell
+from pyCellFoamCore.k_cells.node.node import Node
+from pyCellFoamCore.k_cells.edge.edge import Edge
+from pyCellFoamCore.k_cells.face.face import Face
+from pyCellFoamCore.k_cells.volume.volume import Volume
+
+#    Tools
+# -------------------------------------------------------------------
+from pyCellFoamCore.tools.logging_formatter import set_logging_format
+from pyCellFoamCore.tools.cellList import unique_cells
+
+# =============================================================================
+#    LOGGING
+# =============================================================================
+
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+
+
+# =============================================================================
+#    LATTICE OF CUBES
+# =============================================================================
+
+def _build_nodes(n):
+    return [[[Node(i, j, k) for k in range(n+1)]
+             for j in range(n+1)]
+            for i in range(n+1)]
+
+
+def _build_edges(n, nodes):
+    r = range(n+1)
+    ex = {(i, j, k): Edge(nodes[i][j][k], nodes[i+1][j][k])
+          for i in range(n) for j in r for k in r}
+    ey = {(i, j, k): Edge(nodes[i][j][k], nodes[i][j+1][k])
+          for i in r for j in range(n) for k in r}
+    ez = {(i, j, k): Edge(nodes[i][j][k], nodes[i][j][k+1])
+          for i in r for j in r for k in range(n)}
+    return (ex, ey, ez)
+
+
+def _build_faces(n, edges):
+    (ex, ey, ez) = edges
+    r = range(n+1)
+    # The normal vectors point in positive x, y and z direction
+    fyz = {(i, j, k): Face([ey[i, j, k], ez[i, j+1, k],
+                            -ey[i, j, k+1], -ez[i, j, k]])
+           for i in r for j in range(n) for k in range(n)}
+    fzx = {(i, j, k): Face([ez[i, j, k], ex[i, j, k+1],
+                            -ez[i+1, j, k], -ex[i, j, k]])
+           for i in range(n) for j in r for k in range(n)}
+    fxy = {(i, j, k): Face([ex[i, j, k], ey[i+1, j, k],
+                            -ex[i, j+1, k], -ey[i, j, k]])
+           for i in range(n) for j in range(n) for k in r}
+    for faces in (fyz, fzx, fxy):
+        for f in faces.values():
+            f.edges
+    return (fyz, fzx, fxy)
+
+
+def _build_volumes(n, faces):
+    (fyz, fzx, fxy) = faces
+    volumes = [Volume([-fyz[i, j, k], fyz[i+1, j, k],
+                       -fzx[i, j, k], fzx[i, j+1, k],
+                       -fxy[i, j, k], fxy[i, j, k+1]])
+               for i in range(n) for j in range(n) for k in range(n)]
+    for v in volumes:
+        v.faces
+    return volumes
+
+
+def _count(cells):
+    if isinstance(cells, dict):
+        return len(cells)
+    if isinstance(cells, tuple):
+        return sum(_count(c) for c in cells)
+    if isinstance(cells, list):
+        return sum(_count(c) for c in cells)
+    return 1
+
+
+# =============================================================================
+#    BENCHMARKS
+# =============================================================================
+
+def memory_per_cell(num_cubes=8):
+    """
+    Builds a lattice of `num_cubes`^3 cubes and measures the memory that is
+    allocated for the nodes, edges, faces and volumes.
+
+    :param int num_cubes: Number of cubes in every direction
+    :return: Dictionary that maps 'node', 'edge', 'face' and 'volume' to
+        the number of bytes per cell
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = {}
+        previous = tracemalloc.get_traced_memory()[0]
+        cells = None
+        steps = [('node', lambda cells: _build_nodes(num_cubes)),
+                 ('edge', lambda cells: _build_edges(num_cubes, cells)),
+                 ('face', lambda cells: _build_faces(num_cubes, cells)),
+                 ('volume', lambda cells: _build_volumes(num_cubes, cells))]
+        kept = []
+        for (name, build) in steps:
+            cells = build(cells)
+            kept.append(cells)
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            result[name] = (current - previous) / _count(cells)
+            previous = current
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def reversed_cells_needed(num_cubes=8):
+    """
+    Builds a lattice of `num_cubes`^3 cubes and counts the reversed cells
+    that have been created, see :attr:`SuperBaseCell.reversed_cell_count`.
+
+    :return: Number of created reversed cells and number of edges, faces,
+        simple edges and simple faces that could have a reversed cell
+
+    """
+    count_before = SuperBaseCell.reversed_cell_count
+    nodes = _build_nodes(num_cubes)
+    edges = _build_edges(num_cubes, nodes)
+    faces = _build_faces(num_cubes, edges)
+    _build_volumes(num_cubes, faces)
+    edges = [e for group in edges for e in group.values()]
+    faces = [f for group in faces for f in group.values()]
+    num_cells = len(edges) + len(faces) \
+        + sum(len(e.simpleEdges) for e in edges) \
+        + sum(len(f.simpleFaces) for f in faces)
+    return (SuperBaseCell.reversed_cell_count - count_before, num_cells)
+
+
+def build_and_teardown(grid=None, *args, **kwargs):
+    """
+    Builds a grid and deletes all of its volumes, faces and edges again.
+
+    :param grid: Class of the grid, :class:`Grid3DCubic` with 4 cubes in
+        every direction if None. All other arguments are passed to the grid.
+    :return: Seconds needed for building and for tearing down, and the
+        number of nodes, edges, faces and volumes
+
+    """
+    if grid is None:
+        from pyCellFoamCore.grids.grid3DCubic import Grid3DCubic
+        grid = Grid3DCubic
+        if not args and 'xNum' not in kwargs:
+            args = (4,)
+
+    start = time.perf_counter()
+    c = grid(*args, **kwargs)
+    build_time = time.perf_counter() - start
+    cells = [list(c.nodes), list(c.edges) + list(c.geometricEdges),
+             list(c.faces), list(c.volumes)]
+
+    start = time.perf_counter()
+    for v in cells[3]:
+        v.delete()
+    for f in cells[2]:
+        f.delete()
+    for e in cells[1]:
+        e.delete()
+    teardown_time = time.perf_counter() - start
+    return (build_time, teardown_time, [len(x) for x in cells])
+
+
+def deduplication(num_cells=2000, repeats=4):
+    """
+    Collects `num_cells` nodes that occur `repeats` times each in random
+    order, once by checking every node against a growing list and once with
+    :func:`unique_cells`.
+
+    :return: Seconds needed with the list and with :func:`unique_cells`
+
+    """
+    nodes = [Node(i, 0, 0) for i in range(num_cells)]
+    cells = nodes*repeats
+    random.Random(0).shuffle(cells)
+
+    start = time.perf_counter()
+    collected = []
+    for n in cells:
+        if n not in collected:
+            collected.append(n)
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    unique = unique_cells(cells)
+    collector_time = time.perf_counter() - start
+
+    if unique != collected:
+        _log.error('unique_cells does not give the same result as the list')
+    return (list_time, collector_time)
+
+
+def print_memory_per_cell(num_cubes=8):
+    """
+    Prints the result of :func:`memory_per_cell`.
+
+    """
+    result = memory_per_cell(num_cubes)
+    print('Memory per k-cell ({}^3 cubes)'.format(num_cubes))
+    for (name, num_bytes) in result.items():
+        print('    {:<8}{:>10.0f} bytes'.format(name, num_bytes))
+
+
+# =============================================================================
+#    TESTING
+# =============================================================================
+
+if __name__ == "__main__":
+
+    set_logging_format(logging.WARNING)
+    print_memory_per_cell()
+
+    (num_reversed, num_cells) = reversed_cells_needed()
+    print('Reversed cells created: {} of {}'.format(num_reversed, num_cells))
+
+    (build_time, teardown_time, num_cells) = build_and_teardown()
+    print('Cubic grid with {} nodes, {} edges, {} faces and {} volumes'
+          .format(*num_cells))
+    print('    build     {:>8.2f} s'.format(build_time))
+    print('    teardown  {:>8.2f} s'.format(teardown_time))
+
+    (list_time, collector_time) = deduplication()
+    print('Deduplication of 2000 nodes')
+    print('    list          {:>8.4f} s'.format(list_time))
+    print('    unique_cells  {:>8.4f} s'.format(collector_time))
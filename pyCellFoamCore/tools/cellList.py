@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# CELL LIST
+# =============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 11:20:37 2026
+
+'''
+A list of k-cells with constant time membership tests.
+
+:class:`CellList` is a normal Python list, so ordering, indexing, slicing,
+iteration, ``len`` and ``+`` behave exactly as before. In addition, it counts
+its entries in a dictionary, so ``cell in cellList`` does not scan the list.
+k-cells are hashed by identity, which is the same comparison that ``in`` uses
+for plain lists of cells.
+
+:func:`unique_cells` collects cells without duplicates in the order of their
+first occurrence. It replaces loops that check ``if not c in cells`` against
+a growing plain list, which take quadratic time.
+
+'''
+
+# =============================================================================
+#    IMPORTS
+# =============================================================================
+
+# ------------------------------------------------------------------------
+#    Standard Libraries
+# ------------------------------------------------------------------------
+from collections import Counter
+
+
+# =============================================================================
+#    CLASS DEFINITION
+# =============================================================================
+class CellList(list):
+    '''
+    List with a hash based index of its entries. All methods that change the
+    list keep the index up to date.
+
+    '''
+
+# =============================================================================
+#    SLOTS
+# =============================================================================
+    __slots__ = ('__counts',)
+
+# =============================================================================
+#    INITIALIZATION
+# =============================================================================
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.__counts = Counter(list.__iter__(self))
+
+# =============================================================================
+#    MAGIC METHODS
+# =============================================================================
+    def __contains__(self, item):
+        return item in self.__counts
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = list(value)
+            self.__discard(list.__getitem__(self, key))
+            super().__setitem__(key, value)
+            self.__counts.update(value)
+        else:
+            self.__discard([list.__getitem__(self, key)])
+            super().__setitem__(key, value)
+            self.__counts[value] += 1
+
+    def __delitem__(self, key):
+        if isinstance(key, slice):
+            self.__discard(list.__getitem__(self, key))
+        else:
+            self.__discard([list.__getitem__(self, key)])
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self.__counts = Counter(list.__iter__(self))
+        return self
+
+# =============================================================================
+#    METHODS
+# =============================================================================
+    def append(self, item):
+        super().append(item)
+        self.__counts[item] += 1
+
+    def extend(self, iterable):
+        items = list(iterable)
+        super().extend(items)
+        self.__counts.update(items)
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.__counts[item] += 1
+
+    def remove(self, item):
+        if item not in self.__counts:
+            raise ValueError('CellList.remove(x): x not in list')
+        super().remove(item)
+        self.__discard([item])
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.__discard([item])
+        return item
+
+    def clear(self):
+        super().clear()
+        self.__counts.clear()
+
+    def count(self, item):
+        return self.__counts.get(item, 0)
+
+    def index(self, item, *args):
+        if item not in self.__counts:
+            raise ValueError('{} is not in list'.format(item))
+        return super().index(item, *args)
+
+    def copy(self):
+        return CellList(self)
+
+    def __discard(self, items):
+        '''
+        Decrease the count of the given items and forget them if they are no
+        longer in the list.
+
+        '''
+        for item in items:
+            self.__counts[item] -= 1
+            if self.__counts[item] <= 0:
+                del self.__counts[item]
+
+
+# =============================================================================
+#    FUNCTIONS
+# =============================================================================
+def unique_cells(cells):
+    '''
+    Collects the given cells without duplicates.
+
+    :param cells: Iterable of cells, e.g. a generator expression
+    :return: :class:`CellList` with every cell once, in the order of its
+        first occurrence
+
+    '''
+    return CellList(dict.fromkeys(cells))
@@ -56,6 +56,7 @@ setup(
     python_requires='>=3.8',
     install_requires=[
         'numpy',
+        'scipy',
         'matplotlib',
         'tabulate',
     ],
@@ -0,0 +1,825 @@
+# -*- coding: utf-8 -*-
+#==============================================================================
+# UNITTEST OF COMPLEX CLASSES
+#==============================================================================
+# Author:         Tobias Scheuermann
+# Institution:    Chair of Automatic Control
+#                 Department of Mechanical Engineering
+#                 Technical University of Munich (TUM)
+# E-Mail:         tobias.scheuermann@tum.de
+# Created on:     Sat Oct 17 09:12:44 2026
+
+'''
+
+
+'''
+#==============================================================================
+#    IMPORTS
+#==============================================================================
+#-------------------------------------------------------------------------
+#    Change to Main Directory
+#-------------------------------------------------------------------------
+import os
+if __name__ == '__main__':
+    os.chdir('../')
+
+#-------------------------------------------------------------------------
+#    Standard Libraries
+#-------------------------------------------------------------------------
+import itertools
+import unittest
+from unittest import mock
+import logging
+import numpy as np
+
+#-------------------------------------------------------------------------
+#    Local Libraries
+#-------------------------------------------------------------------------
+
+#    Complex & Grids
+#--------------------------------------------------------------------
+
+from pyCellFoamCore.grids.grid3DCubic import Grid3DCubic
+from pyCellFoamCore.complex.dualComplex3D import DualComplex3D
+
+#    kCells
+#--------------------------------------------------------------------
+
+from pyCellFoamCore.k_cells.node.node import Node
+from pyCellFoamCore.k_cells.edge.edge import Edge
+from pyCellFoamCore.k_cells.face.face import Face
+from pyCellFoamCore.k_cells.volume.volume import Volume
+from pyCellFoamCore.k_cells.face.simple_face_geometry import update_simple_faces
+from pyCellFoamCore.k_cells.face.simple_face_geometry import polygon_arrays
+from pyCellFoamCore.k_cells.face.simple_face_geometry import fan_geometry
+from pyCellFoamCore.k_cells.face.simple_face_geometry import fan_geometry_chunked
+from pyCellFoamCore.k_cells.volume.volume_geometry import volume_geometry
+from pyCellFoamCore.k_cells.node.dual_node_plan import plan_dual_nodes
+from pyCellFoamCore.k_cells.node.dual_node_plan import create_dual_nodes
+from pyCellFoamCore.k_cells.node.dualNode3D import DualNode3D
+from pyCellFoamCore.k_cells.cell.super_base_cell import SuperBaseCell
+from pyCellFoamCore.k_cells.cell import cell_events
+
+#    Tools
+#--------------------------------------------------------------------
+
+from pyCellFoamCore.tools.cellList import CellList
+from pyCellFoamCore.tools.cellList import unique_cells
+
+
+#==============================================================================
+#    CLASS DEFINITION
+#==============================================================================
+class TestComplexMethods(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.WARNING)
+        cls.pc = Grid3DCubic(2, borderVolumesAll=True)
+        cls.dc = DualComplex3D(cls.pc)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+
+#==============================================================================
+#    TESTING METHODS
+#==============================================================================
+
+#-------------------------------------------------------------------------
+#    Sparse incidence matrices
+#-------------------------------------------------------------------------
+
+    def testSparseIncidence(self):
+        # Without border volumes, the numbers of the dual cells in category 2
+        # are not their positions in the lists
+        dc = DualComplex3D(Grid3DCubic(3))
+        for (c, useCategory, sparseFormat) in itertools.product(
+                [self.pc, self.dc, dc], [1, 2], ['csr', 'csc']):
+            c.useCategory = useCategory
+            m1 = c.calcIncidence1(c.innerNodes, c.innerEdges,
+                                  sparse=True, sparseFormat=sparseFormat)
+            m2 = c.calcIncidence2(c.innerEdges, c.innerFaces,
+                                  sparse=True, sparseFormat=sparseFormat)
+            m3 = c.calcIncidence3(c.borderFaces, c.borderVolumes,
+                                  sparse=True, sparseFormat=sparseFormat)
+            self.assertEqual(m1.format, sparseFormat)
+            np.testing.assert_array_equal(
+                m1.toarray(),
+                c.calcIncidence1(c.innerNodes, c.innerEdges))
+            np.testing.assert_array_equal(
+                m2.toarray(),
+                c.calcIncidence2(c.innerEdges, c.innerFaces))
+            np.testing.assert_array_equal(
+                m3.toarray(),
+                c.calcIncidence3(c.borderFaces, c.borderVolumes))
+        for c in [self.pc, self.dc]:
+            c.useCategory = 1
+
+
+#-------------------------------------------------------------------------
+#    Assembled incidence matrices
+#-------------------------------------------------------------------------
+
+    def testAssembledIncidence(self):
+        for c in [self.pc, self.dc]:
+            for useCategory in [1, 2]:
+                c.useCategory = useCategory
+                self.assertIs(c.sparseIncidenceMatrix2,
+                              c.sparseIncidenceMatrix2)
+                self.assertIs(c.incidenceMatrix2, c.incidenceMatrix2)
+                np.testing.assert_array_equal(
+                    c.incidenceMatrix1, c.sparseIncidenceMatrix1.toarray())
+                np.testing.assert_array_equal(
+                    c.incidenceMatrix2ib,
+                    c.calcIncidence2(c.innerEdges, c.borderFaces))
+                np.testing.assert_array_equal(
+                    c.incidenceMatrix3Bb,
+                    c.calcIncidence3(c.additionalBorderFaces,
+                                     c.borderVolumes))
+                (rows, cols) = c.incidenceSlices1['bB']
+                np.testing.assert_array_equal(
+                    c.incidenceMatrix1[rows, cols],
+                    c.calcIncidence1(c.borderNodes,
+                                     c.additionalBorderEdges))
+            c.useCategory = 1
+
+#-------------------------------------------------------------------------
+#    Compiled complex
+#-------------------------------------------------------------------------
+
+    def testCompile(self):
+        for c in [self.pc, self.dc]:
+            cc = c.compile()
+            self.assertEqual(cc.coordinates.shape, (len(c.nodes), 3))
+            self.assertEqual(cc.edgeNodes.shape, (len(c.edges), 2))
+            for (a, b) in [(cc.incidenceMatrix1, c.sparseIncidenceMatrix1),
+                           (cc.incidenceMatrix2, c.sparseIncidenceMatrix2),
+                           (cc.incidenceMatrix3, c.sparseIncidenceMatrix3)]:
+                self.assertEqual((a != b).nnz, 0)
+            (rows, cols) = c.incidenceSlices2['bi']
+            self.assertEqual(cc.categorySlice(cc.edgeCategories, 'border'),
+                             rows)
+        pcc = self.pc.compile()
+        dcc = self.dc.compile()
+        for (i, j) in enumerate(pcc.nodeDuals):
+            if j >= 0:
+                self.assertIs(dcc.volumes[j].dualCell3D, pcc.nodes[i])
+
+#-------------------------------------------------------------------------
+#    Category lists
+#-------------------------------------------------------------------------
+
+    def testCellList(self):
+        self.assertIsInstance(self.pc.innerEdges1, CellList)
+        self.assertIsInstance(self.pc.faces, CellList)
+        cells = CellList(self.pc.nodes[:4])
+        n = self.pc.nodes[5]
+        self.assertNotIn(n, cells)
+        cells.append(n)
+        self.assertIn(n, cells)
+        self.assertEqual(cells.index(n), 4)
+        self.assertEqual(cells[1:3], self.pc.nodes[1:3])
+        self.assertEqual(len(cells + [n]), 6)
+        cells.remove(n)
+        self.assertNotIn(n, cells)
+        cells[0] = n
+        self.assertIn(n, cells)
+        self.assertNotIn(self.pc.nodes[0], cells)
+        del cells[:]
+        self.assertNotIn(n, cells)
+        with self.assertRaises(ValueError):
+            cells.remove(n)
+
+    def testUniqueCells(self):
+        nodes = self.pc.nodes[:3]
+        unique = unique_cells([nodes[1], nodes[0], nodes[1], nodes[2],
+                               nodes[0]])
+        self.assertIsInstance(unique, CellList)
+        self.assertEqual(unique, [nodes[1], nodes[0], nodes[2]])
+        self.assertEqual(len(unique_cells(n for n in [])), 0)
+        geometricNodes = self.dc.geometricNodes
+        self.assertEqual(len(set(geometricNodes)), len(geometricNodes))
+        self.assertEqual(set(geometricNodes),
+                         {n for c in self.dc.edges+self.dc.faces
+                          for n in c.geometricNodes})
+
+
+#-------------------------------------------------------------------------
+#    Invalidation of incidence blocks
+#-------------------------------------------------------------------------
+
+    def testInvalidation(self):
+        pc = self.pc
+        pc.useCategory = 1
+        for dim in ['1', '2']:
+            for block in getattr(pc, 'incidenceSlices' + dim):
+                getattr(pc, 'incidenceMatrix' + dim + block)
+        full = pc.sparseIncidenceMatrix2
+        (f, e) = next((f, e) for f in pc.innerFaces for e in f.edges
+                      if e.category1 == 'inner')
+        cell_events.boundary_changed(f, e)
+        self.assertTrue(pc.changedIncidenceMatrix2ii)
+        self.assertFalse(pc.changedIncidenceMatrix2ib)
+        self.assertFalse(pc.changedIncidenceMatrix2bi)
+        self.assertFalse(pc.changedIncidenceMatrix1ii)
+        self.assertIsNot(pc.sparseIncidenceMatrix2, full)
+        self.assertEqual((pc.sparseIncidenceMatrix2 != full).nnz, 0)
+        pc.changedCells(0, ['border'])
+        self.assertTrue(pc.changedIncidenceMatrix1bi)
+        self.assertFalse(pc.changedIncidenceMatrix1ii)
+        self.assertTrue(pc.changedLimits)
+
+    def testRenumberInvalidation(self):
+        pc = Grid3DCubic(3)
+        e = pc.innerEdges1[0]
+        self.assertEqual(pc.globalIndex([e], 1).tolist(), [0])
+        pc.incidenceBlock(2, 'ii', sparse=True)
+        pc.innerEdges1.reverse()
+        pc.renumber()
+        self.assertEqual(pc.globalIndex([e], 1).tolist(), [e.num])
+        self.assertEqual(e.num, len(pc.innerEdges1)-1)
+        (nEi, nFi) = (len(pc.innerEdges1), len(pc.innerFaces1))
+        np.testing.assert_array_equal(
+            pc.incidenceMatrix2[:nEi, :nFi],
+            pc.calcIncidence2(pc.innerEdges1, pc.innerFaces1))
+
+#-------------------------------------------------------------------------
+#    Local topology edits
+#-------------------------------------------------------------------------
+
+    def testApplyEdit(self):
+        pc = Grid3DCubic(2, borderVolumesAll=True)
+        for dim in ['1', '2', '3']:
+            getattr(pc, 'sparseIncidenceMatrix' + dim)
+        e = next(e for e in pc.innerEdges if len(e.faces) == 4)
+        n = Node(*(e.startNode.coordinates + e.endNode.coordinates) / 2)
+        e1 = Edge(e.startNode, n)
+        e2 = Edge(n, e.endNode)
+        for c in [n, e1, e2]:
+            c.category1 = 'inner'
+            c.category2 = 'inner'
+        for f in e.faces[:]:
+            if f.is_reverse:
+                f = -f
+                replacement = [-e2, -e1]
+            else:
+                replacement = [e1, e2]
+            edges = []
+            for e_ in f.edges:
+                if e_ in [e, -e]:
+                    edges += replacement
+                else:
+                    edges.append(e_)
+            f.edges = edges
+        pc.applyEdit([e], [n, e1, e2])
+        self.assertNotIn(e, pc.edges)
+        self.assertIn(n, pc.innerNodes)
+        self.assertEqual(pc.innerEdges[-2:], [e1, e2])
+        calcIncidence = [pc.calcIncidence1, pc.calcIncidence2,
+                         pc.calcIncidence3]
+        calls = []
+        for name in ['calcIncidence1', 'calcIncidence2', 'calcIncidence3']:
+            patcher = mock.patch.object(Grid3DCubic, name, autospec=True,
+                                        side_effect=getattr(Grid3DCubic, name))
+            calls.append(patcher.start())
+            self.addCleanup(patcher.stop)
+        for dim in ['1', '2', '3']:
+            getattr(pc, 'sparseIncidenceMatrix' + dim)
+        self.assertEqual([calc.call_count for calc in calls], [0, 0, 0])
+        for dim in [1, 2, 3]:
+            for (r, rows) in zip('ibB', pc.categoryGroups(dim-1)):
+                for (c, cols) in zip('ibB', pc.categoryGroups(dim)):
+                    reference = calcIncidence[dim-1](rows, cols, sparse=True)
+                    m = pc.incidenceBlock(dim, r+c, sparse=True)
+                    self.assertEqual((m != reference).nnz, 0)
+        self.assertEqual(
+            abs(pc.sparseIncidenceMatrix1 @ pc.sparseIncidenceMatrix2).nnz, 0)
+
+
+#-------------------------------------------------------------------------
+#    Deferred renumbering
+#-------------------------------------------------------------------------
+
+    def testRenumber(self):
+        pc = self.pc
+        pc.useCategory = 2
+        pc.renumber()
+        groups = [pc.innerEdges2, pc.borderEdges2, pc.additionalBorderEdges2]
+        (numbers, i) = groups[1][-1].pending_number
+        self.assertIs(numbers, pc.cellNumbers[1])
+        self.assertEqual(i, len(groups[0])+len(groups[1])-1)
+        np.testing.assert_array_equal(
+            pc.cellNumbers[1],
+            np.concatenate([np.arange(len(g)) for g in groups]))
+        for g in groups:
+            for (i, e) in enumerate(g):
+                self.assertEqual(e.num, i)
+                self.assertEqual((-e).num, i)
+                self.assertIsNone(e.pending_number)
+        f = pc.borderFaces2[-1]
+        f.num = 1000
+        self.assertEqual(f.num, 1000)
+        self.assertTrue(f.info_text.endswith('1000'))
+        pc.useCategory = 1
+        pc.renumber()
+        for v in self.dc.borderNodes:
+            self.assertEqual(v.num, v.dualCell3D.num)
+
+
+#-------------------------------------------------------------------------
+#    Sparse verification
+#-------------------------------------------------------------------------
+
+    def testVerify(self):
+        report = self.dc.verifyIncidenceMatrices()
+        self.assertTrue(report.ok)
+        self.assertEqual(len(report.checks), 32)
+        self.assertEqual(self.pc.useCategory, 1)
+        self.assertEqual(self.dc.checkAllIncidenceMatrices(doPrints=False),
+                         [True]*24)
+
+        pc = self.pc
+        nodes = sum(pc.categoryGroups(0), [])
+        faces = sum(pc.categoryGroups(2), [])
+        report = pc.verifyBoundaries()
+        self.assertTrue(report.ok)
+        residual = pc.sparseIncidenceMatrix1 @ abs(pc.sparseIncidenceMatrix2)
+        self.assertFalse(report.checkZero('|d1| |d2| = 0', residual,
+                                          nodes, faces))
+        self.assertFalse(report.ok)
+        cells = report.offendingCells('|d1| |d2| = 0')
+        self.assertTrue(cells)
+        self.assertTrue(cells <= set(nodes) | set(faces))
+
+    def testDualityCategory2(self):
+        # Without border volumes, the dual cells keep numbers in category 2
+        # that are not their positions in the lists
+        dc = DualComplex3D(Grid3DCubic(3))
+        self.assertEqual(dc.checkAllIncidenceMatrices(doPrints=False),
+                         [True]*24)
+        self.assertTrue(dc.verifyIncidenceMatrices(categories=[2]).ok)
+        dc.useCategory = 2
+        calcIncidence = [dc.calcIncidence1, dc.calcIncidence2,
+                         dc.calcIncidence3]
+        for dim in [1, 2, 3]:
+            dense = np.block([[calcIncidence[dim-1](rows, cols)
+                               for cols in dc.categoryGroups(dim)]
+                              for rows in dc.categoryGroups(dim-1)])
+            np.testing.assert_array_equal(
+                getattr(dc, 'incidenceMatrix' + str(dim)), dense)
+
+
+#-------------------------------------------------------------------------
+#    Coordinate array
+#-------------------------------------------------------------------------
+
+    def testCoordinates(self):
+        pc = self.pc
+        coordinates = np.array([n.coordinates for n in pc.nodes])
+        np.testing.assert_array_equal(pc.coordinates, coordinates)
+        self.assertEqual(pc.xLim, [coordinates[:, 0].min(),
+                                   coordinates[:, 0].max()])
+        self.assertFalse(pc.coordinates.flags.writeable)
+        n = pc.nodes[3]
+        old = n.coordinates.copy()
+        n.zCoordinate = pc.zMax + 1
+        self.assertEqual(pc.coordinates[3, 2], n.zCoordinate)
+        self.assertEqual(pc.zMax, n.zCoordinate)
+        n.coordinates = old
+        self.assertEqual(pc.zMax, coordinates[:, 2].max())
+        self.assertEqual(pc.nodeRows([n, pc.nodes[0]]).tolist(), [3, 0])
+        inside = pc.nodesInBox(pc.xLim, pc.yLim, [pc.zMin, pc.zMin])
+        self.assertIn(pc.nodes[int(np.argmin(coordinates[:, 2]))], inside)
+
+
+    def testEdgeLengths(self):
+        dc = self.dc
+        for edges in [dc.innerEdges, dc.borderEdges, [-e for e in dc.edges]]:
+            np.testing.assert_allclose(dc.edge_lengths(edges),
+                                       [e.length[1] for e in edges])
+
+        nodes = [Node(0, 0, 0), Node(1, 0, 0), Node(1, 2, 0)]
+        e = Edge(nodes[0], nodes[2], geometricNodes=[nodes[1]])
+        e.length[0].append(5)
+        e.barycenter.clear()
+        self.assertEqual(e.length, [[1, 2], 3])
+        self.assertEqual(len(e.barycenter), 2)
+        self.assertEqual((-e).length, [[2, 1], 3])
+        np.testing.assert_allclose((-e).directionVec, [[0, -1, 0], [-1, 0, 0]])
+        nodes[2].yCoordinate = 1
+        self.assertEqual(e.length, [[1, 1], 2])
+        np.testing.assert_allclose(e.barycenter, [[0.5, 0, 0], [1, 0.5, 0]])
+        np.testing.assert_allclose(self.pc.edge_lengths([e, -e]), [2, 2])
+
+
+    def testCellIndices(self):
+        pc = self.pc
+        for category in [1, 2]:
+            pc.useCategory = category
+            for dim in range(4):
+                groups = pc.categoryGroups(dim)
+                cells = [c for g in groups for c in g]
+                self.assertEqual(pc.globalIndex(cells, dim).tolist(),
+                                 list(range(len(cells))))
+                (categories, positions) = pc.blockIndex(cells, dim)
+                self.assertEqual(positions.tolist(), [c.num for c in cells])
+                self.assertEqual(categories.tolist(),
+                                 [k for (k, g) in enumerate(groups)
+                                  for c in g])
+        pc.useCategory = 1
+        e = pc.innerEdges[2]
+        edges = [e, -e, pc.dualComplex.edges[0]]
+        self.assertEqual(pc.globalIndex(edges, 1).tolist(), [2, 2, -1])
+        self.assertEqual(pc.cellOrientation(edges, 1).tolist(), [1, -1, 0])
+        self.assertEqual(pc.blockIndex(edges, 1)[0].tolist(), [0, 0, -1])
+
+
+    def testSlots(self):
+        cells = []
+        for c in [self.pc, self.dc]:
+            cells += c.nodes + c.edges + c.faces + c.volumes
+        cells += [-c for c in cells if c.my_reverse]
+        cells += [s for e in self.pc.edges for s in e.simpleEdges]
+        cells += [s for f in self.pc.faces for s in f.simpleFaces]
+        cells += [-s for s in cells[-2:]]
+        for c in cells:
+            self.assertFalse(hasattr(c, '__dict__'), type(c).__name__)
+
+
+    def testLazyReverse(self):
+        e = Edge(Node(0, 0, 0), Node(1, 0, 0))
+        se = e.simpleEdges[0]
+        count = SuperBaseCell.reversed_cell_count
+        self.assertIsNone(e.existing_reverse)
+        self.assertIsNone(se.existing_reverse)
+        self.assertIs(-se, se.my_reverse)
+        self.assertIs((-se).belongs_to, -e)
+        self.assertIs(-(-e), e)
+        self.assertIs(e.existing_reverse, -e)
+        self.assertEqual(SuperBaseCell.reversed_cell_count, count + 2)
+        self.assertIsNone(self.pc.nodes[0].existing_reverse)
+
+
+    def testFaceGeometry(self):
+        nodes = [Node(0, 0, 0), Node(2, 0, 0), Node(2, 1, 0), Node(1, 1, 0),
+                 Node(1, 2, 0), Node(0, 2, 0)]
+        f = Face([Edge(n1, n2) for (n1, n2) in zip(nodes, nodes[1:]+nodes[:1])])
+        sf = f.simpleFaces[0]
+        self.assertAlmostEqual(sf.area[1], 3)
+        np.testing.assert_allclose(sf.normalVec, [0, 0, 1])
+        np.testing.assert_allclose((-sf).normalVec, [0, 0, -1])
+        nodes[1].coordinates = [3, 0, 0]
+        nodes[2].coordinates = [3, 1, 0]
+        self.assertTrue(f.geometryChanged)
+        f.setUp(calcGeometry=False)
+        sf = f.simpleFaces[0]
+        self.assertIsNone(sf.area)
+        update_simple_faces(f.simpleFaces)
+        self.assertAlmostEqual(sf.area[1], 4)
+        np.testing.assert_allclose(sf.barycenter, [1.25, 0.75, 0])
+        np.testing.assert_allclose((-sf).coordinates[-2], [3, 0, 0])
+        self.assertAlmostEqual((-sf).area[1], 4)
+        sf.nodes[1].coordinates = [2, 0, 0]
+        sf.nodes[2].coordinates = [2, 1, 0]
+        update_simple_faces([sf])
+        self.assertAlmostEqual((-sf).area[1], 3)
+
+        pc = Grid3DCubic(2)
+        n = pc.innerNodes[0]
+        n.coordinates = n.coordinates + 0.1
+        changedFaces = [f for f in pc.faces if f.geometryChanged]
+        self.assertTrue(changedFaces)
+        pc.updateFaceGeometry()
+        for f in changedFaces:
+            self.assertFalse(f.geometryChanged)
+            for sf in f.simpleFaces:
+                (area, normalVec, barycenter) = \
+                    (sf.area[1], sf.normalVec, sf.barycenter)
+                update_simple_faces([sf])
+                self.assertAlmostEqual(sf.area[1], area)
+                np.testing.assert_allclose(sf.normalVec, normalVec)
+                np.testing.assert_allclose(sf.barycenter, barycenter)
+
+        # Faces that are not plane keep the normal vector of their first
+        # triangle
+        nodes = [Node(0, 0, 0), Node(1, 0, 0), Node(1, 1, 0.2), Node(0, 1, 0)]
+        f = Face([Edge(n1, n2) for (n1, n2) in zip(nodes, nodes[1:]+nodes[:1])])
+        sf = f.simpleFaces[0]
+        np.testing.assert_allclose(sf.normalVec,
+                                   np.array([0, -0.2, 1])/np.sqrt(1.04))
+        np.testing.assert_allclose((-sf).normalVec,
+                                   -np.array([0, -0.2, 1])/np.sqrt(1.04))
+        rng = np.random.default_rng(0)
+        for n in pc.nodes:
+            n.coordinates = n.coordinates + rng.uniform(-0.2, 0.2, 3)
+        pc.updateFaceGeometry()
+        for sf in (sf for f in pc.faces for sf in f.simpleFaces):
+            (o, x, y) = sf.coordinates[:3]
+            firstNormal = np.cross(x-o, y-o)
+            firstNormal /= np.linalg.norm(firstNormal)
+            c = sf.coordinates
+            fan = np.cross(c[1:-1]-c[0], c[2:]-c[0]).sum(axis=0)
+            if np.dot(firstNormal, fan) < 0:
+                firstNormal = -firstNormal
+            np.testing.assert_allclose(sf.normalVec, firstNormal)
+
+
+    def testAdjacency(self):
+        nodes = [Node(0, 0, 0), Node(1, 0, 0), Node(0, 1, 0)]
+        edges = [Edge(nodes[0], nodes[1]), Edge(nodes[0], nodes[2]),
+                 Edge(nodes[1], nodes[0])]
+        self.assertEqual(nodes[0].edges, edges)
+        self.assertEqual(nodes[0].connectedNodes,
+                         [nodes[1], nodes[2], nodes[1]])
+        f = Face([edges[0], Edge(nodes[1], nodes[2]), -edges[1]])
+        self.assertEqual(edges[0].faces, [f])
+        self.assertEqual((-edges[1]).faces, [f])
+        edges[0].delete()
+        self.assertIn(edges[0], nodes[0].edges)
+        f.delete()
+        edges[0].delete()
+        self.assertEqual(nodes[0].edges, edges[1:])
+        self.assertEqual(nodes[0].connectedNodes, [nodes[2], nodes[1]])
+        self.assertEqual(edges[1].faces, [])
+
+    def testFanTriangulation(self):
+        nodes = [Node(np.cos(a), np.sin(a), 0)
+                 for a in np.linspace(0, 2*np.pi, 6, endpoint=False)]
+        edges = [Edge(n1, n2) for (n1, n2) in zip(nodes, nodes[1:]+nodes[:1])]
+        alternating = Face(edges, triangulate=True,
+                           triangulationMethod='alternating')
+        f = Face(edges, triangulate=True, triangulationMethod='fan')
+        self.assertEqual(len(f.simpleFaces), 1)
+        self.assertEqual(f.geometricEdges, [])
+        self.assertEqual(f.triangleNodes, nodes)
+        np.testing.assert_array_equal(
+            f.triangles, [[0, 1, 2], [0, 2, 3], [0, 3, 4], [0, 4, 5]])
+        triangleAreas = f.simpleFaces[0].area[0]
+        self.assertAlmostEqual(f.area[1], alternating.area[1])
+        (-f).materializeTriangulation()
+        self.assertEqual(len(f.simpleFaces), 4)
+        self.assertEqual(len(f.geometricEdges), 3)
+        np.testing.assert_allclose([sf.area[1] for sf in f.simpleFaces],
+                                   triangleAreas)
+        self.assertEqual(f.triangleNodes, nodes)
+        np.testing.assert_array_equal(
+            f.triangles, [[0, 1, 2], [0, 2, 3], [0, 3, 4], [0, 4, 5]])
+        self.assertAlmostEqual(f.area[1], alternating.area[1])
+
+    def testFaceCycle(self):
+        nodes = [Node(x, y, 0) for (x, y) in [(0, 0), (1, 0), (2, 0), (2, 2),
+                                              (0, 2), (3, 3)]]
+        a = Edge(nodes[0], nodes[2], geometricNodes=[nodes[1]])
+        b = Edge(nodes[2], nodes[3])
+        c = Edge(nodes[3], nodes[0], geometricNodes=[nodes[4]])
+        dangling = Edge(nodes[0], nodes[5])
+        inner = Edge(nodes[1], nodes[3])
+        cycles = {(a, b, c, dangling): [0, 1, 2, 3, 4],
+                  (-dangling, a, b, c): [0, 1, 2, 3, 4],
+                  (a, inner, c): [0, 1, 3, 4]}
+        for (edges, cycle) in cycles.items():
+            f = Face(list(edges))
+            self.assertEqual(len(f.simpleFaces), 1)
+            self.assertEqual(f.simpleFaces[0].nodes,
+                             [nodes[i] for i in cycle])
+
+    def testAlignFaces(self):
+        n = {(i, j, k): Node(i, j, k)
+             for i in range(2) for j in range(2) for k in range(2)}
+        x = {(j, k): Edge(n[0, j, k], n[1, j, k])
+             for j in range(2) for k in range(2)}
+        y = {(i, k): Edge(n[i, 0, k], n[i, 1, k])
+             for i in range(2) for k in range(2)}
+        z = {(i, j): Edge(n[i, j, 0], n[i, j, 1])
+             for i in range(2) for j in range(2)}
+        faces = [Face([y[i, 0], z[i, 1], -y[i, 1], -z[i, 0]])
+                 for i in range(2)]
+        faces += [Face([z[0, j], x[j, 1], -z[1, j], -x[j, 0]])
+                  for j in range(2)]
+        faces += [Face([x[0, k], y[1, k], -x[1, k], -y[0, k]])
+                  for k in range(2)]
+        v = Volume(faces, unalignedFaces=True)
+        self.assertEqual(v.alignmentConflicts, [])
+        self.assertAlmostEqual(v.volume, 1)
+        for f in v.faces:
+            self.assertGreater(np.dot(f.normalVec[0],
+                                      f.barycenter[0] - v.barycenter), 0)
+
+        other = Face([Edge(Node(5, 0, 0), Node(6, 0, 0)),
+                      Edge(Node(6, 0, 0), Node(5, 1, 0)),
+                      Edge(Node(5, 1, 0), Node(5, 0, 0))])
+        v = Volume(faces + [other], unalignedFaces=True)
+        self.assertEqual([(c['reason'], c['face'])
+                          for c in v.alignmentConflicts],
+                         [('unreachable', other)])
+        self.assertAlmostEqual(v.volume, 1)
+
+    def testVolumeGeometry(self):
+        for c in [self.pc, self.dc]:
+            (volumes, barycenters) = volume_geometry([v.faces
+                                                      for v in c.volumes])
+            np.testing.assert_allclose(volumes, [v.volume for v in c.volumes])
+            np.testing.assert_allclose(barycenters,
+                                       [v.barycenter for v in c.volumes])
+        pc = Grid3DCubic(2)
+        total = sum(v.volume for v in pc.volumes)
+        n = pc.innerNodes[0]
+        n.coordinates = n.coordinates + [0.1, -0.2, 0.15]
+        changedVolumes = [v for v in pc.volumes if v.geometryChanged]
+        self.assertEqual(len(changedVolumes), 8)
+        pc.updateVolumeGeometry()
+        self.assertFalse(any(v.geometryChanged for v in pc.volumes))
+        self.assertAlmostEqual(sum(v.volume for v in pc.volumes), total)
+        for v in changedVolumes:
+            self.assertGreater(v.volume, 0)
+            (volume, barycenter) = (v.volume, v.barycenter)
+            v.setUp()
+            self.assertAlmostEqual(v.volume, volume)
+            np.testing.assert_allclose(v.barycenter, barycenter)
+
+
+    def testBatchGeometry(self):
+        pc = Grid3DCubic(2)
+        total = sum(v.volume for v in pc.volumes)
+        with pc.batch_geometry():
+            with pc.batch_geometry():
+                for (n, shift) in zip(pc.innerNodes, [0.1, -0.2, 0.15]):
+                    n.coordinates = n.coordinates + shift
+            self.assertFalse(any(c.geometryChanged
+                                 for c in pc.edges+pc.faces+pc.volumes))
+        self.assertFalse(any(c.geometryChanged
+                             for c in pc.edges+pc.faces+pc.volumes))
+        self.assertNotAlmostEqual(pc.innerNodes[0].edges[0].length[1], 1)
+        self.assertAlmostEqual(sum(v.volume for v in pc.volumes), total)
+        for v in pc.volumes:
+            (volume, barycenter) = (v.volume, v.barycenter)
+            v.setUp()
+            self.assertAlmostEqual(v.volume, volume)
+            np.testing.assert_allclose(v.barycenter, barycenter)
+        for f in pc.faces:
+            (area, normalVec) = (f.simpleFaces[0].area[1],
+                                 f.simpleFaces[0].normalVec)
+            f.setUp()
+            self.assertAlmostEqual(f.simpleFaces[0].area[1], area)
+            np.testing.assert_allclose(f.simpleFaces[0].normalVec, normalVec)
+
+    def testBatchOwners(self):
+        (pcA, pcB) = (Grid3DCubic(2), Grid3DCubic(2))
+        (nodeA, nodeB) = (pcA.innerNodes[0], pcB.innerNodes[0])
+        with mock.patch.object(Grid3DCubic, 'nodesMoved',
+                               autospec=True) as moved:
+            with pcA.batch_geometry():
+                nodeB.xCoordinate += 0.1
+            self.assertEqual(moved.call_args_list, [mock.call(pcA, [])])
+            self.assertFalse(any(e.geometryChanged for e in nodeB.edges))
+
+            moved.reset_mock()
+            with pcA.batch_geometry():
+                with pcB.batch_geometry():
+                    nodeB.xCoordinate += 0.1
+                nodeA.xCoordinate += 0.1
+            self.assertEqual(moved.call_args_list,
+                             [mock.call(pcA, [nodeA]),
+                              mock.call(pcB, [nodeB])])
+
+            moved.reset_mock()
+            with self.assertRaises(ValueError):
+                with pcA.batch_geometry():
+                    nodeA.xCoordinate += 0.1
+                    raise ValueError
+            moved.assert_not_called()
+            self.assertTrue(all(e.geometryChanged for e in nodeA.edges))
+        with pcA.batch_geometry():
+            nodeA.xCoordinate += 0.1
+        self.assertFalse(any(e.geometryChanged for e in nodeA.edges))
+
+
+    def testParallelDual(self):
+        simpleFaces = [sf for f in self.dc.faces for sf in f.simpleFaces]
+        (coordinates, offsets) = polygon_arrays(simpleFaces)
+        for (a, b) in zip(fan_geometry(coordinates, offsets),
+                          fan_geometry_chunked(coordinates, offsets,
+                                               processes=3)):
+            np.testing.assert_allclose(a, b)
+        dc = DualComplex3D(Grid3DCubic(2, borderVolumesAll=True),
+                           processes=2)
+        self.assertEqual(len(dc.volumes), len(self.dc.volumes))
+        np.testing.assert_allclose([v.volume for v in dc.volumes],
+                                   [v.volume for v in self.dc.volumes])
+        np.testing.assert_allclose([v.barycenter for v in dc.volumes],
+                                   [v.barycenter for v in self.dc.volumes])
+        np.testing.assert_allclose(
+            [sf.normalVec for f in dc.faces for sf in f.simpleFaces],
+            [sf.normalVec for sf in simpleFaces])
+        with mock.patch('pyCellFoamCore.complex.dualComplex3D.update_volumes') \
+                as update:
+            dc = DualComplex3D(Grid3DCubic(2, borderVolumesAll=True),
+                               processes=1)
+        update.assert_not_called()
+        np.testing.assert_allclose([v.volume for v in dc.volumes],
+                                   [v.volume for v in self.dc.volumes])
+
+
+    def testDualNodePlan(self):
+        pc = Grid3DCubic(3, borderVolumesAll=True)
+        DualComplex3D(pc)
+        (positions, types, anchors) = plan_dual_nodes(pc.volumes)
+        self.assertEqual(sorted(set(types)), [0, 1, 2, 3])
+        for (v, position, kind, anchor) in zip(pc.volumes, positions,
+                                                types, anchors):
+            np.testing.assert_allclose(position, v.dualCell3D.coordinates)
+            if kind == 3:
+                self.assertIs(anchor, v)
+            elif kind == 0:
+                self.assertIs(anchor.dualCell0D, v.dualCell3D)
+        self.assertEqual(len(plan_dual_nodes([])[1]), 0)
+
+    def testCreateDualNodes(self):
+        pc = Grid3DCubic(3, borderVolumesAll=True)
+        (positions, types, anchors) = plan_dual_nodes(pc.volumes)
+        dualNodes = create_dual_nodes(pc.volumes)
+        np.testing.assert_array_equal([n.coordinates for n in dualNodes],
+                                      positions)
+        for (v, n, kind, anchor) in zip(pc.volumes, dualNodes, types,
+                                        anchors):
+            self.assertIs(v.dualCell3D, n)
+            if kind == 2:
+                self.assertIs(anchor.dualCell2D, n)
+        v = pc.innerVolumes[0]
+        self.assertEqual(DualNode3D(v, coordinates=[1, 2, 3]).coordinates
+                         .tolist(), [1, 2, 3])
+
+    def testLazyDual(self):
+        pc = Grid3DCubic(2, borderVolumesAll=True)
+        dc = DualComplex3D(pc, lazy=True)
+        self.assertIsNone(pc.volumes[0].dualCell3D)
+        self.assertEqual(len(dc.nodes), len(pc.volumes)+len(pc.borderFaces1))
+        self.assertIsNotNone(pc.volumes[0].dualCell3D)
+        self.assertIsNone(pc.faces[0].dualCell3D)
+        self.assertIsNone(pc.innerNodes1[0].dualCell3D)
+
+        eager = DualComplex3D(Grid3DCubic(2, borderVolumesAll=True))
+        self.assertEqual(len(dc.volumes), len(eager.volumes))
+        np.testing.assert_allclose([v.volume for v in dc.volumes],
+                                   [v.volume for v in eager.volumes])
+        np.testing.assert_allclose([v.barycenter for v in dc.volumes],
+                                   [v.barycenter for v in eager.volumes])
+        np.testing.assert_array_equal(dc.incidenceMatrix2,
+                                      eager.incidenceMatrix2)
+
+        # Without border volumes, the dual edges and faces at the border have
+        # geometric nodes
+        eager = DualComplex3D(Grid3DCubic(2))
+        dc = DualComplex3D(Grid3DCubic(2), lazy=True)
+        self.assertEqual(len(dc.geometricNodes), 44)
+        self.assertEqual(dc.materialized, 2)
+        self.assertEqual([n.num for n in dc.geometricNodes],
+                         [n.num for n in eager.geometricNodes])
+
+        dc = DualComplex3D(Grid3DCubic(2), lazy=True)
+        dc.useCategory = 2
+        eager.useCategory = 2
+        np.testing.assert_array_equal(dc.incidenceMatrix2,
+                                      eager.incidenceMatrix2)
+
+    def testUpdatePrimalGeometry(self):
+        rng = np.random.default_rng(0)
+        (pc, reference) = (Grid3DCubic(5, borderVolumesAll=True),
+                           Grid3DCubic(5, borderVolumesAll=True))
+        shifts = rng.uniform(-0.1, 0.1, (2, len(pc.innerNodes), 3))
+        for c in [pc, reference]:
+            for (n, shift) in zip(c.innerNodes, shifts[0]):
+                n.coordinates = n.coordinates + shift
+        dc = DualComplex3D(pc)
+        geometricNodes = np.array([n.coordinates
+                                   for n in dc.geometricNodes])
+        with pc.batch_geometry():
+            for (n, shift) in zip(pc.innerNodes, shifts[1]):
+                n.coordinates = n.coordinates + shift
+        self.assertFalse(any(c.geometryChanged
+                             for c in dc.edges+dc.faces+dc.volumes))
+        self.assertEqual(len(geometricNodes), 252)
+        self.assertFalse(np.allclose(
+            [n.coordinates for n in dc.geometricNodes], geometricNodes))
+
+        for (n, shift) in zip(reference.innerNodes, shifts[1]):
+            n.coordinates = n.coordinates + shift
+        rebuilt = DualComplex3D(reference)
+        np.testing.assert_allclose([n.coordinates for n in dc.nodes],
+                                   [n.coordinates for n in rebuilt.nodes])
+        np.testing.assert_allclose(
+            [n.coordinates for n in dc.geometricNodes],
+            [n.coordinates for n in rebuilt.geometricNodes])
+        np.testing.assert_allclose([v.volume for v in dc.volumes],
+                                   [v.volume for v in rebuilt.volumes])
+        np.testing.assert_allclose([v.barycenter for v in dc.volumes],
+                                   [v.barycenter for v in rebuilt.volumes])
+
+
+#==============================================================================
+#    TEST FUNCTIONS
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()